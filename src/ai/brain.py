@@ -1,12 +1,19 @@
-from typing import Optional
+import json
+from typing import Optional, Final, Any
+from math import isfinite
 from random import choice
-from time import sleep, time
+from threading import Thread, Event, Lock
+from multiprocessing import Event as ProcessEvent
+from concurrent.futures import ProcessPoolExecutor, Future, wait
 from abc import ABC, abstractmethod
 from copy import deepcopy
 from core.board import Board
 from core.game import Move
-from core.enums import GameState
-from ai.table import TranspositionTable, TranspositionTableEntry, TranspositionTableEntryType, ScoreTable
+from core.enums import GameState, PlayerColor
+from ai.time_manager import TimeManager
+from ai.network import NeuralEvaluator
+from ai.telemetry import TelemetrySink, SearchCounters, IterationStats
+from ai.table import SearchTables, SharedTranspositionTable, TranspositionTableEntry, TranspositionTableEntryType, HistoryTable, KillerTable, CounterMoveTable, PVTable, move_index
 
 class Brain(ABC):
   """
@@ -16,10 +23,38 @@ class Brain(ABC):
   def __init__(self) -> None:
     self._best_move_cache: Optional[str] = None
     self._last_max_depth: int = 0
-    self._last_time_limit: int = 0
+    self._last_time_limit: float = 0
     self._last_hash: int = 0
+    self._stop_event: Any = Event()
+    """
+    Event set to ask a running search to stop as soon as possible.
+    """
+    self._searching: bool = False
+    """
+    Whether `find_best_move` is running, guarded by `_search_lock` so that stop requests can't outlive the search they target.
+    """
+    self._search_lock: Lock = Lock()
+    self._telemetry: Optional[TelemetrySink] = None
+    self._ponder_thread: Optional[Thread] = None
+    self._ponder_hashes: set[int] = set()
+    """
+    Hashes of the positions along the line expected while pondering: after the best move and after the opponent's reply.
+    """
+
+  @property
+  def telemetry(self) -> Optional[TelemetrySink]:
+    """
+    Sink receiving the telemetry of the agent's searches, if any.
 
-  def find_best_move(self, board: Board, max_branching_factor: int, max_depth: int = 0, time_limit: int = 0) -> str:
+    :rtype: Optional[TelemetrySink]
+    """
+    return self._telemetry
+
+  @telemetry.setter
+  def telemetry(self, sink: Optional[TelemetrySink]) -> None:
+    self._telemetry = sink
+
+  def find_best_move(self, board: Board, max_branching_factor: int, max_depth: int = 0, time_limit: float = 0, num_threads: int = 1, late_move_reductions: bool = False, null_move_pruning: bool = False) -> str:
     """
     Finds the best move for the given board state, following the agent's policy.
 
@@ -30,20 +65,47 @@ class Brain(ABC):
     :param max_depth: Maximum lookahead depth, defaults to `0`.
     :type max_depth: int, optional
     :param time_limit: Maximum time (in seconds) to calculate the best move, defaults to `0`.
-    :type time_limit: int, optional
+    :type time_limit: float, optional
+    :param num_threads: Amount of processes the agent can use, defaults to `1`.
+    :type num_threads: int, optional
+    :param late_move_reductions: Whether searching agents can reduce the depth of late quiet moves, defaults to `False`.
+    :type late_move_reductions: bool, optional
+    :param null_move_pruning: Whether searching agents can prune nodes where passing already fails high, defaults to `False`.
+    :type null_move_pruning: bool, optional
     :return: Stringified best move.
     :rtype: str
     """
+    self.stop_pondering()
     if not self._best_move_cache or self._last_hash != board.hash() or self._last_max_depth != max_depth or self._last_time_limit != time_limit:
       self._empty_cache()
       self._last_max_depth = max_depth
       self._last_time_limit = time_limit
       self._last_hash = board.hash()
-      self._best_move_cache = self._find_best_move(board, max_branching_factor, max_depth, time_limit)
+      with self._search_lock:
+        self._searching = True
+      try:
+        best_move = self._find_best_move(board, max_branching_factor, max_depth, time_limit, num_threads, late_move_reductions, null_move_pruning)
+      finally:
+        with self._search_lock:
+          self._searching = False
+          stopped = self._stop_event.is_set()
+          self._stop_event.clear()
+      # A stopped search didn't reach its limits, so its move isn't reused for the same request.
+      self._best_move_cache = None if stopped else best_move
+      return best_move
     return self._best_move_cache
 
+  def stop(self) -> None:
+    """
+    | Asks the running search to stop as soon as possible, so that `find_best_move` returns the best move found so far.
+    | Can be called from any thread, does nothing if the agent isn't searching.
+    """
+    with self._search_lock:
+      if self._searching:
+        self._stop_event.set()
+
   @abstractmethod
-  def _find_best_move(self, board: Board, max_branching_factor: int, max_depth: int = 0, time_limit: int = 0) -> str:
+  def _find_best_move(self, board: Board, max_branching_factor: int, max_depth: int = 0, time_limit: float = 0, num_threads: int = 1, late_move_reductions: bool = False, null_move_pruning: bool = False) -> str:
     """
     Finds the best move according to this agent's strategy.
 
@@ -54,7 +116,13 @@ class Brain(ABC):
     :param max_depth: Maximum lookahead depth, defaults to `0`.
     :type max_depth: int, optional
     :param time_limit: Maximum time (in seconds) to calculate the best move, defaults to `0`.
-    :type time_limit: int, optional
+    :type time_limit: float, optional
+    :param num_threads: Amount of processes the agent can use, defaults to `1`.
+    :type num_threads: int, optional
+    :param late_move_reductions: Whether searching agents can reduce the depth of late quiet moves, defaults to `False`.
+    :type late_move_reductions: bool, optional
+    :param null_move_pruning: Whether searching agents can prune nodes where passing already fails high, defaults to `False`.
+    :type null_move_pruning: bool, optional
     :return: Stringified best move.
     :rtype: str
     """
@@ -66,13 +134,96 @@ class Brain(ABC):
     """
     self._best_move_cache = None
 
+  def ponder(self, board: Board, max_branching_factor: int) -> None:
+    """
+    | Starts thinking in background, on the opponent's time, about the position expected after the last best move found and the opponent's most likely reply.
+    | Does nothing if the agent can't predict the opponent's reply.
+
+    :param board: Current playing board, before playing the last best move found.
+    :type board: Board
+    :param max_branching_factor: Maximum branching factor.
+    :type max_branching_factor: int
+    """
+    self.stop_pondering()
+    if self._best_move_cache and self._last_hash == board.hash():
+      board.play(self._best_move_cache)
+      if not board.gameover and (reply := self._predict_reply(board)) is not None:
+        self._ponder_hashes = {board.hash()}
+        board.play_parsed(reply)
+        if not board.gameover:
+          self._ponder_hashes.add(board.hash())
+          self._stop_event.clear()
+          self._ponder_thread = Thread(target=self._ponder, args=(board, max_branching_factor), daemon=True)
+          self._ponder_thread.start()
+
+  def notify_position(self, board: Board) -> None:
+    """
+    Notifies the agent about the current playing board, so it can stop pondering if the game left the expected line.
+
+    :param board: Current playing board.
+    :type board: Board
+    """
+    if self._ponder_thread and board.hash() not in self._ponder_hashes:
+      self.stop_pondering()
+
+  def stop_pondering(self) -> None:
+    """
+    Stops pondering, if the agent is doing so, and waits for the background search to end.
+    """
+    if self._ponder_thread:
+      self._stop_event.set()
+      self._ponder_thread.join()
+      self._ponder_thread = None
+      self._ponder_hashes = set()
+      self._stop_event.clear()
+
+  def _predict_reply(self, board: Board) -> Optional[Move]:
+    """
+    | Predicts the opponent's reply for the given board.
+    | Agents unable to predict it should return None, which disables pondering.
+
+    :param board: Playing board, after the agent's move.
+    :type board: Board
+    :return: Expected opponent's move.
+    :rtype: Optional[Move]
+    """
+
+  def _ponder(self, board: Board, max_branching_factor: int) -> None:
+    """
+    | Thinks about the given board until asked to stop.
+    | Runs on the pondering thread.
+
+    :param board: Playing board expected on the agent's next turn.
+    :type board: Board
+    :param max_branching_factor: Maximum branching factor.
+    :type max_branching_factor: int
+    """
+
+  def reset(self) -> None:
+    """
+    | Resets the agent for a new game.
+    | Might reset more data depending on the agent, such as search state kept across moves.
+    """
+    self.stop_pondering()
+    self._empty_cache()
+    self._last_max_depth = 0
+    self._last_time_limit = 0
+    self._last_hash = 0
+
+  def close(self) -> None:
+    """
+    Stops any background work of the agent and releases its resources.
+    """
+    self.stop_pondering()
+
 class Random(Brain):
   """
   Random acting AI agent.
   """
 
-  def _find_best_move(self, board: Board, max_branching_factor: int, max_depth: int = 0, time_limit: int = 0) -> str:
-    sleep(0.5)
+  def _find_best_move(self, board: Board, max_branching_factor: int, max_depth: int = 0, time_limit: float = 0, num_threads: int = 1, late_move_reductions: bool = False, null_move_pruning: bool = False) -> str:
+    # Waits like a search would, but still honors stop requests.
+    self._stop_event.wait(0.5)
     return choice(board.valid_moves.split(";"))
 
 class AlphaBetaPruner(Brain):
@@ -80,120 +231,681 @@ class AlphaBetaPruner(Brain):
   AI agent following an alpha-beta pruning policy.
   """
 
-  def __init__(self) -> None:
+  EVALUATION_WEIGHTS: tuple[float, ...] = (-10, 10, 2, -2, 0, 0, 0, 0)
+  """
+  | Weights of each evaluation feature, in the same order as `Board.EVALUATION_FEATURES`.
+  | Maximize the neighbors of the opponent's queen and minimize our own queen neighbors.
+  | Maximize our own pieces in play and minimize the opponent's.
+  | Pinned and mobile pieces are not weighted yet.
+  | Tuned weights can replace these ones, see `load_weights`.
+  """
+  MAX_PONDER_DEPTH: Final[int] = 64
+  """
+  Maximum depth reached while pondering.
+  """
+  ASPIRATION_WINDOW: Final[float] = 10
+  """
+  | Half-width of the initial aspiration window around the expected score.
+  | The window grows by a factor of 4 on each failure.
+  """
+  NULL_WINDOW: Final[float] = 1e-6
+  """
+  Width of the windows used to test whether a move can improve on the best one found so far.
+  """
+  LATE_MOVE_INDEX: Final[int] = 4
+  """
+  Amount of moves searched at full depth in each node before late move reductions kick in.
+  """
+  LATE_MOVE_MIN_DEPTH: Final[int] = 3
+  """
+  Minimum remaining depth for late move reductions.
+  """
+  NULL_MOVE_REDUCTION: Final[int] = 2
+  """
+  Depth reduction of the searches following a null move.
+  """
+  _worker_brain: "AlphaBetaPruner"
+  """
+  Agent of the current worker process, set by `_init_worker`, see `_parallel_iterative_deepening`.
+  """
+  _worker_board: Board
+  """
+  Last board parsed by the current worker process.
+  """
+  _worker_gamestring: str = ""
+  """
+  GameString of the last board parsed by the current worker process.
+  """
+
+  def __init__(self, tables: Optional[SearchTables] = None, evaluator: Optional[NeuralEvaluator] = None) -> None:
+    """
+    Negamax agent instantiation.
+
+    :param tables: Transposition table and score cache shared with other agents, defaults to new ones owned by this agent.
+    :type tables: Optional[SearchTables], optional
+    :param evaluator: Neural network evaluating the leaves in place of the weighted evaluation features, defaults to none.
+    :type evaluator: Optional[NeuralEvaluator], optional
+    """
     super().__init__()
-    self._transpos_table: TranspositionTable = TranspositionTable()
-    self._pv_table: dict[int, Move] = {}
-    self._killer_moves: dict[int, list[Move]] = {}
-    self._history_heuristic: dict[Move, int] = {}
-    self._cached_scores: ScoreTable = ScoreTable()
+    self._tables: SearchTables = tables or SearchTables()
+    self._owns_tables: Final[bool] = tables is None
+    self._evaluator: Final[Optional[NeuralEvaluator]] = evaluator
+    self._pv_table: PVTable = PVTable()
+    self._killer_moves: KillerTable = KillerTable()
+    self._history_heuristic: HistoryTable = HistoryTable()
+    self._counter_moves: CounterMoveTable = CounterMoveTable()
+    self._root_turn: int = 0
+    """
+    Turn of the root of the current search, to know the ply of each node.
+    """
+    self._clock: TimeManager = TimeManager()
+    """
+    Time budget of the current search.
+    """
     self._visited_nodes: int = 0
     self._cutoffs: int = 0
+    self._move_cutoffs: int = 0
+    self._first_move_cutoffs: int = 0
+    self._late_move_reductions: bool = False
+    self._null_move_pruning: bool = False
+    self._pool: Optional[ProcessPoolExecutor] = None
+    """
+    Pool of worker processes for parallel searches, created on first use.
+    """
+    self._pool_size: int = 0
+    self._pool_stop_event: Any = None
+    """
+    Event shared with the worker processes to ask them to stop searching.
+    """
+
+  @classmethod
+  def load_weights(cls, path: str) -> None:
+    """
+    | Loads the evaluation weights of every negamax agent from a JSON file, mapping the name of each evaluation feature to its weight.
+    | Features missing from the file keep their current weight.
+
+    :param path: Path of the file.
+    :type path: str
+    :raises ValueError: If the file names unknown features or has non-numeric weights.
+    """
+    with open(path, encoding="utf-8") as file:
+      weights = json.load(file)
+    if not isinstance(weights, dict) or (unknown := set(weights) - set(Board.EVALUATION_FEATURES)):
+      raise ValueError(f"Unknown evaluation features in '{path}': {unknown if isinstance(weights, dict) else weights}")
+    if not all(isinstance(weight, (int, float)) and isfinite(weight) for weight in weights.values()):
+      raise ValueError(f"Evaluation weights in '{path}' must be finite numbers")
+    cls.EVALUATION_WEIGHTS = tuple(float(weights.get(name, weight)) for name, weight in zip(Board.EVALUATION_FEATURES, cls.EVALUATION_WEIGHTS))
+
+  @classmethod
+  def save_weights(cls, path: str, weights: tuple[float, ...]) -> None:
+    """
+    Saves the given evaluation weights to a JSON file, see `load_weights`.
+
+    :param path: Path of the file.
+    :type path: str
+    :param weights: Weights of each evaluation feature, in the same order as `Board.EVALUATION_FEATURES`.
+    :type weights: tuple[float, ...]
+    """
+    with open(path, "w", encoding="utf-8") as file:
+      json.dump(dict(zip(Board.EVALUATION_FEATURES, weights)), file, indent=2)
+
+  def reset(self) -> None:
+    super().reset()
+    # Worker processes keep their own score caches, so they're discarded too.
+    self._shutdown_pool()
+    self._tables.clear()
+    self._pv_table.clear()
+    self._killer_moves.clear()
+    self._history_heuristic.clear()
+    self._counter_moves.clear()
+    self._root_turn = 0
+
+  def close(self) -> None:
+    super().close()
+    self._shutdown_pool()
+    if self._owns_tables:
+      self._tables.close()
+
+  def _find_best_move(self, board: Board, max_branching_factor: int, max_depth: int = 0, time_limit: float = 0, num_threads: int = 1, late_move_reductions: bool = False, null_move_pruning: bool = False) -> str:
+    if len(moves := board.calculate_valid_moves()) <= 1:
+      # Nothing to think about.
+      return board.stringify_move(next(iter(moves), None))
+    self._clock = TimeManager(time_limit)
+    self._tables.age(board.turn)
+    # Kept for pondering too.
+    self._late_move_reductions = late_move_reductions
+    self._null_move_pruning = null_move_pruning
+    if num_threads > 1:
+      best_move, *_ = self._parallel_iterative_deepening(board, max_branching_factor, max_depth, num_threads)
+    else:
+      best_move, *_ = self._iterative_deepening(board, max_branching_factor, max_depth)
+    if not best_move:
+      # Not even the first iteration completed within the time limit, so fall back to move ordering.
+      best_move = max(moves, key=lambda move: static_move_score(board, move))
+    self._history_heuristic.decay()
+    return board.stringify_move(best_move)
+
+  def _predict_reply(self, board: Board) -> Optional[Move]:
+    return self._pv_table[board.hash()]
+
+  def _ponder(self, board: Board, max_branching_factor: int) -> None:
+    self._clock = TimeManager()
+    self._iterative_deepening(board, max_branching_factor, AlphaBetaPruner.MAX_PONDER_DEPTH)
 
-  def _find_best_move(self, board: Board, max_branching_factor: int, max_depth: int = 0, time_limit: int = 0) -> str:
-    start_time = time()
+  def _iterative_deepening(self, board: Board, max_branching_factor: int, max_depth: int = 0) -> tuple[Optional[Move], int, list[tuple[Optional[Move], float]]]:
+    """
+    Runs alpha-beta pruning searches with increasing depth, until the depth is reached, the time budget runs out or the search is asked to stop.
+
+    :param board: Playing board.
+    :type board: Board
+    :param max_branching_factor: Maximum branching factor.
+    :type max_branching_factor: int
+    :param max_depth: Maximum lookahead depth, defaults to `0`.
+    :type max_depth: int, optional
+    :return: Best move found, depth reached, and best move and score for each completed iteration.
+    :rtype: tuple[Optional[Move], int, list[tuple[Optional[Move], float]]]
+    """
     best_move = None
     scores: list[tuple[Optional[Move], float]] = []
     depth = 0
+    self._reset_counters()
+    self._advance_root(board)
+    guess: Optional[float] = None
+    if (cached_entry := self._tables.transpos_table[board.hash()]) and cached_entry.move:
+      # Search state is kept across moves, so the subtree already explored for this position by previous searches (or while pondering) seeds the iterative deepening.
+      best_move = cached_entry.move
+      depth = min(cached_entry.depth, max_depth or cached_entry.depth) - 1
+      if cached_entry.type is TranspositionTableEntryType.EXACT:
+        guess = cached_entry.value
     try:
-      while not max_depth or depth < max_depth:
+      while (not max_depth or depth < max_depth) and self._clock.can_start_iteration():
         depth += 1
-        best_move, score = self._alpha_beta_search(deepcopy(board), max_branching_factor, depth, float('-inf'), float('inf'), start_time, time_limit)
+        iteration_board = deepcopy(board)
+        counters = self._counters(iteration_board)
+        self._clock.start_iteration(self._visited_nodes)
+        best_move, score = self._aspiration_search(iteration_board, max_branching_factor, depth, guess)
+        self._clock.end_iteration(self._visited_nodes)
+        self._report(board, depth, best_move, score, self._counters(iteration_board) - counters)
         scores.append((best_move, score))
-        if time_limit and time() - start_time > time_limit:
-          break
+        # Scores swing with the side to move at the horizon, so the next iteration is centred on the one before this.
+        guess = scores[-2][1] if len(scores) > 1 else None
     except TimeoutError:
       pass
-    self._transpos_table.flush()
-    print(f"Depth: {depth}; Visited nodes: {self._visited_nodes}; Cutoffs: {self._cutoffs}; Scores: {scores}; Time: {time() - start_time}")
-    self._visited_nodes = 0
-    self._cutoffs = 0
-    return board.stringify_move(best_move)
+    return best_move, depth, scores
+
+  def _aspiration_search(self, board: Board, max_branching_factor: int, depth: int, guess: Optional[float]) -> tuple[Optional[Move], float]:
+    """
+    | Searches the root with a window centred on the guessed score, widening the failing side until the score falls within the window.
+    | Uses a full window when there's no guess or the guess is a win or a loss.
+
+    :param board: Playing board.
+    :type board: Board
+    :param max_branching_factor: Maximum branching factor.
+    :type max_branching_factor: int
+    :param depth: Search depth.
+    :type depth: int
+    :param guess: Expected score, usually the one of the previous iteration.
+    :type guess: Optional[float]
+    :return: Best move and its score.
+    :rtype: tuple[Optional[Move], float]
+    """
+    delta = AlphaBetaPruner.ASPIRATION_WINDOW
+    alpha, beta = (guess - delta, guess + delta) if guess is not None and isfinite(guess) else (float('-inf'), float('inf'))
+    while True:
+      best_move, value = self._alpha_beta_search(board, max_branching_factor, depth, alpha, beta)
+      if value <= alpha and alpha != float('-inf'):
+        alpha = value - delta
+      elif value >= beta and beta != float('inf'):
+        beta = value + delta
+      else:
+        return best_move, value
+      delta *= 4
+
+  def _parallel_iterative_deepening(self, board: Board, max_branching_factor: int, max_depth: int, num_threads: int) -> tuple[Optional[Move], int, list[tuple[Optional[Move], float]]]:
+    """
+    | Runs iterative deepening splitting the root moves among `num_threads` worker processes.
+    | Workers probe and store into a transposition table shared with this process and each other, while the other tables are their own; all of them persist across iterations and moves.
+    | At each iteration, results are merged by keeping the best score, and the iteration is used only if every worker completed it.
+
+    :param board: Playing board.
+    :type board: Board
+    :param max_branching_factor: Maximum branching factor.
+    :type max_branching_factor: int
+    :param max_depth: Maximum lookahead depth.
+    :type max_depth: int
+    :param num_threads: Amount of worker processes.
+    :type num_threads: int
+    :return: Best move found, depth reached, and best move and score for each completed iteration.
+    :rtype: tuple[Optional[Move], int, list[tuple[Optional[Move], float]]]
+    """
+    node_hash = board.hash()
+    best_move = None
+    scores: list[tuple[Optional[Move], float]] = []
+    depth = 0
+    self._reset_counters()
+    if (cached_entry := self._tables.transpos_table[node_hash]) and cached_entry.move:
+      best_move = cached_entry.move
+      depth = min(cached_entry.depth, max_depth or cached_entry.depth) - 1
+    if board.gameover or not (moves := list(board.calculate_valid_moves())):
+      return best_move, depth, scores
+    self._advance_root(board)
+    counter_index = self._counter_moves[move_index(board.moves[-1])] if board.moves and board.moves[-1] else -1
+    moves.sort(key=lambda m: self._move_order_heuristic(board, m, best_move, 0, counter_index), reverse=True)
+    del moves[max_branching_factor:]
+    pool = self._get_pool(num_threads)
+    gamestring = str(board)
+    while (not max_depth or depth < max_depth) and self._clock.can_start_iteration():
+      remaining_time = self._clock.worker_budget
+      depth += 1
+      self._clock.start_iteration(self._visited_nodes)
+      self._pool_stop_event.clear()
+      # Split root moves round-robin, so that every worker starts from one of the most promising moves.
+      futures: list[Future[tuple[Optional[Move], float, bool, SearchCounters]]] = [
+        pool.submit(AlphaBetaPruner._search_worker_root_moves, gamestring, moves[i::num_threads], max_branching_factor, depth, remaining_time, self._late_move_reductions, self._null_move_pruning)
+        for i in range(min(num_threads, len(moves)))
+      ]
+      while wait(futures, timeout=0.05).not_done:
+        if self._stop_event.is_set():
+          self._pool_stop_event.set()
+      results = [future.result() for future in futures]
+      counters = sum((result[3] for result in results), SearchCounters())
+      self._visited_nodes += counters.nodes
+      self._cutoffs += counters.cutoffs
+      self._move_cutoffs += counters.move_cutoffs
+      self._first_move_cutoffs += counters.first_move_cutoffs
+      if not all(result[2] for result in results):
+        break
+      self._clock.end_iteration(self._visited_nodes)
+      iteration_move, score, *_ = max(results, key=lambda result: result[1])
+      best_move = iteration_move
+      self._report(board, depth, best_move, score, counters)
+      scores.append((best_move, score))
+      self._tables.transpos_table[node_hash] = TranspositionTableEntry(TranspositionTableEntryType.EXACT, score, depth, best_move)
+      if best_move:
+        self._pv_table[node_hash] = best_move
+        # Search the best move first at the next iteration.
+        moves.remove(best_move)
+        moves.insert(0, best_move)
+    return best_move, depth, scores
 
-  def _alpha_beta_search(self, board: Board, max_branching_factor: int, depth: int, alpha: float, beta: float, start_time: float, time_limit: int) -> tuple[Optional[Move], float]:
-    if time_limit and time() - start_time > time_limit:
-      raise TimeoutError("Time limit exceeded during alpha-beta pruning search")
+  def _search_root_moves(self, board: Board, moves: list[Move], max_branching_factor: int, depth: int, time_limit: float) -> tuple[Optional[Move], float, bool, SearchCounters]:
+    """
+    | Searches the given subset of root moves with a full window.
+    | Runs on worker processes.
 
+    :param board: Playing board.
+    :type board: Board
+    :param moves: Root moves to search.
+    :type moves: list[Move]
+    :param max_branching_factor: Maximum branching factor.
+    :type max_branching_factor: int
+    :param depth: Search depth.
+    :type depth: int
+    :param time_limit: Maximum time (in seconds) for the search, `0` for no limit.
+    :type time_limit: float
+    :return: Best move and its score, whether every move was searched, and the work done.
+    :rtype: tuple[Optional[Move], float, bool, SearchCounters]
+    """
+    self._clock = TimeManager(time_limit)
+    self._reset_counters()
+    counters = self._counters(board)
+    self._advance_root(board)
+    best_move = None
+    alpha = best_value = float('-inf')
+    completed = True
+    try:
+      for index, move in enumerate(moves):
+        board.play_parsed(move)
+        value = self._principal_variation_search(board, max_branching_factor, depth - 1, alpha, float('inf'), index > 0)
+        board.undo()
+        if value > best_value:
+          best_value = value
+          best_move = move
+        alpha = max(alpha, best_value)
+    except TimeoutError:
+      completed = False
+    return best_move, best_value, completed, self._counters(board) - counters
+
+  def _get_pool(self, num_threads: int) -> ProcessPoolExecutor:
+    """
+    Returns the pool of worker processes, (re)creating it if its size doesn't match the requested one.
+
+    :param num_threads: Amount of worker processes.
+    :type num_threads: int
+    :return: Pool of worker processes.
+    :rtype: ProcessPoolExecutor
+    """
+    if not self._pool or self._pool_size != num_threads:
+      self._shutdown_pool()
+      transpos_table = self._tables.share()
+      self._pool_stop_event = ProcessEvent()
+      self._pool = ProcessPoolExecutor(num_threads, initializer=AlphaBetaPruner._init_worker, initargs=(self._pool_stop_event, transpos_table, max(self._tables.size_mb // num_threads, 1), self._evaluator, AlphaBetaPruner.EVALUATION_WEIGHTS))
+      self._pool_size = num_threads
+    return self._pool
+
+  def _shutdown_pool(self) -> None:
+    """
+    Shuts down the pool of worker processes, if any.
+    """
+    if self._pool:
+      self._pool_stop_event.set()
+      self._pool.shutdown(cancel_futures=True)
+      self._pool = None
+      self._pool_size = 0
+
+  def _alpha_beta_search(self, board: Board, max_branching_factor: int, depth: int, alpha: float, beta: float) -> tuple[Optional[Move], float]:
     self._visited_nodes += 1
+    if not self._visited_nodes & (TimeManager.CHECK_INTERVAL - 1):
+      if self._clock.expired():
+        raise TimeoutError("Time limit exceeded during alpha-beta pruning search")
+      if self._stop_event.is_set():
+        raise TimeoutError("Alpha-beta pruning search was asked to stop")
+
     node_hash = board.hash()
-    cached_entry = self._transpos_table[node_hash]
-    if cached_entry and cached_entry.depth >= depth:
-      match cached_entry.type:
-        case TranspositionTableEntryType.EXACT:
-          self._cutoffs += 1
-          return cached_entry.move, cached_entry.value
-        case TranspositionTableEntryType.LOWER_BOUND:
-          alpha = max(alpha, cached_entry.value)
-        case TranspositionTableEntryType.UPPER_BOUND:
-          beta = min(beta, cached_entry.value)
-      if alpha >= beta:
-        self._cutoffs += 1
-        return cached_entry.move, cached_entry.value
+    cached_entry, alpha, beta = self._probe_transpos_table(node_hash, depth, alpha, beta)
+    if cached_entry:
+      self._cutoffs += 1
+      return cached_entry.move, cached_entry.value
 
     if depth == 0 or board.gameover:
-      return None, self._evaluate(board, None)
+      return None, self._evaluate(board)
 
-    best_move = self._pv_table.get(node_hash, None)
-    moves = list(board.calculate_valid_moves())
-    moves.sort(key=lambda m: self._move_order_heuristic(board, m, best_move, depth), reverse=True)
-    if len(moves) > max_branching_factor:
-      del moves[max_branching_factor:]
+    if (value := self._null_move_cutoff(board, max_branching_factor, depth, alpha, beta)) is not None:
+      self._cutoffs += 1
+      return None, value
+
+    best_move = self._pv_table[node_hash]
+    ply = board.turn - self._root_turn
+    previous_index = move_index(board.moves[-1]) if board.moves and board.moves[-1] else -1
+    moves = self._ordered_moves(board, max_branching_factor, best_move, ply, previous_index)
+    if depth == 1 and self._evaluator:
+      self._prefetch_scores(board, moves)
 
+    window_alpha = alpha
     best_value = float('-inf')
-    for move in moves:
+    queen_neighbors = (board.queen_neighbors_by_color(PlayerColor.WHITE), board.queen_neighbors_by_color(PlayerColor.BLACK))
+    for index, move in enumerate(moves):
       board.play_parsed(move)
-      _, value = self._alpha_beta_search(board, max_branching_factor, depth - 1, -beta, -alpha, start_time, time_limit)
+      value = self._principal_variation_search(board, max_branching_factor, depth - 1, alpha, beta, index > 0, self._late_move_reduction(board, move, index, depth, ply, queen_neighbors))
       board.undo()
-      value = -value
       if value > best_value:
         best_value = value
         best_move = move
       alpha = max(alpha, best_value)
       if alpha >= beta:
         self._cutoffs += 1
-        self._store_killer_move(depth, move)
+        self._move_cutoffs += 1
+        if not index:
+          self._first_move_cutoffs += 1
+        self._killer_moves.store(ply, cutoff_index := move_index(move))
+        if previous_index >= 0:
+          self._counter_moves[previous_index] = cutoff_index
         break
-    entry_type = TranspositionTableEntryType.EXACT if best_value < beta else TranspositionTableEntryType.LOWER_BOUND if best_value > alpha else TranspositionTableEntryType.UPPER_BOUND
-    self._transpos_table[node_hash] = TranspositionTableEntry(entry_type, best_value, depth, best_move)
+    entry_type = TranspositionTableEntryType.UPPER_BOUND if best_value <= window_alpha else TranspositionTableEntryType.LOWER_BOUND if best_value >= beta else TranspositionTableEntryType.EXACT
+    self._tables.transpos_table[node_hash] = TranspositionTableEntry(entry_type, best_value, depth, best_move)
     if best_move:
       self._pv_table[node_hash] = best_move
-      self._update_history_heuristic(best_move, depth)
+      self._history_heuristic.update(move_index(best_move), depth)
     return best_move, best_value
 
-  def _move_order_heuristic(self, board: Board, move: Move, best_move: Optional[Move], depth: int) -> tuple[float, int]:
+  def _principal_variation_search(self, board: Board, max_branching_factor: int, depth: int, alpha: float, beta: float, scout: bool, reduction: int = 0) -> float:
+    """
+    | Scores the move just played on the board, from the point of view of the player who played it.
+    | Moves after the first one are only expected to prove they can't beat the best one so far, so they're first searched with a null window and searched again with the full window if they fail high.
+    | If a reduction is given, the null window search is first tried at the reduced depth, and repeated at full depth only if it fails high.
+
+    :param board: Playing board, with the move to score just played.
+    :type board: Board
+    :param max_branching_factor: Maximum branching factor.
+    :type max_branching_factor: int
+    :param depth: Remaining search depth.
+    :type depth: int
+    :param alpha: Alpha of the parent node.
+    :type alpha: float
+    :param beta: Beta of the parent node.
+    :type beta: float
+    :param scout: Whether to try a null window search first.
+    :type scout: bool
+    :param reduction: Depth reduction for the first null window search, defaults to `0`.
+    :type reduction: int, optional
+    :return: Move score.
+    :rtype: float
+    """
+    if scout and alpha != float('-inf') and beta - alpha > AlphaBetaPruner.NULL_WINDOW:
+      if reduction:
+        _, value = self._alpha_beta_search(board, max_branching_factor, depth - reduction, -alpha - AlphaBetaPruner.NULL_WINDOW, -alpha)
+        if -value <= alpha:
+          return -value
+      _, value = self._alpha_beta_search(board, max_branching_factor, depth, -alpha - AlphaBetaPruner.NULL_WINDOW, -alpha)
+      if not alpha < -value < beta:
+        return -value
+    _, value = self._alpha_beta_search(board, max_branching_factor, depth, -beta, -alpha)
+    return -value
+
+  def _prefetch_scores(self, board: Board, moves: list[Move]) -> None:
+    """
+    | Evaluates the leaves reached by the given moves with a single batched forward pass of the neural evaluator, storing their scores in the score cache.
+    | The searches of the leaves then find their scores there instead of evaluating them one at a time.
+
+    :param board: Playing board, at a node one ply from the leaves.
+    :type board: Board
+    :param moves: Moves leading to the leaves.
+    :type moves: list[Move]
+    """
+    assert self._evaluator
+    hashes: list[int] = []
+    inputs: list[Any] = []
+    for move in moves:
+      board.play_parsed(move)
+      if not board.gameover and self._tables.cached_scores[node_hash := board.hash()] is None:
+        hashes.append(node_hash)
+        inputs.append(self._evaluator.encode(board))
+      board.undo()
+    if inputs:
+      for node_hash, score in zip(hashes, self._evaluator.forward(inputs).tolist()):
+        self._tables.cached_scores[node_hash] = score
+
+  def _ordered_moves(self, board: Board, max_branching_factor: int, best_move: Optional[Move], ply: int, previous_index: int) -> list[Move]:
+    """
+    Returns the valid moves of a node, most promising first, up to the maximum branching factor.
+
+    :param board: Playing board.
+    :type board: Board
+    :param max_branching_factor: Maximum branching factor.
+    :type max_branching_factor: int
+    :param best_move: Best move found so far for the position, if any.
+    :type best_move: Optional[Move]
+    :param ply: Ply of the position from the root.
+    :type ply: int
+    :param previous_index: Index of the last move played, `-1` if none.
+    :type previous_index: int
+    :return: Ordered moves.
+    :rtype: list[Move]
+    """
+    counter_index = self._counter_moves[previous_index] if previous_index >= 0 else -1
+    moves = list(board.calculate_valid_moves())
+    moves.sort(key=lambda m: self._move_order_heuristic(board, m, best_move, ply, counter_index), reverse=True)
+    del moves[max_branching_factor:]
+    return moves
+
+  def _late_move_reduction(self, board: Board, move: Move, index: int, depth: int, ply: int, queen_neighbors: tuple[int, int]) -> int:
+    """
+    | Returns the depth reduction of the move just played on the board.
+    | Late quiet moves, those that don't change the neighbors of either queen, are unlikely to be best and get searched one ply shallower first.
+
+    :param board: Playing board, with the move just played.
+    :type board: Board
+    :param move: Move just played.
+    :type move: Move
+    :param index: Index of the move in the ordered moves of the node.
+    :type index: int
+    :param depth: Remaining search depth of the node.
+    :type depth: int
+    :param ply: Ply of the node from the root.
+    :type ply: int
+    :param queen_neighbors: Neighbors of the white and black queens before the move.
+    :type queen_neighbors: tuple[int, int]
+    :return: Depth reduction.
+    :rtype: int
+    """
+    late = self._late_move_reductions and index >= AlphaBetaPruner.LATE_MOVE_INDEX and depth >= AlphaBetaPruner.LATE_MOVE_MIN_DEPTH
+    quiet = not board.gameover and (board.queen_neighbors_by_color(PlayerColor.WHITE), board.queen_neighbors_by_color(PlayerColor.BLACK)) == queen_neighbors
+    return int(late and quiet and not self._killer_moves.is_killer(ply, move_index(move)))
+
+  def _probe_transpos_table(self, node_hash: int, depth: int, alpha: float, beta: float) -> tuple[Optional[TranspositionTableEntry], float, float]:
+    """
+    Probes the transposition table for a node, narrowing its window with the stored bound if the entry is deep enough.
+
+    :param node_hash: Zobrist hash of the node.
+    :type node_hash: int
+    :param depth: Remaining search depth of the node.
+    :type depth: int
+    :param alpha: Alpha of the node.
+    :type alpha: float
+    :param beta: Beta of the node.
+    :type beta: float
+    :return: Stored entry if it cuts the search off, along with the narrowed alpha and beta.
+    :rtype: tuple[Optional[TranspositionTableEntry], float, float]
+    """
+    cached_entry = self._tables.transpos_table[node_hash]
+    if cached_entry and cached_entry.depth >= depth:
+      match cached_entry.type:
+        case TranspositionTableEntryType.EXACT:
+          return cached_entry, alpha, beta
+        case TranspositionTableEntryType.LOWER_BOUND:
+          alpha = max(alpha, cached_entry.value)
+        case TranspositionTableEntryType.UPPER_BOUND:
+          beta = min(beta, cached_entry.value)
+      if alpha >= beta:
+        return cached_entry, alpha, beta
+    return None, alpha, beta
+
+  def _null_move_cutoff(self, board: Board, max_branching_factor: int, depth: int, alpha: float, beta: float) -> Optional[float]:
+    """
+    | Tries null-move pruning on a node, if enabled and worth it.
+    | Null window searches only leave room for rounding errors between alpha and beta, so this also keeps null moves out of the root and PV nodes.
+
+    :param board: Playing board.
+    :type board: Board
+    :param max_branching_factor: Maximum branching factor.
+    :type max_branching_factor: int
+    :param depth: Remaining search depth of the node.
+    :type depth: int
+    :param alpha: Alpha of the node.
+    :type alpha: float
+    :param beta: Beta of the node.
+    :type beta: float
+    :return: Lower bound of the node score if the node can be pruned, `None` otherwise.
+    :rtype: Optional[float]
+    """
+    if self._null_move_pruning and depth > AlphaBetaPruner.NULL_MOVE_REDUCTION and beta - alpha < 2 * AlphaBetaPruner.NULL_WINDOW and board.moves and board.moves[-1] is not None and self._evaluate(board) >= beta:
+      if (value := self._null_move_search(board, max_branching_factor, depth, beta)) >= beta:
+        return value
+    return None
+
+  def _null_move_search(self, board: Board, max_branching_factor: int, depth: int, beta: float) -> float:
+    """
+    | Checks whether the node fails high even if the current player passes, searching the null move with a reduced depth.
+    | Hive only allows passing when there are no moves, and being forced to move can hurt, so a fail high is verified with a reduced search of the actual moves.
+
+    :param board: Playing board.
+    :type board: Board
+    :param max_branching_factor: Maximum branching factor.
+    :type max_branching_factor: int
+    :param depth: Remaining search depth of the node.
+    :type depth: int
+    :param beta: Beta of the node.
+    :type beta: float
+    :return: Lower bound of the node score if it's at least beta, otherwise an upper bound of the verification search.
+    :rtype: float
+    """
+    board.play_parsed(None)
+    _, value = self._alpha_beta_search(board, max_branching_factor, depth - 1 - AlphaBetaPruner.NULL_MOVE_REDUCTION, -beta, -beta + AlphaBetaPruner.NULL_WINDOW)
+    board.undo()
+    if -value < beta:
+      return -value
+    _, value = self._alpha_beta_search(board, max_branching_factor, depth - AlphaBetaPruner.NULL_MOVE_REDUCTION, beta - AlphaBetaPruner.NULL_WINDOW, beta)
+    return value
+
+  def _move_order_heuristic(self, board: Board, move: Move, best_move: Optional[Move], ply: int, counter_index: int) -> tuple[float, int]:
     """
     | Assigns a heuristic value to moves for ordering.
     | Higher values indicate better moves.
+
+    :param board: Playing board.
+    :type board: Board
+    :param move: Move.
+    :type move: Move
+    :param best_move: Best move found so far for the position, if any.
+    :type best_move: Optional[Move]
+    :param ply: Ply of the position from the root.
+    :type ply: int
+    :param counter_index: Index of the counter-move to the last move played, `-1` if none.
+    :type counter_index: int
+    :return: Heuristic value.
+    :rtype: tuple[float, int]
     """
     if move == best_move:
-      return (float('inf'), 1) # Prioritize PV move.
-    if move in self._killer_moves.get(depth, []):
-      return (float('inf'), 0) # Prioritize killer moves.
-    return (self._history_heuristic.get(move, self._evaluate(board, move)), 0) # Fallback to history heuristic or explicit board evaluation.
+      return (float('inf'), 3) # Prioritize PV move.
+    index = move_index(move)
+    if self._killer_moves.is_killer(ply, index):
+      return (float('inf'), 2) # Prioritize killer moves.
+    if index == counter_index:
+      return (float('inf'), 1) # Then the counter-move.
+    if (history := self._history_heuristic[index]):
+      return (history, 0) # Fallback to history heuristic.
+    return (static_move_score(board, move), 0) # Fallback to the static estimate of the evaluation change.
 
-  def _store_killer_move(self, depth: int, move: Move) -> None:
+  def _reset_counters(self) -> None:
     """
-    Stores killer moves for a given depth.
+    Resets the counters of the work done by the search.
     """
-    if depth not in self._killer_moves:
-      self._killer_moves[depth] = []
-    if move not in self._killer_moves[depth]:
-      if len(self._killer_moves[depth]) >= 3:
-        self._killer_moves[depth].pop(0)
-      self._killer_moves[depth].append(move)
+    self._visited_nodes = 0
+    self._cutoffs = 0
+    self._move_cutoffs = 0
+    self._first_move_cutoffs = 0
 
-  def _update_history_heuristic(self, move: Move, depth: int) -> None:
+  def _counters(self, board: Board) -> SearchCounters:
     """
-    Updates history heuristic table with a move's depth.
+    Takes a snapshot of the counters of the work done by the search on the given board, along with the transposition table and move cache ones.
 
-    :param move: Move.
-    :type move: Move
-    :param depth: Depth.
+    :param board: Board being searched.
+    :type board: Board
+    :return: Counters.
+    :rtype: SearchCounters
+    """
+    table = self._tables.transpos_table
+    return SearchCounters(self._visited_nodes, self._cutoffs, self._move_cutoffs, self._first_move_cutoffs, table.probes, table.hits, table.stores, table.collisions, board.move_cache_probes, board.move_cache_hits)
+
+  def _report(self, board: Board, depth: int, best_move: Optional[Move], score: float, counters: SearchCounters) -> None:
+    """
+    Emits the telemetry of a completed iteration, if there's a sink.
+
+    :param board: Root board.
+    :type board: Board
+    :param depth: Depth of the iteration.
     :type depth: int
+    :param best_move: Best move found by the iteration.
+    :type best_move: Optional[Move]
+    :param score: Score of the best move.
+    :type score: float
+    :param counters: Work done by the iteration.
+    :type counters: SearchCounters
+    """
+    if self._telemetry:
+      self._telemetry.emit(IterationStats(depth, board.stringify_move(best_move), score, self._clock.elapsed, self._clock.iteration_time, self._clock.branching_factor, counters))
+
+  def _advance_root(self, board: Board) -> None:
+    """
+    Sets the given board as the root of the next search, shifting killer moves by the plies the root moved forward.
+
+    :param board: Playing board.
+    :type board: Board
     """
-    self._history_heuristic[move] = self._history_heuristic.get(move, 0) + 2 ** depth
+    self._killer_moves.shift(board.turn - self._root_turn)
+    self._root_turn = board.turn
 
-  def _evaluate(self, board: Board, move: Optional[Move]) -> float:
+  def _evaluate(self, board: Board) -> float:
     """
     Evaluates the given node.
 
@@ -203,8 +915,6 @@ class AlphaBetaPruner(Brain):
     :rtype: float
     """
     score = 0
-    if move:
-      board.play_parsed(move)
     if (board.state is GameState.DRAW or board.state is GameState.NOT_STARTED):
       score = 0
     elif board.current_player_has_won:
@@ -213,15 +923,78 @@ class AlphaBetaPruner(Brain):
       score = float('-inf')
     else:
       node_hash = board.hash()
-      score = self._cached_scores[node_hash]
+      score = self._tables.cached_scores[node_hash]
       if score is None:
-        player = board.current_player_color
-        opponent = player.opposite
-        # Maximize the neighbors of the opponent's queen and minimize our own queen neighbors.
-        score = 10 * (board.queen_neighbors_by_color(opponent) - board.queen_neighbors_by_color(player))
-        # Maximize our own pieces in play and minimize the opponent's.
-        score += 2 * (board.pieces_in_play(player) - board.pieces_in_play(opponent))
-        self._cached_scores[node_hash] = score
-    if move:
-      board.undo()
+        score = self._evaluator.evaluate(board) if self._evaluator else sum(weight * feature for weight, feature in zip(AlphaBetaPruner.EVALUATION_WEIGHTS, board.evaluation_features(board.current_player_color)))
+        self._tables.cached_scores[node_hash] = score
     return score
+
+  @classmethod
+  def _init_worker(cls, stop_event: Any, transpos_table: SharedTranspositionTable, size_mb: int, evaluator: Optional[NeuralEvaluator], weights: tuple[float, ...]) -> None:
+    """
+    Initializes a worker process for parallel searches.
+
+    :param stop_event: Event shared with the parent process to stop searching.
+    :type stop_event: Any
+    :param transpos_table: Transposition table shared with the parent process and the other workers.
+    :type transpos_table: SharedTranspositionTable
+    :param size_mb: Share of the memory budget of the parent process tables for this worker, sizing its own score cache and the valid moves cache of its boards.
+    :type size_mb: int
+    :param evaluator: Neural evaluator of the parent process agent, if any.
+    :type evaluator: Optional[NeuralEvaluator]
+    :param weights: Evaluation weights of the parent process, which might have been loaded after the worker started from a fresh interpreter.
+    :type weights: tuple[float, ...]
+    """
+    AlphaBetaPruner.EVALUATION_WEIGHTS = weights
+    brain = cls(SearchTables(size_mb, transpos_table), evaluator)
+    brain._stop_event = stop_event
+    cls._worker_brain = brain
+
+  @classmethod
+  def _search_worker_root_moves(cls, gamestring: str, moves: list[Move], max_branching_factor: int, depth: int, time_limit: float, late_move_reductions: bool, null_move_pruning: bool) -> tuple[Optional[Move], float, bool, SearchCounters]:
+    """
+    Searches the given root moves in a worker process, see `_search_root_moves`.
+
+    :param gamestring: GameString of the root position.
+    :type gamestring: str
+    :param moves: Root moves to search.
+    :type moves: list[Move]
+    :param max_branching_factor: Maximum branching factor.
+    :type max_branching_factor: int
+    :param depth: Search depth.
+    :type depth: int
+    :param time_limit: Maximum time (in seconds) for the search, `0` for no limit.
+    :type time_limit: float
+    :param late_move_reductions: Whether to reduce the depth of late quiet moves.
+    :type late_move_reductions: bool
+    :param null_move_pruning: Whether to prune nodes where passing already fails high.
+    :type null_move_pruning: bool
+    :return: Best move and its score, whether every move was searched, and the work done.
+    :rtype: tuple[Optional[Move], float, bool, SearchCounters]
+    """
+    brain = cls._worker_brain
+    if cls._worker_gamestring != gamestring:
+      # New root position: age the scores of the previous ones, the shared transposition table is aged by the parent process.
+      cls._worker_gamestring = gamestring
+      cls._worker_board = Board(gamestring, brain._tables.max_snapshots)
+      brain._tables.cached_scores.flush()
+    brain._late_move_reductions = late_move_reductions
+    brain._null_move_pruning = null_move_pruning
+    return brain._search_root_moves(deepcopy(cls._worker_board), moves, max_branching_factor, depth, time_limit)
+
+def static_move_score(board: Board, move: Move) -> float:
+  """
+  | Estimates how much the given move changes the evaluation of the current player, without playing it, from `Board.evaluation_features_delta` weighted as `AlphaBetaPruner.EVALUATION_WEIGHTS`.
+  | Moves that surround the opponent queen score infinity. Used to order moves and as priors of Monte Carlo searches.
+
+  :param board: Playing board.
+  :type board: Board
+  :param move: Move.
+  :type move: Move
+  :return: Estimated evaluation change.
+  :rtype: float
+  """
+  delta = board.evaluation_features_delta(move)
+  if board.queen_neighbors_by_color(board.current_player_color.opposite) + delta[1] == 6:
+    return float('inf')
+  return sum(weight * feature for weight, feature in zip(AlphaBetaPruner.EVALUATION_WEIGHTS, delta))
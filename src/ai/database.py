@@ -0,0 +1,255 @@
+import os
+import mmap
+import heapq
+import shutil
+import tempfile
+from contextlib import ExitStack
+from struct import Struct
+from typing import Final, Optional, Iterable, Iterator
+import numpy as np
+from numpy.typing import NDArray
+from core.enums import GameState
+from core.game import Position, Move
+from core.board import Board
+from core.record import PASS, read_records
+
+MAGIC: Final[bytes] = b"HPD\x01"
+"""
+Bytes opening every position database, the last one being the format version.
+"""
+HEADER: Final[Struct] = Struct("<4sxxxxQ")
+"""
+Layout of the header of a position database: magic bytes and amount of entries, padded so that every section is aligned.
+"""
+ENTRY: Final[np.dtype] = np.dtype([("key", "<u8"), ("move", "<u4"), ("counts", "<u4", (3,))])
+"""
+Layout of the entries of sorted runs during construction.
+"""
+PACKED_MOVE: Final[np.dtype] = np.dtype([("piece", "u1"), ("q", "i1"), ("r", "i1")])
+"""
+Layout of the moves of game records, see `core.record.MOVE`.
+"""
+RESULTS: Final[dict[GameState, int]] = {GameState.WHITE_WINS: 0, GameState.DRAW: 1, GameState.BLACK_WINS: 2}
+"""
+Column of the counts of each game result.
+"""
+RUN_SIZE: Final[int] = 1 << 20
+"""
+Default amount of moves sorted in memory at once while building a database.
+"""
+BLOCK_SIZE: Final[int] = 1 << 14
+"""
+Amount of entries read from each run, and written to the database, at once while merging.
+"""
+
+class PositionDatabase:
+  """
+  | Read-only, memory-mapped database of the positions of a game collection, keyed by `Board.hash`.
+  | Each entry holds a position key, a move played from it, and how many times the game went on to be won by White, drawn or won by Black after that move.
+  | Entries are sorted by key and then by move, and stored as three sections (keys, counts and moves), so that lookups are a binary search over the keys touching a handful of pages, and nothing is read up front.
+  | Moves are packed as the index of the bug piece in `Board.pieces` and the coordinates of its destination, like game records (see `core.record`).
+  """
+
+  def __init__(self, path: str) -> None:
+    """
+    Position database instantiation, mapping the file in memory.
+
+    :param path: Path of the database.
+    :type path: str
+    :raises ValueError: If the file isn't a position database.
+    """
+    with open(path, "rb") as file:
+      # The mapping stays valid after the file is closed, and pages are only read when a lookup touches them.
+      self._buffer: Final[mmap.mmap] = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    magic, size = HEADER.unpack_from(self._buffer.read(HEADER.size).ljust(HEADER.size, b"\0"))
+    if magic != MAGIC or len(self._buffer) != HEADER.size + 24 * size:
+      raise ValueError(f"'{path}' is not a position database")
+    self._size: Final[int] = size
+    self._keys: Final[NDArray[np.uint64]] = np.frombuffer(self._buffer, np.uint64, size, HEADER.size)
+    self._counts: Final[NDArray[np.uint32]] = np.frombuffer(self._buffer, np.uint32, 3 * size, HEADER.size + 8 * size).reshape(size, 3)
+    self._moves: Final[NDArray[np.uint32]] = np.frombuffer(self._buffer, np.uint32, size, HEADER.size + 20 * size)
+
+  def __len__(self) -> int:
+    return self._size
+
+  def lookup(self, key: int) -> tuple[NDArray[np.uint32], NDArray[np.uint32]]:
+    """
+    Looks up a position.
+
+    :param key: Position key, see `Board.hash`.
+    :type key: int
+    :return: Packed moves played from the position, and the count of each result (White wins, draws, Black wins) after each of them, as views on the database.
+    :rtype: tuple[NDArray[np.uint32], NDArray[np.uint32]]
+    """
+    key = np.uint64(key)
+    start, end = self._keys.searchsorted(key, "left"), self._keys.searchsorted(key, "right")
+    return self._moves[start:end], self._counts[start:end]
+
+  def counts(self, key: int) -> tuple[int, int, int]:
+    """
+    Counts the results of the games that went through a position.
+
+    :param key: Position key, see `Board.hash`.
+    :type key: int
+    :return: Amount of White wins, draws and Black wins.
+    :rtype: tuple[int, int, int]
+    """
+    white_wins, draws, black_wins = self.lookup(key)[1].sum(axis=0, dtype=np.int64).tolist()
+    return white_wins, draws, black_wins
+
+  def moves(self, board: Board) -> list[tuple[str, int, int, int]]:
+    """
+    Lists the moves played from the current position of the given board.
+
+    :param board: Playing board.
+    :type board: Board
+    :return: MoveString of each move, with the amount of White wins, draws and Black wins after it, most played first.
+    :rtype: list[tuple[str, int, int, int]]
+    """
+    moves, counts = self.lookup(board.hash())
+    stats = [(board.stringify_move(_unpack_move(board, move)), *counts) for move, counts in zip(moves.tolist(), counts.tolist())]
+    return sorted(stats, key=lambda stat: -sum(stat[1:]))
+
+def build_database(paths: Iterable[str], output: str, run_size: int = RUN_SIZE) -> int:
+  """
+  | Builds a position database from game record files with an external-memory merge sort, so that collections larger than memory can be indexed.
+  | Games are replayed, and each move is collected with the key of the position it was played from and the result of its game. Every `run_size` moves, they're sorted, duplicates are aggregated, and the run is written to a temporary file.
+  | Runs are then merged a block at a time, aggregating entries found in several runs, and written straight into the sections of the database.
+
+  :param paths: Paths of the game record files.
+  :type paths: Iterable[str]
+  :param output: Path of the database.
+  :type output: str
+  :param run_size: Amount of moves sorted in memory at once, defaults to `RUN_SIZE`.
+  :type run_size: int, optional
+  :return: Amount of entries of the database.
+  :rtype: int
+  """
+  with tempfile.TemporaryDirectory(dir=os.path.dirname(os.path.abspath(output))) as directory:
+    runs: list[str] = []
+    buffer = np.zeros(run_size, ENTRY)
+    size = 0
+    def flush() -> None:
+      nonlocal size
+      if size:
+        runs.append(os.path.join(directory, f"run-{len(runs):05}.npy"))
+        np.save(runs[-1], _aggregate(buffer[:size]))
+        size = 0
+    for path in paths:
+      for record in read_records(path):
+        board = Board(str(record.game_type))
+        keys = [board.hash() for _ in record.plies(board)]
+        moves = np.frombuffer(record.moves, PACKED_MOVE)
+        counts = np.zeros(3, np.uint32)
+        if record.result in RESULTS:
+          counts[RESULTS[record.result]] = 1
+        # Moves are packed like in game records, but in a single integer.
+        codes = moves["piece"].astype(np.uint32) << 16 | moves["q"].view(np.uint8).astype(np.uint32) << 8 | moves["r"].view(np.uint8)
+        for start in range(0, len(keys), run_size):
+          if size + min(len(keys) - start, run_size) > run_size:
+            flush()
+          end = min(start + run_size, len(keys))
+          entries = buffer[size:size + end - start]
+          entries["key"], entries["move"], entries["counts"] = keys[start:end], codes[start:end], counts
+          size += end - start
+    flush()
+    return _merge(runs, output, directory)
+
+def _aggregate(entries: NDArray) -> NDArray:
+  """
+  Sorts entries by key and move, summing the counts of duplicates.
+
+  :param entries: Entries.
+  :type entries: NDArray
+  :return: Sorted entries, without duplicates.
+  :rtype: NDArray
+  """
+  entries = entries[np.lexsort((entries["move"], entries["key"]))]
+  starts = np.flatnonzero(np.r_[True, (entries["key"][1:] != entries["key"][:-1]) | (entries["move"][1:] != entries["move"][:-1])])
+  aggregated = entries[starts]
+  aggregated["counts"] = np.add.reduceat(entries["counts"], starts, axis=0)
+  return aggregated
+
+def _read_run(path: str) -> Iterator[tuple[int, int, list[int]]]:
+  """
+  Streams the entries of a sorted run, a block at a time.
+
+  :param path: Path of the run.
+  :type path: str
+  :return: Key, move and counts of each entry.
+  :rtype: Iterator[tuple[int, int, list[int]]]
+  """
+  run = np.load(path, mmap_mode="r")
+  for start in range(0, len(run), BLOCK_SIZE):
+    block = np.array(run[start:start + BLOCK_SIZE])
+    yield from zip(block["key"].tolist(), block["move"].tolist(), block["counts"].tolist())
+
+def _merge(runs: list[str], output: str, directory: str) -> int:
+  """
+  Merges sorted runs into a database, first writing each section to its own temporary file.
+
+  :param runs: Paths of the runs.
+  :type runs: list[str]
+  :param output: Path of the database.
+  :type output: str
+  :param directory: Directory of the temporary files.
+  :type directory: str
+  :return: Amount of entries of the database.
+  :rtype: int
+  """
+  sections = [os.path.join(directory, name) for name in ("keys", "counts", "moves")]
+  keys, counts, moves = np.zeros(BLOCK_SIZE, np.uint64), np.zeros((BLOCK_SIZE, 3), np.uint32), np.zeros(BLOCK_SIZE, np.uint32)
+  size = total = 0
+  with ExitStack() as stack:
+    files = [stack.enter_context(open(section, "wb")) for section in sections]
+    def flush() -> None:
+      nonlocal size
+      for file, section in zip(files, (keys, counts, moves)):
+        file.write(section[:size].tobytes())
+      size = 0
+    last = None
+    for key, move, entry_counts in heapq.merge(*map(_read_run, runs)):
+      if (key, move) == last:
+        counts[size - 1] += np.asarray(entry_counts, np.uint32)
+        continue
+      if size == BLOCK_SIZE:
+        flush()
+      keys[size], moves[size], counts[size] = key, move, entry_counts
+      last = (key, move)
+      size += 1
+      total += 1
+    flush()
+  with open(f"{output}.tmp", "wb") as file:
+    file.write(HEADER.pack(MAGIC, total))
+    for section in sections:
+      with open(section, "rb") as source:
+        shutil.copyfileobj(source, file)
+  os.replace(f"{output}.tmp", output)
+  return total
+
+def _unpack_move(board: Board, move: int) -> Optional[Move]:
+  """
+  Unpacks a move of the database for the given board.
+
+  :param board: Playing board.
+  :type board: Board
+  :param move: Packed move.
+  :type move: int
+  :return: Move, `None` for passing.
+  :rtype: Optional[Move]
+  """
+  if (index := move >> 16) == PASS:
+    return None
+  bug = board.pieces[index]
+  return Move(bug, board.pos_from_bug(bug), Position(_signed(move >> 8 & 0xFF), _signed(move & 0xFF)))
+
+def _signed(byte: int) -> int:
+  """
+  Reads a byte as a signed integer.
+
+  :param byte: Byte.
+  :type byte: int
+  :return: Signed integer.
+  :rtype: int
+  """
+  return byte - 0x100 if byte & 0x80 else byte
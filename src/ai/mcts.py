@@ -0,0 +1,456 @@
+from typing import Optional, Final, Any
+from math import sqrt, log, exp
+from random import Random as RandomGenerator
+from multiprocessing import Event as ProcessEvent
+from concurrent.futures import ProcessPoolExecutor, Future, wait
+from core.board import Board
+from core.game import Move
+from core.enums import GameState
+from ai.brain import Brain, AlphaBetaPruner, static_move_score
+from ai.time_manager import TimeManager
+from ai.network import NeuralEvaluator
+
+class MCTSNode:
+  """
+  Node of a Monte Carlo search tree, reached by playing its move from the parent node.
+  """
+  __slots__ = ("move", "prior", "visits", "value", "children")
+
+  def __init__(self, move: Optional[Move], prior: float = 1) -> None:
+    self.move: Optional[Move] = move
+    self.prior: float = prior
+    """
+    Prior probability of the move, from the static move scores.
+    """
+    self.visits: int = 0
+    self.value: float = 0
+    """
+    Sum of the playout results from the point of view of the player who played the move.
+    """
+    self.children: Optional[list[MCTSNode]] = None
+    """
+    Child nodes, ordered by prior probability, or None if the node has not been expanded yet.
+    """
+
+class MonteCarloTreeSearch(Brain):
+  """
+  AI agent following a Monte Carlo tree search policy.
+  """
+
+  UCT_EXPLORATION: Final[float] = 1.4
+  """
+  Exploration constant of the UCT selection.
+  """
+  PUCT_EXPLORATION: Final[float] = 1.5
+  """
+  Exploration constant of the PUCT selection.
+  """
+  FIRST_PLAY_URGENCY: Final[float] = 0.5
+  """
+  Value assumed for unvisited nodes by the PUCT selection.
+  """
+  PLAYOUT_TURNS: Final[int] = 8
+  """
+  | Maximum length of each playout.
+  | Hive games rarely end by chance, so playouts are cut short and their final position is evaluated instead.
+  """
+  PLAYOUTS_PER_DEPTH: Final[int] = 16
+  """
+  Amount of playouts a unit of the depth limit is worth.
+  """
+  EVALUATION_SCALE: Final[float] = 20
+  """
+  Evaluation that turns into about a 73% win probability, when scoring playouts cut short or neural evaluations.
+  """
+  BATCH_SIZE: Final[int] = 8
+  """
+  Amount of leaves evaluated together by the neural evaluator.
+  """
+  PRIOR_TEMPERATURE: Final[float] = 10
+  """
+  Temperature of the softmax turning static move scores into prior probabilities.
+  """
+  PRIOR_CAP: Final[float] = 100
+  """
+  Cap on the static move scores, so that winning moves don't overflow the softmax.
+  """
+  _worker_stop_event: Any = None
+  """
+  Event shared by the current worker process with the parent process to stop searching, see `_parallel_search`.
+  """
+
+  def __init__(self, puct: bool = True, seed: Optional[int] = None, evaluator: Optional[NeuralEvaluator] = None) -> None:
+    """
+    Monte Carlo agent instantiation.
+
+    :param puct: Whether to select nodes with PUCT, weighting exploration by the priors, rather than plain UCT, defaults to `True`.
+    :type puct: bool, optional
+    :param seed: Seed of the playouts random number generator, defaults to a random one.
+    :type seed: Optional[int], optional
+    :param evaluator: Neural network scoring the leaves in batches in place of playouts, defaults to none.
+    :type evaluator: Optional[NeuralEvaluator], optional
+    """
+    super().__init__()
+    self._puct: Final[bool] = puct
+    self._evaluator: Final[Optional[NeuralEvaluator]] = evaluator
+    self._rng: Final[RandomGenerator] = RandomGenerator(seed)
+    self._root: Optional[MCTSNode] = None
+    """
+    Root of the last search tree, kept to reuse the subtree of the position reached on the next search.
+    """
+    self._root_moves: list[Optional[Move]] = []
+    """
+    Moves leading to the root of the last search tree.
+    """
+    self._clock: TimeManager = TimeManager()
+    """
+    Time budget of the current search.
+    """
+    self._playouts: int = 0
+    self._pool: Optional[ProcessPoolExecutor] = None
+    """
+    Pool of worker processes for root-parallel searches, created on first use.
+    """
+    self._pool_size: int = 0
+    self._pool_stop_event: Any = None
+    """
+    Event shared with the worker processes to ask them to stop searching.
+    """
+
+  def reset(self) -> None:
+    super().reset()
+    self._root = None
+    self._root_moves = []
+
+  def close(self) -> None:
+    super().close()
+    self._shutdown_pool()
+
+  def _find_best_move(self, board: Board, max_branching_factor: int, max_depth: int = 0, time_limit: float = 0, num_threads: int = 1, late_move_reductions: bool = False, null_move_pruning: bool = False) -> str:
+    if len(moves := board.calculate_valid_moves()) <= 1:
+      # Nothing to think about.
+      return board.stringify_move(next(iter(moves), None))
+    self._clock = TimeManager(time_limit)
+    if num_threads > 1 and not self._evaluator:
+      root = self._parallel_search(board, max_branching_factor, max_depth * MonteCarloTreeSearch.PLAYOUTS_PER_DEPTH, num_threads)
+    else:
+      root = self._search(board, max_branching_factor, max_depth * MonteCarloTreeSearch.PLAYOUTS_PER_DEPTH)
+    # The most visited move is the most robust choice, and falls back to the highest prior if no playout completed.
+    assert root.children
+    return board.stringify_move(max(root.children, key=lambda child: child.visits).move)
+
+  def _predict_reply(self, board: Board) -> Optional[Move]:
+    if (node := self._find_node(board)) and node.children:
+      return max(node.children, key=lambda child: child.visits).move
+    return None
+
+  def _ponder(self, board: Board, max_branching_factor: int) -> None:
+    self._clock = TimeManager()
+    self._search(board, max_branching_factor)
+
+  def _search(self, board: Board, max_branching_factor: int, max_playouts: int = 0) -> MCTSNode:
+    """
+    Grows the search tree of the given board until the amount of playouts is reached, the time budget runs out or the search is asked to stop.
+
+    :param board: Playing board.
+    :type board: Board
+    :param max_branching_factor: Maximum branching factor.
+    :type max_branching_factor: int
+    :param max_playouts: Maximum amount of playouts, `0` for no limit, defaults to `0`.
+    :type max_playouts: int, optional
+    :return: Root of the search tree.
+    :rtype: MCTSNode
+    """
+    root = self._find_node(board) or MCTSNode(None)
+    self._root = root
+    self._root_moves = list(board.moves)
+    if root.children is None:
+      self._expand(board, root, max_branching_factor)
+    self._playouts = 0
+    while (not max_playouts or self._playouts < max_playouts) and not self._stop_event.is_set() and not self._clock.expired():
+      if self._evaluator:
+        self._evaluate_leaves(board, root, max_branching_factor)
+        continue
+      path = self._descend(board, root, max_branching_factor)
+      result = _playout_result(board, self._rng, MonteCarloTreeSearch.PLAYOUT_TURNS)
+      board.undo(len(path) - 1)
+      self._backpropagate(path, result)
+    return root
+
+  def _parallel_search(self, board: Board, max_branching_factor: int, max_playouts: int, num_threads: int) -> MCTSNode:
+    """
+    | Grows a separate tree of the given board in each of `num_threads` worker processes, each with its share of the playouts, and merges the statistics of their root moves (root parallelism).
+    | Workers only report back once their search is over, so processes barely communicate, unlike when running the playouts of each leaf in parallel.
+    | Worker trees are discarded after each search, so unlike serial searches, parallel ones don't reuse the subtree of the position reached.
+
+    :param board: Playing board.
+    :type board: Board
+    :param max_branching_factor: Maximum branching factor.
+    :type max_branching_factor: int
+    :param max_playouts: Maximum amount of playouts, split among the workers, `0` for no limit.
+    :type max_playouts: int
+    :param num_threads: Amount of worker processes.
+    :type num_threads: int
+    :return: Root of the merged tree, only one ply deep.
+    :rtype: MCTSNode
+    """
+    pool = self._get_pool(num_threads)
+    self._pool_stop_event.clear()
+    futures: list[Future[list[tuple[Optional[Move], float, int, float]]]] = []
+    for _ in range(num_threads):
+      futures.append(pool.submit(MonteCarloTreeSearch._grow_worker_tree, str(board), max(board.max_snapshots // num_threads, 1), max_branching_factor, -(-max_playouts // num_threads), self._clock.worker_budget, self._puct, self._rng.getrandbits(32)))
+    while wait(futures, timeout=0.05).not_done:
+      if self._stop_event.is_set():
+        self._pool_stop_event.set()
+    # Moves with the same prior come in no particular order, so workers might not keep the same ones within the maximum branching factor.
+    children: dict[Optional[Move], MCTSNode] = {}
+    for future in futures:
+      for move, prior, visits, value in future.result():
+        child = children.setdefault(move, MCTSNode(move, prior))
+        child.visits += visits
+        child.value += value
+    root = MCTSNode(None)
+    root.children = list(children.values())
+    root.visits = sum(child.visits for child in root.children)
+    self._root = root
+    self._root_moves = list(board.moves)
+    self._playouts = root.visits
+    return root
+
+  def _descend(self, board: Board, root: MCTSNode, max_branching_factor: int) -> list[MCTSNode]:
+    """
+    Selects a path from the root to a leaf, playing its moves on the board and expanding the leaf if it was already visited.
+
+    :param board: Playing board, in the position of the root.
+    :type board: Board
+    :param root: Root of the search tree.
+    :type root: MCTSNode
+    :param max_branching_factor: Maximum branching factor.
+    :type max_branching_factor: int
+    :return: Nodes from the root to the leaf.
+    :rtype: list[MCTSNode]
+    """
+    node = root
+    path = [root]
+    while node.children:
+      node = self._select(node)
+      board.play_parsed(node.move)
+      path.append(node)
+    if node.visits and not board.gameover:
+      # Leaves are expanded on their second visit, so that the tree doesn't grow with moves seen only once.
+      self._expand(board, node, max_branching_factor)
+      assert node.children
+      node = self._select(node)
+      board.play_parsed(node.move)
+      path.append(node)
+    return path
+
+  def _evaluate_leaves(self, board: Board, root: MCTSNode, max_branching_factor: int) -> None:
+    """
+    | Selects up to `BATCH_SIZE` leaves and scores them with a single batched forward pass of the neural evaluator, in place of playouts.
+    | Selected paths take a virtual loss until the batch is evaluated, so that the following selections spread over different leaves.
+
+    :param board: Playing board, in the position of the root.
+    :type board: Board
+    :param root: Root of the search tree.
+    :type root: MCTSNode
+    :param max_branching_factor: Maximum branching factor.
+    :type max_branching_factor: int
+    """
+    assert self._evaluator
+    paths: list[list[MCTSNode]] = []
+    inputs: list[Any] = []
+    for _ in range(MonteCarloTreeSearch.BATCH_SIZE):
+      path = self._descend(board, root, max_branching_factor)
+      if board.gameover:
+        self._backpropagate(path, _playout_result(board, self._rng, 0))
+      else:
+        for node in path:
+          node.visits += 1
+        paths.append(path)
+        inputs.append(self._evaluator.encode(board))
+      board.undo(len(path) - 1)
+    if inputs:
+      for path, score in zip(paths, self._evaluator.forward(inputs).tolist()):
+        for node in path:
+          node.visits -= 1
+        self._backpropagate(path, _win_probability(score))
+
+  def _backpropagate(self, path: list[MCTSNode], result: float) -> None:
+    """
+    Adds the result of a playout from a leaf to every node along its path.
+
+    :param path: Nodes from the root to the leaf.
+    :type path: list[MCTSNode]
+    :param result: Result, from the point of view of the player to move in the leaf.
+    :type result: float
+    """
+    # Each node keeps results from the point of view of the player who moved into it.
+    for node in reversed(path):
+      result = 1 - result
+      node.visits += 1
+      node.value += result
+    self._playouts += 1
+
+  def _find_node(self, board: Board) -> Optional[MCTSNode]:
+    """
+    Finds the node of the given board in the last search tree, following the moves played since its root.
+
+    :param board: Playing board.
+    :type board: Board
+    :return: Node of the board, if the tree reaches it.
+    :rtype: Optional[MCTSNode]
+    """
+    node = self._root
+    if not node or board.moves[:len(self._root_moves)] != self._root_moves:
+      return None
+    for move in board.moves[len(self._root_moves):]:
+      node = next((child for child in node.children or () if child.move == move), None)
+      if not node:
+        return None
+    return node
+
+  def _select(self, node: MCTSNode) -> MCTSNode:
+    """
+    Selects the child node to visit next, balancing exploitation and exploration.
+
+    :param node: Expanded node.
+    :type node: MCTSNode
+    :return: Child node.
+    :rtype: MCTSNode
+    """
+    assert node.children
+    if self._puct:
+      exploration = MonteCarloTreeSearch.PUCT_EXPLORATION * sqrt(node.visits)
+      return max(node.children, key=lambda child: (child.value / child.visits if child.visits else MonteCarloTreeSearch.FIRST_PLAY_URGENCY) + exploration * child.prior / (1 + child.visits))
+    log_visits = log(max(node.visits, 1))
+    # Unvisited children come first, in prior order.
+    return max(node.children, key=lambda child: child.value / child.visits + MonteCarloTreeSearch.UCT_EXPLORATION * sqrt(log_visits / child.visits) if child.visits else float('inf'))
+
+  def _expand(self, board: Board, node: MCTSNode, max_branching_factor: int) -> None:
+    """
+    Adds the children of the given node, keeping the most promising moves up to the maximum branching factor.
+
+    :param board: Playing board, in the position of the node.
+    :type board: Board
+    :param node: Node to expand.
+    :type node: MCTSNode
+    :param max_branching_factor: Maximum branching factor.
+    :type max_branching_factor: int
+    """
+    if not (moves := board.calculate_valid_moves()):
+      node.children = [MCTSNode(None)]
+      return
+    scores = {move: min(static_move_score(board, move), MonteCarloTreeSearch.PRIOR_CAP) for move in moves}
+    ordered = sorted(moves, key=scores.__getitem__, reverse=True)[:max_branching_factor]
+    best_score = scores[ordered[0]]
+    weights = [exp((scores[move] - best_score) / MonteCarloTreeSearch.PRIOR_TEMPERATURE) for move in ordered]
+    total = sum(weights)
+    node.children = [MCTSNode(move, weight / total) for move, weight in zip(ordered, weights)]
+
+  def _get_pool(self, num_threads: int) -> ProcessPoolExecutor:
+    """
+    Returns the pool of worker processes, (re)creating it if its size doesn't match the requested one.
+
+    :param num_threads: Amount of worker processes.
+    :type num_threads: int
+    :return: Pool of worker processes.
+    :rtype: ProcessPoolExecutor
+    """
+    if not self._pool or self._pool_size != num_threads:
+      self._shutdown_pool()
+      self._pool_stop_event = ProcessEvent()
+      self._pool = ProcessPoolExecutor(num_threads, initializer=MonteCarloTreeSearch._init_worker, initargs=(self._pool_stop_event, AlphaBetaPruner.EVALUATION_WEIGHTS))
+      self._pool_size = num_threads
+    return self._pool
+
+  def _shutdown_pool(self) -> None:
+    """
+    Shuts down the pool of worker processes, if any.
+    """
+    if self._pool:
+      self._pool_stop_event.set()
+      self._pool.shutdown(cancel_futures=True)
+      self._pool = None
+      self._pool_size = 0
+
+  @classmethod
+  def _init_worker(cls, stop_event: Any, weights: tuple[float, ...]) -> None:
+    """
+    Initializes a worker process for root-parallel searches.
+
+    :param stop_event: Event shared with the parent process to stop searching.
+    :type stop_event: Any
+    :param weights: Evaluation weights of the parent process, scoring playouts cut short.
+    :type weights: tuple[float, ...]
+    """
+    AlphaBetaPruner.EVALUATION_WEIGHTS = weights
+    cls._worker_stop_event = stop_event
+
+  @classmethod
+  def _grow_worker_tree(cls, gamestring: str, max_snapshots: int, max_branching_factor: int, max_playouts: int, time_limit: float, puct: bool, seed: int) -> list[tuple[Optional[Move], float, int, float]]:
+    """
+    Grows the search tree of the given position in a worker process, see `_parallel_search`.
+
+    :param gamestring: GameString of the root position.
+    :type gamestring: str
+    :param max_snapshots: Amount of positions whose valid moves are cached, the share of the parent process board for this worker.
+    :type max_snapshots: int
+    :param max_branching_factor: Maximum branching factor.
+    :type max_branching_factor: int
+    :param max_playouts: Maximum amount of playouts, `0` for no limit.
+    :type max_playouts: int
+    :param time_limit: Maximum time (in seconds) for the search, `0` for no limit.
+    :type time_limit: float
+    :param puct: Whether to select nodes with PUCT, like the parent process agent.
+    :type puct: bool
+    :param seed: Seed of the playouts random number generator.
+    :type seed: int
+    :return: Move, prior, visits and value of each root child.
+    :rtype: list[tuple[Optional[Move], float, int, float]]
+    """
+    brain = cls(puct, seed)
+    brain._stop_event = cls._worker_stop_event
+    brain._clock = TimeManager(time_limit)
+    root = brain._search(Board(gamestring, max_snapshots), max_branching_factor, max_playouts)
+    return [(child.move, child.prior, child.visits, child.value) for child in root.children or ()]
+
+def _playout_result(board: Board, rng: RandomGenerator, max_turns: int) -> float:
+  """
+  | Runs a playout from the given board and scores it from the point of view of the player to move.
+  | Playouts cut short are scored by squashing the evaluation of their final position into a win probability.
+
+  :param board: Playing board, left as it was.
+  :type board: Board
+  :param rng: Random number generator picking the moves.
+  :type rng: RandomGenerator
+  :param max_turns: Maximum length of the playout.
+  :type max_turns: int
+  :return: Result between `0` (loss) and `1` (win).
+  :rtype: float
+  """
+  turns = board.playout(max_turns, rng)
+  if board.state is GameState.DRAW:
+    result = 0.5
+  elif board.current_player_has_won:
+    result = 1.0
+  elif board.current_opponent_has_won:
+    result = 0.0
+  else:
+    result = _win_probability(sum(weight * feature for weight, feature in zip(AlphaBetaPruner.EVALUATION_WEIGHTS, board.evaluation_features(board.current_player_color))))
+  if turns & 1:
+    # The player to move changed an odd amount of times.
+    result = 1 - result
+  board.undo_playout(turns)
+  return result
+
+def _win_probability(score: float) -> float:
+  """
+  Squashes an evaluation into a win probability for the player it's evaluated for.
+
+  :param score: Evaluation.
+  :type score: float
+  :return: Win probability.
+  :rtype: float
+  """
+  return 1 / (1 + exp(-score / MonteCarloTreeSearch.EVALUATION_SCALE))
@@ -0,0 +1,130 @@
+from typing import Final, Optional, Iterable, Sequence
+import numpy as np
+from numpy.typing import NDArray
+from core.board import Board
+
+class NeuralEvaluator:
+  """
+  | CPU-only neural network evaluator, running batched forward passes with NumPy.
+  | The network is a multilayer perceptron over the evaluation features of the player to move, with ReLU hidden layers and a single linear output in evaluation units.
+  """
+
+  INPUT_SIZE: Final[int] = len(Board.EVALUATION_FEATURES)
+  """
+  Size of the network input, one value per evaluation feature.
+  """
+
+  def __init__(self, layers: list[tuple[NDArray[np.float32], NDArray[np.float32]]]) -> None:
+    """
+    Neural evaluator instantiation.
+
+    :param layers: Weights and biases of each layer, weights shaped as (inputs, outputs).
+    :type layers: list[tuple[NDArray[np.float32], NDArray[np.float32]]]
+    :raises ValueError: If the layers don't chain from `INPUT_SIZE` inputs to a single output.
+    """
+    if not layers:
+      raise ValueError("A network needs at least one layer")
+    size = NeuralEvaluator.INPUT_SIZE
+    for index, (weights, biases) in enumerate(layers):
+      if weights.ndim != 2 or weights.shape[0] != size or biases.shape != (weights.shape[1],):
+        raise ValueError(f"Layer {index} has weights {weights.shape} and biases {biases.shape}, but {size} inputs were expected")
+      size = weights.shape[1]
+    if size != 1:
+      raise ValueError(f"The last layer must have a single output, but it has {size}")
+    self._layers: Final[list[tuple[NDArray[np.float32], NDArray[np.float32]]]] = [(weights.astype(np.float32), biases.astype(np.float32)) for weights, biases in layers]
+
+  @property
+  def layers(self) -> list[tuple[NDArray[np.float32], NDArray[np.float32]]]:
+    """
+    Weights and biases of each layer.
+
+    :rtype: list[tuple[NDArray[np.float32], NDArray[np.float32]]]
+    """
+    return self._layers
+
+  @classmethod
+  def load(cls, path: str) -> "NeuralEvaluator":
+    """
+    Loads a network from an `.npz` file with arrays `w0`, `b0`, `w1`, `b1`, and so on.
+
+    :param path: Path of the file.
+    :type path: str
+    :return: Neural evaluator.
+    :rtype: NeuralEvaluator
+    """
+    with np.load(path) as arrays:
+      return cls([(arrays[f"w{index}"], arrays[f"b{index}"]) for index in range(len(arrays.files) // 2)])
+
+  @classmethod
+  def random(cls, hidden_sizes: Iterable[int] = (), seed: Optional[int] = None) -> "NeuralEvaluator":
+    """
+    Creates a network with randomly initialized weights and zero biases, as a starting point for training.
+
+    :param hidden_sizes: Size of each hidden layer, defaults to none.
+    :type hidden_sizes: Iterable[int], optional
+    :param seed: Seed of the initialization, defaults to a random one.
+    :type seed: Optional[int], optional
+    :return: Neural evaluator.
+    :rtype: NeuralEvaluator
+    """
+    rng = np.random.default_rng(seed)
+    sizes = [NeuralEvaluator.INPUT_SIZE, *hidden_sizes, 1]
+    # He initialization, suited to ReLU activations.
+    return cls([(rng.normal(0, np.sqrt(2 / inputs), (inputs, outputs)), np.zeros(outputs)) for inputs, outputs in zip(sizes, sizes[1:])])
+
+  def save(self, path: str) -> None:
+    """
+    Saves the network to an `.npz` file, see `load`.
+
+    :param path: Path of the file.
+    :type path: str
+    """
+    np.savez(path, **{f"{name}{index}": array for index, layer in enumerate(self._layers) for name, array in zip("wb", layer)})
+
+  def encode(self, board: Board) -> NDArray[np.float32]:
+    """
+    Encodes the given board as the network input, from the point of view of the player to move.
+
+    :param board: Playing board.
+    :type board: Board
+    :return: Network input.
+    :rtype: NDArray[np.float32]
+    """
+    return np.array(board.evaluation_features(board.current_player_color), dtype=np.float32)
+
+  def forward(self, inputs: NDArray[np.float32] | Sequence[NDArray[np.float32]]) -> NDArray[np.float32]:
+    """
+    Runs a single vectorized forward pass over a batch of encoded boards.
+
+    :param inputs: Encoded boards, either stacked as (batch, `INPUT_SIZE`) or as a sequence of inputs.
+    :type inputs: NDArray[np.float32] | Sequence[NDArray[np.float32]]
+    :return: Evaluation of each board.
+    :rtype: NDArray[np.float32]
+    """
+    outputs = np.asarray(inputs, dtype=np.float32)
+    for weights, biases in self._layers[:-1]:
+      outputs = np.maximum(outputs @ weights + biases, 0)
+    weights, biases = self._layers[-1]
+    return (outputs @ weights + biases)[:, 0]
+
+  def evaluate_batch(self, boards: Iterable[Board]) -> NDArray[np.float32]:
+    """
+    Evaluates a batch of boards with a single forward pass, each from the point of view of its player to move.
+
+    :param boards: Playing boards.
+    :type boards: Iterable[Board]
+    :return: Evaluation of each board.
+    :rtype: NDArray[np.float32]
+    """
+    return self.forward([self.encode(board) for board in boards])
+
+  def evaluate(self, board: Board) -> float:
+    """
+    Evaluates a single board, from the point of view of its player to move.
+
+    :param board: Playing board.
+    :type board: Board
+    :return: Evaluation.
+    :rtype: float
+    """
+    return float(self.forward(self.encode(board)[np.newaxis])[0])
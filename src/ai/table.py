@@ -1,8 +1,42 @@
 from collections import OrderedDict
+from array import array
+from multiprocessing.shared_memory import SharedMemory
 from typing import Optional, Final, Generic, TypeVar
 from abc import ABC, abstractmethod
 from enum import IntEnum, auto
-from core.game import Move
+import numpy as np
+from core.enums import PlayerColor, BugType
+from core.game import Position, Bug, Move
+
+_COORD_BITS: Final[int] = 7
+_COORD_OFFSET: Final[int] = 1 << (_COORD_BITS - 1)
+_COORD_MASK: Final[int] = (1 << _COORD_BITS) - 1
+_MOVE_BITS: Final[int] = 8 + 4 * _COORD_BITS
+"""
+| A packed move is made of, from the lowest bit: presence flag, color, bug type (3 bits), bug id (2 bits), origin presence flag, origin and destination coordinates.
+| Coordinates are offset to fit in `_COORD_BITS` unsigned bits each.
+"""
+_MOVE_MASK: Final[int] = (1 << _MOVE_BITS) - 1
+_TYPE_SHIFT: Final[int] = _MOVE_BITS
+_TYPE_MASK: Final[int] = 0b11
+_DEPTH_SHIFT: Final[int] = _TYPE_SHIFT + 2
+_DEPTH_MASK: Final[int] = 0xFF
+_GENERATION_SHIFT: Final[int] = _DEPTH_SHIFT + 8
+_GENERATION_MASK: Final[int] = (1 << (64 - _GENERATION_SHIFT)) - 1
+"""
+| Generations take every bit left in the packed entry data, so stamps wrap around only after hundreds of thousands of searches.
+| A narrower counter would wrap within a long session, bringing entries that should have long aged back to life.
+"""
+_HEADER_WORDS: Final[int] = 1
+_SLOT_WORDS: Final[int] = 3
+_BUG_TYPE_BITS: Final[int] = 3
+_BUG_ID_BITS: Final[int] = 2
+_CELL_BITS: Final[int] = 6
+_CELL_MASK: Final[int] = (1 << _CELL_BITS) - 1
+_COLORS: Final[list[PlayerColor]] = list(PlayerColor)
+_BUG_TYPES: Final[list[BugType]] = list(BugType)
+_COLOR_INDICES: Final[dict[PlayerColor, int]] = {color: index for index, color in enumerate(_COLORS)}
+_BUG_TYPE_INDICES: Final[dict[BugType, int]] = {bug_type: index for index, bug_type in enumerate(_BUG_TYPES)}
 
 class AgingTableEntry(ABC):
   """
@@ -10,7 +44,10 @@ class AgingTableEntry(ABC):
   """
 
   def __init__(self) -> None:
-    self.age: int = 0
+    self.generation: int = 0
+    """
+    Generation of the table when the entry was stored.
+    """
 
 _Entry = TypeVar("_Entry", bound=AgingTableEntry)
 """
@@ -24,6 +61,8 @@ Value type generic for `AgingTable`.
 class AgingTable(ABC, Generic[_Entry, _Value]):
   """
   | Aging table, storing `_Entry` type entries into a hash table that supports deleting them after their are not accessed for a long time (they aged).
+  | Entries are stamped with the current generation when stored, and every `flush` starts a new generation.
+  | Aged entries are dropped lazily, when they're probed or replaced.
   | The table might optionally wrap the inner entries and expose a value-based interface instead, depending on whether the `_Value` type is equal to the `_Entry` type.
   """
 
@@ -31,24 +70,27 @@ class AgingTable(ABC, Generic[_Entry, _Value]):
     self._table: OrderedDict[int, _Entry] = OrderedDict()
     self._max_age: Final[int] = max_age
     self._max_size: Final[int] = max_size
+    self._generation: int = 0
 
   def __setitem__(self, key: int, value: _Value) -> None:
     if len(self._table) > self._max_size:
       self._table.popitem(last=False)
-    self._table[key] = self._entry_from_value(value)
+    entry = self._entry_from_value(value)
+    entry.generation = self._generation
+    self._table[key] = entry
     self._table.move_to_end(key)
 
   def __delitem__(self, key: int) -> None:
     del self._table[key]
 
   def __getitem__(self, key: int) -> Optional[_Value]:
-    return self._value_from_entry(self._table[key]) if key in self._table else None
+    return self._value_from_entry(entry) if (entry := self._probe(key)) else None
 
   def __len__(self) -> int:
     return len(self._table)
 
   def __contains__(self, key: object) -> bool:
-    return key in self._table
+    return isinstance(key, int) and self._probe(key) is not None
 
   def __iter__(self):
     return iter(self._table)
@@ -78,9 +120,24 @@ class AgingTable(ABC, Generic[_Entry, _Value]):
     :rtype: _Value
     """
 
+  def _probe(self, key: int) -> Optional[_Entry]:
+    """
+    Retrieves the entry for the given key, dropping it if it aged.
+
+    :param key: Entry key.
+    :type key: int
+    :return: Entry, if present and not aged.
+    :rtype: Optional[_Entry]
+    """
+    if (entry := self._table.get(key)) is not None and self._generation - entry.generation >= self._max_age:
+      del self._table[key]
+      return None
+    return entry
+
   def keys(self):
     """
-    Returns all stored keys.
+    | Returns all stored keys.
+    | Might include keys of aged entries that were not probed since.
 
     :return: A set-like object providing a view on the stored keys.
     :rtype: OrderedDictKeysView
@@ -89,7 +146,8 @@ class AgingTable(ABC, Generic[_Entry, _Value]):
 
   def values(self):
     """
-    Returns all stored values.
+    | Returns all stored values.
+    | Might include aged entries that were not probed since.
 
     :return: A set-like object providing a view on the stored values.
     :rtype: OrderedDictValuesView
@@ -98,7 +156,8 @@ class AgingTable(ABC, Generic[_Entry, _Value]):
 
   def items(self):
     """
-    Returns all stored items.
+    | Returns all stored items.
+    | Might include aged entries that were not probed since.
 
     :return: A set-like object providing a view on the stored items.
     :rtype: OrderedDictItemsView
@@ -125,13 +184,9 @@ class AgingTable(ABC, Generic[_Entry, _Value]):
 
   def flush(self) -> None:
     """
-    Ages entries and removes old ones.
+    Ages entries by starting a new generation.
     """
-    to_delete = [key for key, entry in self._table.items() if entry.age >= self._max_age]
-    for key in to_delete:
-      del self._table[key]
-    for key, entry in self._table.items():
-      entry.age += 1
+    self._generation += 1
 
 class TranspositionTableEntryType(IntEnum):
   """
@@ -150,38 +205,456 @@ class TranspositionTableEntryType(IntEnum):
   The node is an upper bound, the search failed low.
   """
 
-class TranspositionTableEntry(AgingTableEntry):
+def _pack(entry_type: TranspositionTableEntryType, depth: int, move: Optional[Move], generation: int) -> int:
+  """
+  Packs the entry type, depth, move and generation of a transposition table entry into a single integer.
+
+  :param entry_type: Entry type.
+  :type entry_type: TranspositionTableEntryType
+  :param depth: Search depth, clamped to 255.
+  :type depth: int
+  :param move: Best move.
+  :type move: Optional[Move]
+  :param generation: Table generation, see `_GENERATION_MASK`.
+  :type generation: int
+  :return: Packed entry data.
+  :rtype: int
+  """
+  return _pack_move(move) | entry_type << _TYPE_SHIFT | min(depth, _DEPTH_MASK) << _DEPTH_SHIFT | generation << _GENERATION_SHIFT
+
+def _pack_move(move: Optional[Move]) -> int:
+  """
+  Packs a move into a single integer, see `_MOVE_BITS`.
+
+  :param move: Move.
+  :type move: Optional[Move]
+  :return: Packed move, `0` if the move is None.
+  :rtype: int
+  """
+  if not move:
+    return 0
+  bug = move.bug
+  packed = 1 | _COLOR_INDICES[bug.color] << 1 | _BUG_TYPE_INDICES[bug.type] << 2 | bug.id << 5
+  if (origin := move.origin):
+    packed |= 1 << 7 | (origin.q + _COORD_OFFSET) << 8 | (origin.r + _COORD_OFFSET) << (8 + _COORD_BITS)
+  return packed | (move.destination.q + _COORD_OFFSET) << (8 + 2 * _COORD_BITS) | (move.destination.r + _COORD_OFFSET) << (8 + 3 * _COORD_BITS)
+
+def _unpack_move(packed: int) -> Move:
+  """
+  Unpacks a non-zero packed move.
+
+  :param packed: Packed move.
+  :type packed: int
+  :return: Move.
+  :rtype: Move
+  """
+  bug = Bug(_COLORS[(packed >> 1) & 1], _BUG_TYPES[(packed >> 2) & 0b111], (packed >> 5) & 0b11)
+  origin = Position(((packed >> 8) & _COORD_MASK) - _COORD_OFFSET, ((packed >> (8 + _COORD_BITS)) & _COORD_MASK) - _COORD_OFFSET) if packed >> 7 & 1 else None
+  return Move(bug, origin, Position(((packed >> (8 + 2 * _COORD_BITS)) & _COORD_MASK) - _COORD_OFFSET, ((packed >> (8 + 3 * _COORD_BITS)) & _COORD_MASK) - _COORD_OFFSET))
+
+class TranspositionTableEntry:
   """
   Transposition table entry.
   """
+  __slots__ = ("type", "value", "depth", "move")
 
   def __init__(self, entry_type: TranspositionTableEntryType, value: float, depth: int, move: Optional[Move]) -> None:
-    super().__init__()
     self.type: TranspositionTableEntryType = entry_type
     self.value: float = value
     self.depth: int = depth
     self.move: Optional[Move] = move
 
-class TranspositionTable(AgingTable[TranspositionTableEntry, TranspositionTableEntry]):
+class TranspositionTable:
   """
-  Transposition table with max size and entry aging.
+  | Fixed-size transposition table, with a power-of-two capacity derived from a memory budget.
+  | Entries are packed into a flat buffer of 64-bit words, indexed by the lowest bits of the key, and grouped into buckets of `BUCKET_SIZE` slots.
+  | The first slot of each bucket is depth-preferred, the second one is always replaced.
+  | Each slot stores the key XORed with the rest of the slot content, so a hit is only reported when the whole slot is consistent.
+  | Entries are stamped with the search generation, so aged entries are treated as missing and get replaced first.
   """
 
-  def __init__(self, max_age: int = 10, max_size: int = 10_000_000) -> None:
-    super().__init__(max_age, max_size)
+  BUCKET_SIZE: Final[int] = 2
+  """
+  Amount of slots per bucket.
+  """
+  SLOT_SIZE: Final[int] = 24
+  """
+  Bytes taken by a single slot: verification word, packed move/bound/depth/generation and value.
+  """
+  DEFAULT_SIZE_MB: Final[int] = 32
+  """
+  Default memory budget, in megabytes.
+  """
+
+  @classmethod
+  def buffer_size(cls, size_mb: int) -> int:
+    """
+    Computes the size of the buffer backing a table with the given memory budget.
+
+    :param size_mb: Memory budget, in megabytes.
+    :type size_mb: int
+    :return: Size in bytes, header included.
+    :rtype: int
+    """
+    slots = TranspositionTable.BUCKET_SIZE
+    while slots * 2 * TranspositionTable.SLOT_SIZE <= size_mb * 2 ** 20:
+      slots *= 2
+    return _HEADER_WORDS * 8 + slots * TranspositionTable.SLOT_SIZE
+
+  def __init__(self, size_mb: int = DEFAULT_SIZE_MB, max_age: int = 10, buffer: Optional[memoryview] = None) -> None:
+    size = TranspositionTable.buffer_size(size_mb)
+    self._buffer: memoryview = memoryview(bytearray(size)) if buffer is None else buffer[:size]
+    """
+    Raw table content: a header word holding the current generation, followed by the slots.
+    """
+    self._words: memoryview = self._buffer.cast("Q")
+    """
+    | Table content, as 64-bit words.
+    | Each slot is made of three words: the key XORed with the other two, the packed entry data (see `_pack`) and the bits of the value.
+    | A packed entry data of `0` marks an empty slot.
+    """
+    self._scratch: array[int] = array("Q", [0])
+    self._scratch_value: memoryview = memoryview(self._scratch).cast("B").cast("d")
+    """
+    View used to reinterpret the bits of a value word as a float.
+    """
+    self._mask: Final[int] = (len(self._words) - _HEADER_WORDS) // _SLOT_WORDS // TranspositionTable.BUCKET_SIZE - 1
+    self._moves: dict[int, Move] = {}
+    """
+    Cache of unpacked moves, to avoid rebuilding the same move over and over.
+    """
+    self._size_mb: Final[int] = size_mb
+    self._max_age: Final[int] = max_age
+    self.probes: int = 0
+    """
+    Amount of probes made by this process, for telemetry.
+    """
+    self.hits: int = 0
+    """
+    Amount of probes made by this process that found an entry, for telemetry.
+    """
+    self.stores: int = 0
+    """
+    Amount of entries stored by this process, for telemetry.
+    """
+    self.collisions: int = 0
+    """
+    Amount of entries stored by this process over a live entry for another position, for telemetry.
+    """
 
   def __setitem__(self, key: int, value: TranspositionTableEntry) -> None:
-    if key not in self._table or value.depth > self._table[key].depth:
-      super().__setitem__(key, value)
+    words = self._words
+    index = _HEADER_WORDS + (key & self._mask) * TranspositionTable.BUCKET_SIZE * _SLOT_WORDS
+    generation = words[0]
+    data = words[index + 1]
+    if self._is_live(data, generation):
+      if words[index] ^ data ^ words[index + 2] == key:
+        if value.depth < (data >> _DEPTH_SHIFT) & _DEPTH_MASK:
+          return
+      elif value.depth < (data >> _DEPTH_SHIFT) & _DEPTH_MASK:
+        index += _SLOT_WORDS
+        if self._is_live(data := words[index + 1], generation) and words[index] ^ data ^ words[index + 2] != key:
+          self.collisions += 1
+      else:
+        self.collisions += 1
+    self.stores += 1
+    self._scratch_value[0] = value.value
+    bits = self._scratch[0]
+    data = _pack(value.type, value.depth, value.move, generation)
+    words[index + 2] = bits
+    words[index + 1] = data
+    words[index] = key ^ data ^ bits
 
   def __getitem__(self, key: int) -> Optional[TranspositionTableEntry]:
-    return self._table[key] if key in self._table else None
+    words = self._words
+    first = _HEADER_WORDS + (key & self._mask) * TranspositionTable.BUCKET_SIZE * _SLOT_WORDS
+    generation = words[0]
+    self.probes += 1
+    for index in range(first, first + TranspositionTable.BUCKET_SIZE * _SLOT_WORDS, _SLOT_WORDS):
+      data = words[index + 1]
+      bits = words[index + 2]
+      if words[index] ^ data ^ bits == key and self._is_live(data, generation):
+        self.hits += 1
+        self._scratch[0] = bits
+        return TranspositionTableEntry(TranspositionTableEntryType((data >> _TYPE_SHIFT) & _TYPE_MASK), self._scratch_value[0], (data >> _DEPTH_SHIFT) & _DEPTH_MASK, self._unpack_move(data & _MOVE_MASK))
+    return None
+
+  @property
+  def capacity(self) -> int:
+    """
+    Maximum amount of entries the table can hold.
 
-  def _entry_from_value(self, value: TranspositionTableEntry) -> TranspositionTableEntry:
-    return value
+    :rtype: int
+    """
+    return (len(self._words) - _HEADER_WORDS) // _SLOT_WORDS
 
-  def _value_from_entry(self, entry: TranspositionTableEntry) -> TranspositionTableEntry:
-    return entry
+  @property
+  def size_mb(self) -> int:
+    """
+    Memory budget of the table, in megabytes.
+
+    :rtype: int
+    """
+    return self._size_mb
+
+  def clear(self) -> None:
+    """
+    Clears the table from all entries.
+    """
+    self._buffer[:] = bytes(len(self._buffer))
+    self._moves.clear()
+
+  def flush(self) -> None:
+    """
+    Ages entries by starting a new generation.
+    """
+    self._words[0] = (self._words[0] + 1) & _GENERATION_MASK
+
+  def close(self) -> None:
+    """
+    | Releases the views over the table buffer.
+    | The table must not be used afterwards.
+    """
+    self._scratch_value.release()
+    self._words.release()
+    self._buffer.release()
+
+  def _is_live(self, data: int, generation: int) -> bool:
+    """
+    Checks whether the given packed entry data belongs to a stored entry that has not aged yet.
+
+    :param data: Packed entry data.
+    :type data: int
+    :param generation: Current generation.
+    :type generation: int
+    :return: Whether the entry is live.
+    :rtype: bool
+    """
+    return data != 0 and (generation - (data >> _GENERATION_SHIFT)) & _GENERATION_MASK < self._max_age
+
+  def _unpack_move(self, packed: int) -> Optional[Move]:
+    """
+    Maps a packed move back to its Move, reusing the cached one if available.
+
+    :param packed: Packed move.
+    :type packed: int
+    :return: Move.
+    :rtype: Optional[Move]
+    """
+    if not packed:
+      return None
+    if (move := self._moves.get(packed)) is None:
+      move = self._moves[packed] = _unpack_move(packed)
+    return move
+
+class SharedTranspositionTable(TranspositionTable):
+  """
+  | Transposition table backed by shared memory, so that several processes can probe and store entries concurrently.
+  | No locks are taken: a slot torn by concurrent writes fails the XOR verification and simply reads as a miss.
+  | Pickling a table and unpickling it in another process attaches to the same shared memory.
+  | Only the process that created the table unlinks the shared memory when closing it.
+  """
+
+  def __init__(self, size_mb: int = TranspositionTable.DEFAULT_SIZE_MB, max_age: int = 10, name: Optional[str] = None) -> None:
+    self._owner: Final[bool] = name is None
+    self._shared_memory: Final[SharedMemory] = SharedMemory(name, True, TranspositionTable.buffer_size(size_mb)) if name is None else SharedMemory(name)
+    super().__init__(size_mb, max_age, self._shared_memory.buf)
+
+  def __reduce__(self):
+    return (SharedTranspositionTable, (self._size_mb, self._max_age, self._shared_memory.name))
+
+  @property
+  def name(self) -> str:
+    """
+    Name of the underlying shared memory block.
+
+    :rtype: str
+    """
+    return self._shared_memory.name
+
+  def close(self) -> None:
+    super().close()
+    self._shared_memory.close()
+    if self._owner:
+      self._shared_memory.unlink()
+
+def move_index(move: Move) -> int:
+  """
+  | Maps the given move to an index in `[0, MOVE_INDICES)`, made of the piece moved and its destination cell.
+  | Within a position, the piece and the destination identify the move.
+  | Coordinates wrap around, so different cells can share an index if far enough apart, which is harmless for ordering heuristics.
+
+  :param move: Move.
+  :type move: Move
+  :return: Move index.
+  :rtype: int
+  """
+  bug = move.bug
+  return ((((_COLOR_INDICES[bug.color] << _BUG_TYPE_BITS | _BUG_TYPE_INDICES[bug.type]) << _BUG_ID_BITS | bug.id) << _CELL_BITS | move.destination.q & _CELL_MASK) << _CELL_BITS) | move.destination.r & _CELL_MASK
+
+MOVE_INDICES: Final[int] = 1 << (1 + _BUG_TYPE_BITS + _BUG_ID_BITS + 2 * _CELL_BITS)
+"""
+Amount of possible move indices, see `move_index`.
+"""
+
+class HistoryTable:
+  """
+  | History heuristic table, scoring moves by how often they turned out to be the best ones, indexed by `move_index`.
+  | Scores are halved between searches, so that older searches weigh less.
+  """
+
+  MAX_SCORE: Final[int] = 2 ** 30
+  """
+  Maximum score of a move.
+  """
+
+  def __init__(self) -> None:
+    self._scores: array[int] = array("l", [0]) * MOVE_INDICES
+
+  def __getitem__(self, index: int) -> int:
+    return self._scores[index]
+
+  def update(self, index: int, depth: int) -> None:
+    """
+    Rewards the move with the given index for being the best one at the given depth.
+
+    :param index: Move index.
+    :type index: int
+    :param depth: Remaining depth of the node.
+    :type depth: int
+    """
+    self._scores[index] = min(self._scores[index] + depth * depth, HistoryTable.MAX_SCORE)
+
+  def decay(self) -> None:
+    """
+    Halves every score, in place through a NumPy view of the table.
+    """
+    scores = np.frombuffer(self._scores, np.dtype("l"))
+    scores >>= 1
+
+  def clear(self) -> None:
+    """
+    Clears the table from all scores.
+    """
+    np.frombuffer(self._scores, np.dtype("l")).fill(0)
+
+class KillerTable:
+  """
+  | Killer moves table, keeping the last `SLOTS` moves that caused a cutoff at each ply from the root, by `move_index`.
+  | Killers are shifted along when the root moves forward, so that they keep referring to the same positions.
+  """
+
+  SLOTS: Final[int] = 2
+  """
+  Amount of killer moves per ply.
+  """
+  MAX_PLY: Final[int] = 128
+  """
+  Amount of plies with killer moves, deeper plies have none.
+  """
+
+  def __init__(self) -> None:
+    self._indices: array[int] = array("l", [-1]) * (KillerTable.MAX_PLY * KillerTable.SLOTS)
+
+  def is_killer(self, ply: int, index: int) -> bool:
+    """
+    Checks whether the move with the given index is a killer move at the given ply.
+
+    :param ply: Ply from the root.
+    :type ply: int
+    :param index: Move index.
+    :type index: int
+    :return: Whether the move is a killer move.
+    :rtype: bool
+    """
+    if ply < KillerTable.MAX_PLY:
+      slot = ply * KillerTable.SLOTS
+      return index in self._indices[slot:slot + KillerTable.SLOTS]
+    return False
+
+  def store(self, ply: int, index: int) -> None:
+    """
+    Stores the move with the given index as the newest killer move at the given ply, dropping the oldest one.
+
+    :param ply: Ply from the root.
+    :type ply: int
+    :param index: Move index.
+    :type index: int
+    """
+    if ply < KillerTable.MAX_PLY:
+      slot = ply * KillerTable.SLOTS
+      if self._indices[slot] != index:
+        self._indices[slot + 1:slot + KillerTable.SLOTS] = self._indices[slot:slot + KillerTable.SLOTS - 1]
+        self._indices[slot] = index
+
+  def shift(self, plies: int) -> None:
+    """
+    Moves the root forward by the given amount of plies, clearing the table if it moves backwards.
+
+    :param plies: Amount of plies.
+    :type plies: int
+    """
+    if plies < 0 or plies >= KillerTable.MAX_PLY:
+      self.clear()
+    elif plies:
+      self._indices = self._indices[plies * KillerTable.SLOTS:] + array("l", [-1]) * (plies * KillerTable.SLOTS)
+
+  def clear(self) -> None:
+    """
+    Clears the table from all killer moves.
+    """
+    self._indices = array("l", [-1]) * (KillerTable.MAX_PLY * KillerTable.SLOTS)
+
+class CounterMoveTable:
+  """
+  Counter-move table, storing the move that most recently refuted each move, both by `move_index`.
+  """
+
+  def __init__(self) -> None:
+    self._indices: array[int] = array("l", [-1]) * MOVE_INDICES
+
+  def __getitem__(self, index: int) -> int:
+    return self._indices[index]
+
+  def __setitem__(self, index: int, counter_index: int) -> None:
+    self._indices[index] = counter_index
+
+  def clear(self) -> None:
+    """
+    Clears the table from all counter-moves.
+    """
+    self._indices = array("l", [-1]) * MOVE_INDICES
+
+class PVTable:
+  """
+  | Fixed-size table of the best move found for each position, indexed by the lowest bits of the position hash.
+  | Newer entries always replace older ones, and the full hash is stored to verify hits.
+  """
+
+  DEFAULT_SIZE: Final[int] = 2 ** 16
+  """
+  Default amount of entries, must be a power of two.
+  """
+
+  def __init__(self, size: int = DEFAULT_SIZE) -> None:
+    self._mask: Final[int] = size - 1
+    self._keys: array[int] = array("Q", [0]) * size
+    self._moves: list[Optional[Move]] = [None] * size
+
+  def __getitem__(self, key: int) -> Optional[Move]:
+    slot = key & self._mask
+    return self._moves[slot] if self._keys[slot] == key else None
+
+  def __setitem__(self, key: int, move: Move) -> None:
+    slot = key & self._mask
+    self._keys[slot] = key
+    self._moves[slot] = move
+
+  def clear(self) -> None:
+    """
+    Clears the table from all entries.
+    """
+    self._moves = [None] * len(self._moves)
 
 class ScoreTableEntry(AgingTableEntry):
   """
@@ -201,7 +674,7 @@ class ScoreTable(AgingTable[ScoreTableEntry, float]):
     super().__init__(max_age, max_size)
 
   def __setitem__(self, key: int, value: float) -> None:
-    if key not in self._table:
+    if key not in self:
       super().__setitem__(key, value)
 
   def _entry_from_value(self, value: float) -> ScoreTableEntry:
@@ -209,3 +682,96 @@ class ScoreTable(AgingTable[ScoreTableEntry, float]):
 
   def _value_from_entry(self, entry: ScoreTableEntry) -> float:
     return entry.score
+
+class SearchTables:
+  """
+  | Caches of negamax searches, sized from a single memory budget.
+  | Zobrist keys include the side to move, so agents of both colors can share them.
+  | Half of the budget goes to the transposition table, a quarter to the score cache and the rest to the valid moves cache of boards (see `max_snapshots`).
+  """
+
+  DEFAULT_SIZE_MB: Final[int] = 128
+  """
+  Default memory budget, in megabytes.
+  """
+  SCORE_ENTRY_SIZE: Final[int] = 256
+  """
+  Approximate bytes taken by a score cache entry.
+  """
+  SNAPSHOT_SIZE: Final[int] = 16 * 2 ** 10
+  """
+  Approximate bytes taken by the valid moves of a middle game position, as cached by `Board`.
+  """
+
+  def __init__(self, size_mb: int = DEFAULT_SIZE_MB, transpos_table: Optional[TranspositionTable] = None) -> None:
+    self._size_mb: Final[int] = size_mb
+    self.transpos_table: TranspositionTable = transpos_table or TranspositionTable(max(size_mb // 2, 1))
+    self.cached_scores: ScoreTable = ScoreTable(max_size=max(size_mb * 2 ** 20 // 4 // SearchTables.SCORE_ENTRY_SIZE, 1))
+    self._full_move: int = 0
+    """
+    Full move of the last search, see `age`.
+    """
+
+  @property
+  def size_mb(self) -> int:
+    """
+    Memory budget of the tables, in megabytes.
+
+    :rtype: int
+    """
+    return self._size_mb
+
+  @property
+  def max_snapshots(self) -> int:
+    """
+    Amount of positions whose valid moves boards should cache, within the remaining quarter of the budget.
+
+    :rtype: int
+    """
+    return max(self._size_mb * 2 ** 20 // 4 // SearchTables.SNAPSHOT_SIZE, 1)
+
+  def share(self) -> SharedTranspositionTable:
+    """
+    | Moves the transposition table to shared memory, so that worker processes can use it, unless already there.
+    | Entries are dropped, as they're few and cheap to rebuild.
+
+    :return: Shared transposition table.
+    :rtype: SharedTranspositionTable
+    """
+    if not isinstance(self.transpos_table, SharedTranspositionTable):
+      self.transpos_table.close()
+      self.transpos_table = SharedTranspositionTable(self.transpos_table.size_mb)
+    return self.transpos_table
+
+  def clear(self) -> None:
+    """
+    Clears all tables from all entries.
+    """
+    self.transpos_table.clear()
+    self.cached_scores.clear()
+
+  def flush(self) -> None:
+    """
+    Ages the entries of all tables.
+    """
+    self.transpos_table.flush()
+    self.cached_scores.flush()
+
+  def age(self, turn: int) -> None:
+    """
+    | Ages the entries of all tables once per full move, however many agents search with them.
+    | Agents of both colors sharing the tables would otherwise age them twice as fast as a single agent.
+
+    :param turn: Turn of the position about to be searched.
+    :type turn: int
+    """
+    if (full_move := turn // 2) != self._full_move:
+      self._full_move = full_move
+      self.flush()
+
+  def close(self) -> None:
+    """
+    | Releases the tables.
+    | The tables must not be used afterwards.
+    """
+    self.transpos_table.close()
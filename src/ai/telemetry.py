@@ -0,0 +1,200 @@
+import sys
+import json
+from math import isfinite
+from typing import Final, Callable, TextIO, Optional, Any
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, asdict
+
+@dataclass
+class SearchCounters:
+  """
+  | Cumulative counters of the work done by a search.
+  | Subtracting two snapshots gives the work done in between, adding them merges the work of different processes.
+  """
+  nodes: int = 0
+  cutoffs: int = 0
+  """
+  Cutoffs of any kind: transposition table, null move and move loop ones.
+  """
+  move_cutoffs: int = 0
+  """
+  Beta cutoffs in the move loop.
+  """
+  first_move_cutoffs: int = 0
+  """
+  Beta cutoffs in the move loop caused by the first move searched.
+  """
+  tt_probes: int = 0
+  tt_hits: int = 0
+  tt_stores: int = 0
+  tt_collisions: int = 0
+  move_cache_probes: int = 0
+  move_cache_hits: int = 0
+
+  def __add__(self, other: "SearchCounters") -> "SearchCounters":
+    return SearchCounters(*(a + b for a, b in zip(asdict(self).values(), asdict(other).values())))
+
+  def __sub__(self, other: "SearchCounters") -> "SearchCounters":
+    return SearchCounters(*(a - b for a, b in zip(asdict(self).values(), asdict(other).values())))
+
+@dataclass
+class IterationStats:
+  """
+  Telemetry of a completed iterative deepening iteration.
+  """
+  depth: int
+  best_move: str
+  score: float
+  elapsed: float
+  """
+  Time (in seconds) since the search started.
+  """
+  iteration_time: float
+  branching_factor: float
+  """
+  Effective branching factor, see `TimeManager.branching_factor`.
+  """
+  counters: SearchCounters
+
+  @property
+  def nodes_per_second(self) -> float:
+    """
+    Nodes visited per second during the iteration.
+
+    :rtype: float
+    """
+    return self.counters.nodes / self.iteration_time if self.iteration_time else 0
+
+  @property
+  def tt_hit_rate(self) -> float:
+    """
+    Fraction of transposition table probes that found an entry.
+
+    :rtype: float
+    """
+    return _rate(self.counters.tt_hits, self.counters.tt_probes)
+
+  @property
+  def tt_collision_rate(self) -> float:
+    """
+    Fraction of transposition table stores that replaced a live entry for another position.
+
+    :rtype: float
+    """
+    return _rate(self.counters.tt_collisions, self.counters.tt_stores)
+
+  @property
+  def first_move_cutoff_rate(self) -> float:
+    """
+    Fraction of move loop cutoffs caused by the first move searched, a measure of move ordering quality.
+
+    :rtype: float
+    """
+    return _rate(self.counters.first_move_cutoffs, self.counters.move_cutoffs)
+
+  @property
+  def move_cache_hit_rate(self) -> float:
+    """
+    Fraction of valid moves calculations answered from the cache.
+
+    :rtype: float
+    """
+    return _rate(self.counters.move_cache_hits, self.counters.move_cache_probes)
+
+  def to_dict(self) -> dict[str, Any]:
+    """
+    | Flattens the stats, rates included, into a JSON serializable dictionary.
+    | Scores of won or lost positions are infinite, which JSON can't represent, so they become `None`.
+
+    :return: Stats.
+    :rtype: dict[str, Any]
+    """
+    stats = asdict(self)
+    stats.update(stats.pop("counters"))
+    stats["score"] = self.score if isfinite(self.score) else None
+    stats.update(nodes_per_second=self.nodes_per_second, tt_hit_rate=self.tt_hit_rate, tt_collision_rate=self.tt_collision_rate, first_move_cutoff_rate=self.first_move_cutoff_rate, move_cache_hit_rate=self.move_cache_hit_rate)
+    return stats
+
+class TelemetrySink(ABC):
+  """
+  Base abstract class for destinations of search telemetry.
+  """
+
+  @abstractmethod
+  def emit(self, stats: IterationStats) -> None:
+    """
+    | Handles the telemetry of an iteration.
+    | Might be called from the search thread.
+
+    :param stats: Iteration stats.
+    :type stats: IterationStats
+    """
+
+  def close(self) -> None:
+    """
+    Releases the resources of the sink.
+    """
+
+class StreamSink(TelemetrySink):
+  """
+  | Writes a human readable line per iteration to a text stream, standard error by default.
+  | Keep it off standard output, which is reserved to the protocol.
+  """
+
+  def __init__(self, stream: Optional[TextIO] = None) -> None:
+    self._stream: Final[Optional[TextIO]] = stream
+
+  def emit(self, stats: IterationStats) -> None:
+    counters = stats.counters
+    fields = [
+      f"Depth: {stats.depth}",
+      f"Best move: {stats.best_move}",
+      f"Score: {stats.score}",
+      f"Nodes: {counters.nodes}",
+      f"NPS: {stats.nodes_per_second:.0f}",
+      f"TT hits: {stats.tt_hit_rate:.1%}",
+      f"TT collisions: {stats.tt_collision_rate:.1%}",
+      f"First move cutoffs: {stats.first_move_cutoff_rate:.1%}",
+      f"EBF: {stats.branching_factor:.2f}",
+      f"Move cache hits: {stats.move_cache_hit_rate:.1%}",
+      f"Time: {stats.elapsed:.3f}"
+    ]
+    # Resolved on each call, so that the default follows redirections of standard error.
+    print("; ".join(fields), file=self._stream or sys.stderr, flush=True)
+
+class JsonlSink(TelemetrySink):
+  """
+  | Appends a JSON object per iteration to a file.
+  | The file is opened for each iteration, which is rare enough not to matter, so that nothing is left open if the sink is never closed.
+  """
+
+  def __init__(self, path: str) -> None:
+    self._path: Final[str] = path
+
+  def emit(self, stats: IterationStats) -> None:
+    with open(self._path, "a", encoding="utf-8") as file:
+      file.write(json.dumps(stats.to_dict(), allow_nan=False) + "\n")
+
+class CallbackSink(TelemetrySink):
+  """
+  Hands the telemetry of each iteration to an in-process callback.
+  """
+
+  def __init__(self, callback: Callable[[IterationStats], None]) -> None:
+    self._callback: Final[Callable[[IterationStats], None]] = callback
+
+  def emit(self, stats: IterationStats) -> None:
+    self._callback(stats)
+
+def _rate(count: int, total: int) -> float:
+  """
+  Computes a rate, `0` when there's nothing to count.
+
+  :param count: Counted events.
+  :type count: int
+  :param total: Total events.
+  :type total: int
+  :return: Rate.
+  :rtype: float
+  """
+  return count / total if total else 0
@@ -0,0 +1,141 @@
+from typing import Final
+from time import monotonic
+
+class TimeManager:
+  """
+  | Time budget of a search.
+  | The soft limit is checked between iterative deepening iterations: a new iteration starts only before the soft limit, and only if its cost, predicted from the branching factor observed in the previous iterations, fits within the hard limit.
+  | The hard limit is checked while searching, every `CHECK_INTERVAL` nodes, and stops the search when exceeded.
+  """
+
+  CHECK_INTERVAL: Final[int] = 16
+  """
+  Amount of nodes visited between clock checks, must be a power of two.
+  """
+  SOFT_LIMIT_RATIO: Final[float] = 0.5
+  """
+  Fraction of the hard limit after which no new iteration is started.
+  """
+  SAFETY_MARGIN: Final[float] = 0.05
+  """
+  | Maximum time (in seconds) kept aside from the budget to answer in time.
+  | At most a tenth of the budget is kept aside, so that millisecond budgets remain usable.
+  """
+  DEFAULT_BRANCHING_FACTOR: Final[float] = 4
+  """
+  Branching factor assumed until two iterations have been completed.
+  """
+  MIN_WORKER_BUDGET: Final[float] = 1e-3
+  """
+  Minimum time limit (in seconds) handed to worker searches of a limited search, see `worker_budget`.
+  """
+
+  def __init__(self, time_limit: float = 0) -> None:
+    self._start: Final[float] = monotonic()
+    self._hard_limit: Final[float] = time_limit - min(TimeManager.SAFETY_MARGIN, time_limit / 10)
+    self._soft_limit: Final[float] = self._hard_limit * TimeManager.SOFT_LIMIT_RATIO
+    self._limited: Final[bool] = time_limit > 0
+    self._iteration_start: float = self._start
+    self._iteration_nodes: int = 0
+    self._iteration_times: list[float] = []
+    self._iteration_node_counts: list[int] = []
+
+  @property
+  def limited(self) -> bool:
+    """
+    Whether the search has a time budget.
+
+    :rtype: bool
+    """
+    return self._limited
+
+  @property
+  def elapsed(self) -> float:
+    """
+    Time (in seconds) elapsed since the search started.
+
+    :rtype: float
+    """
+    return monotonic() - self._start
+
+  @property
+  def remaining(self) -> float:
+    """
+    Time (in seconds) left before the hard limit, `0` if there's no limit.
+
+    :rtype: float
+    """
+    return max(self._hard_limit - self.elapsed, 0) if self._limited else 0
+
+  @property
+  def worker_budget(self) -> float:
+    """
+    | Time limit (in seconds) to hand to a search running in a worker process, `0` if there's no limit.
+    | Never `0` when limited, even past the hard limit, because workers would read it as no limit.
+
+    :rtype: float
+    """
+    return max(self.remaining, TimeManager.MIN_WORKER_BUDGET) if self._limited else 0
+
+  @property
+  def iteration_time(self) -> float:
+    """
+    Time (in seconds) taken by the last completed iteration, `0` if none was completed.
+
+    :rtype: float
+    """
+    return self._iteration_times[-1] if self._iteration_times else 0
+
+  @property
+  def branching_factor(self) -> float:
+    """
+    Effective branching factor, as the growth in visited nodes between the last two completed iterations.
+
+    :rtype: float
+    """
+    if len(self._iteration_node_counts) > 1 and self._iteration_node_counts[-2]:
+      return max(self._iteration_node_counts[-1] / self._iteration_node_counts[-2], 1)
+    return TimeManager.DEFAULT_BRANCHING_FACTOR
+
+  def expired(self) -> bool:
+    """
+    Checks whether the hard limit was exceeded.
+
+    :return: Whether the search must stop.
+    :rtype: bool
+    """
+    return self._limited and self.elapsed > self._hard_limit
+
+  def can_start_iteration(self) -> bool:
+    """
+    Checks whether there's enough time to start and complete another iteration.
+
+    :return: Whether a new iteration should start.
+    :rtype: bool
+    """
+    if not self._limited:
+      return True
+    elapsed = self.elapsed
+    if not self._iteration_times:
+      return elapsed < self._hard_limit
+    return elapsed < self._soft_limit and elapsed + self._iteration_times[-1] * self.branching_factor <= self._hard_limit
+
+  def start_iteration(self, visited_nodes: int) -> None:
+    """
+    Marks the start of an iteration.
+
+    :param visited_nodes: Nodes visited so far during the search.
+    :type visited_nodes: int
+    """
+    self._iteration_start = monotonic()
+    self._iteration_nodes = visited_nodes
+
+  def end_iteration(self, visited_nodes: int) -> None:
+    """
+    Marks the end of an iteration, recording its cost.
+
+    :param visited_nodes: Nodes visited so far during the search.
+    :type visited_nodes: int
+    """
+    self._iteration_times.append(monotonic() - self._iteration_start)
+    self._iteration_node_counts.append(visited_nodes - self._iteration_nodes)
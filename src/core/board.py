@@ -1,4 +1,5 @@
 import re
+from random import Random
 from typing import Final, Optional
 from collections import defaultdict
 from dataclasses import dataclass
@@ -31,13 +32,33 @@ class Board:
   """
   Offsets of every neighboring tile in each direction.
   """
+  EVALUATION_FEATURES: Final[tuple[str, ...]] = (
+    "own_queen_neighbors",
+    "opponent_queen_neighbors",
+    "own_pieces_in_play",
+    "opponent_pieces_in_play",
+    "own_pinned_pieces",
+    "opponent_pinned_pieces",
+    "own_mobile_pieces",
+    "opponent_mobile_pieces"
+  )
+  """
+  Names of the evaluation features, in the same order they're returned by `evaluation_features`.
+  """
+
+  DEFAULT_MAX_SNAPSHOTS: Final[int] = 2 ** 12
+  """
+  Default amount of positions whose valid moves are cached.
+  """
 
-  def __init__(self, gamestring: str = "") -> None:
+  def __init__(self, gamestring: str = "", max_snapshots: int = DEFAULT_MAX_SNAPSHOTS) -> None:
     """
     Game Board instantation.
 
     :param gamestring: GameString, defaults to `""`.
     :type gamestring: str, optional
+    :param max_snapshots: Amount of positions whose valid moves are cached, defaults to `DEFAULT_MAX_SNAPSHOTS`.
+    :type max_snapshots: int, optional
     """
     game_type, state, turn, moves = self._parse_gamestring(gamestring)
     self.type: Final[GameType] = game_type
@@ -75,11 +96,28 @@ class Board:
     self._art_pos: set[Position] = set()
     self._hash: ZobristHash = ZobristHash(self.type)
     self._snapshots: dict[int, set[Move]] = {}
+    """
+    Cache of valid moves by position hash, evicting the oldest position when full.
+    """
+    self.max_snapshots: int = max_snapshots
+    self.move_cache_probes: int = 0
+    """
+    Amount of valid moves calculations requested, for telemetry.
+    """
+    self.move_cache_hits: int = 0
+    """
+    Amount of valid moves calculations answered from the cache of already seen positions, for telemetry.
+    """
     self._draw_counter: dict[int, int] = defaultdict(lambda: 0)
     self._queen_neighbors_by_color: dict[PlayerColor, QueenNeighbors] = {
       PlayerColor.WHITE: QueenNeighbors(set()),
       PlayerColor.BLACK: QueenNeighbors(set())
     }
+    self._pieces_in_play_by_color: dict[PlayerColor, int] = {color: 0 for color in PlayerColor}
+    self._pinned_pieces_by_color: dict[PlayerColor, int] = {color: 0 for color in PlayerColor}
+    """
+    Amount of pieces covered by another piece (and thus unable to move) for each player.
+    """
     self._play_initial_moves(moves)
 
   def __str__(self) -> str:
@@ -146,62 +184,77 @@ class Board:
     :return: set of valid moves.
     :rtype: set[Move]
     """
-    if not self.hash() in self._snapshots:
-      moves: set[Move] = set()
-      if self.state is GameState.NOT_STARTED or self.state is GameState.IN_PROGRESS:
-        self._update_cut_pos()
-        for bug, pos in self._bug_to_pos.items():
-          # Iterate over available pieces of the current player
-          if bug.color is self.current_player_color:
-            # Turn 0 is White player's first turn
-            if self.turn == 0:
-              if self._can_play_on_first_move(bug):
-                # Add the only valid placement for the current bug piece
-                moves.add(Move(bug, None, Board.ORIGIN))
-            # Turn 0 is Black player's first turn
-            elif self.turn == 1:
-              if self._can_play_on_first_move(bug):
-                # Add all valid placements for the current bug piece (can be placed only around the first White player's first piece)
-                moves.update(Move(bug, None, self._get_neighbor(Board.ORIGIN, direction)) for direction in Direction)
-            # Bug piece has not been played yet
-            elif not pos:
-              # Check for hand placement and queen placement related rules.
-              if self._can_bug_be_played(bug) and self._check_queen_placement(bug):
-                # Add all valid placements for the current bug piece
-                moves.update(Move(bug, None, placement) for placement in self._get_valid_placements_for_color())
-            # A bug piece in play can move only if it's at the top and its queen is in play and has not been moved in the previous player's turn
-            elif self.current_player_queen_in_play and self.bugs_from_pos(pos)[-1] == bug and self._was_not_last_moved(bug):
-              # Can't move pieces that would break the hive. Pieces stacked upon other can never break the hive by moving
-              if len(self.bugs_from_pos(pos)) > 1 or self._can_move_without_breaking_hive(pos):
-                match bug.type:
-                  case BugType.QUEEN_BEE:
-                    moves.update(self._get_sliding_moves(bug, pos, 1))
-                  case BugType.SPIDER:
-                    moves.update(self._get_sliding_moves(bug, pos, 3))
-                  case BugType.BEETLE:
-                    moves.update(self._get_beetle_moves(bug, pos))
-                  case BugType.GRASSHOPPER:
-                    moves.update(self._get_grasshopper_moves(bug, pos))
-                  case BugType.SOLDIER_ANT:
-                    moves.update(self._get_sliding_moves(bug, pos))
-                  case BugType.MOSQUITO:
-                    moves.update(self._get_mosquito_moves(bug, pos))
-                  case BugType.LADYBUG:
-                    moves.update(self._get_ladybug_moves(bug, pos))
-                  case BugType.PILLBUG:
-                    moves.update(self._get_sliding_moves(bug, pos, 1))
-                    moves.update(self._get_pillbug_special_moves(pos))
-              else:
-                match bug.type:
-                  case BugType.MOSQUITO:
-                    moves.update(self._get_mosquito_moves(bug, pos, True))
-                  case BugType.PILLBUG:
-                    moves.update(self._get_pillbug_special_moves(pos))
-                  case _:
-                    pass
+    self.move_cache_probes += 1
+    if self.hash() in self._snapshots:
+      self.move_cache_hits += 1
+    else:
+      moves = self._generate_valid_moves()
+      if len(self._snapshots) >= self.max_snapshots:
+        del self._snapshots[next(iter(self._snapshots))]
       self._snapshots[self.hash()] = moves
     return self._snapshots[self.hash()] or set()
 
+  def _generate_valid_moves(self) -> set[Move]:
+    """
+    Generates the set of valid moves for the current player, bypassing the cache.
+
+    :return: set of valid moves.
+    :rtype: set[Move]
+    """
+    moves: set[Move] = set()
+    if self.state is GameState.NOT_STARTED or self.state is GameState.IN_PROGRESS:
+      self._update_cut_pos()
+      for bug, pos in self._bug_to_pos.items():
+        # Iterate over available pieces of the current player
+        if bug.color is self.current_player_color:
+          # Turn 0 is White player's first turn
+          if self.turn == 0:
+            if self._can_play_on_first_move(bug):
+              # Add the only valid placement for the current bug piece
+              moves.add(Move(bug, None, Board.ORIGIN))
+          # Turn 0 is Black player's first turn
+          elif self.turn == 1:
+            if self._can_play_on_first_move(bug):
+              # Add all valid placements for the current bug piece (can be placed only around the first White player's first piece)
+              moves.update(Move(bug, None, self._get_neighbor(Board.ORIGIN, direction)) for direction in Direction)
+          # Bug piece has not been played yet
+          elif not pos:
+            # Check for hand placement and queen placement related rules.
+            if self._can_bug_be_played(bug) and self._check_queen_placement(bug):
+              # Add all valid placements for the current bug piece
+              moves.update(Move(bug, None, placement) for placement in self._get_valid_placements_for_color())
+          # A bug piece in play can move only if it's at the top and its queen is in play and has not been moved in the previous player's turn
+          elif self.current_player_queen_in_play and self.bugs_from_pos(pos)[-1] == bug and self._was_not_last_moved(bug):
+            # Can't move pieces that would break the hive. Pieces stacked upon other can never break the hive by moving
+            if len(self.bugs_from_pos(pos)) > 1 or self._can_move_without_breaking_hive(pos):
+              match bug.type:
+                case BugType.QUEEN_BEE:
+                  moves.update(self._get_sliding_moves(bug, pos, 1))
+                case BugType.SPIDER:
+                  moves.update(self._get_sliding_moves(bug, pos, 3))
+                case BugType.BEETLE:
+                  moves.update(self._get_beetle_moves(bug, pos))
+                case BugType.GRASSHOPPER:
+                  moves.update(self._get_grasshopper_moves(bug, pos))
+                case BugType.SOLDIER_ANT:
+                  moves.update(self._get_sliding_moves(bug, pos))
+                case BugType.MOSQUITO:
+                  moves.update(self._get_mosquito_moves(bug, pos))
+                case BugType.LADYBUG:
+                  moves.update(self._get_ladybug_moves(bug, pos))
+                case BugType.PILLBUG:
+                  moves.update(self._get_sliding_moves(bug, pos, 1))
+                  moves.update(self._get_pillbug_special_moves(pos))
+            else:
+              match bug.type:
+                case BugType.MOSQUITO:
+                  moves.update(self._get_mosquito_moves(bug, pos, True))
+                case BugType.PILLBUG:
+                  moves.update(self._get_pillbug_special_moves(pos))
+                case _:
+                  pass
+    return moves
+
   def play(self, move_string: str):
     """
     Plays the given move.
@@ -236,6 +289,7 @@ class Board:
       self._draw_counter[self.hash()] += 1
       if self._draw_counter[self.hash()] > 2:
         self.state = GameState.DRAW
+        self.gameover = True
       return self
     raise ValueError(f"You can't {"play" if move else Move.PASS} when the game is over")
 
@@ -250,7 +304,13 @@ class Board:
       self._bug_to_pos[move.bug] = move.destination
       if move.origin:
         self._pos_to_bug[move.origin].pop()
+        if (origin_bugs := self._pos_to_bug[move.origin]):
+          self._pinned_pieces_by_color[origin_bugs[-1].color] -= 1
+      else:
+        self._pieces_in_play_by_color[move.bug.color] += 1
       if move.destination in self._pos_to_bug:
+        if (destination_bugs := self._pos_to_bug[move.destination]):
+          self._pinned_pieces_by_color[destination_bugs[-1].color] += 1
         self._pos_to_bug[move.destination].append(move.bug)
       else:
         self._pos_to_bug[move.destination] = [move.bug]
@@ -261,17 +321,13 @@ class Board:
           neighbor = self._get_neighbor(move.destination, direction)
           self._queen_neighbors_by_color[move.bug.color].neighbors.add(neighbor)
           self._queen_neighbors_by_color[move.bug.color].count += bool(self.bugs_from_pos(neighbor))
-      else:
-        if len(self.bugs_from_pos(move.destination)) == 1:
-          if move.destination in self._queen_neighbors_by_color[PlayerColor.WHITE].neighbors:
-            self._queen_neighbors_by_color[PlayerColor.WHITE].count += 1
-          elif move.destination in self._queen_neighbors_by_color[PlayerColor.BLACK].neighbors:
-            self._queen_neighbors_by_color[PlayerColor.BLACK].count += 1
-        if move.origin and not self.bugs_from_pos(move.origin):
-          if move.origin in self._queen_neighbors_by_color[PlayerColor.WHITE].neighbors:
-            self._queen_neighbors_by_color[PlayerColor.WHITE].count -= 1
-          elif move.origin in self._queen_neighbors_by_color[PlayerColor.BLACK].neighbors:
-            self._queen_neighbors_by_color[PlayerColor.BLACK].count -= 1
+      # A cell can neighbor both queens, and a moving queen is a neighbor for the other one.
+      for color, queen_neighbors in self._queen_neighbors_by_color.items():
+        if color is not move.bug.color or move.bug.type is not BugType.QUEEN_BEE:
+          if move.destination in queen_neighbors.neighbors and len(self.bugs_from_pos(move.destination)) == 1:
+            queen_neighbors.count += 1
+          if move.origin in queen_neighbors.neighbors and not self.bugs_from_pos(move.origin):
+            queen_neighbors.count -= 1
       white_queen_surrounded = self._queen_neighbors_by_color[PlayerColor.WHITE].count == 6
       black_queen_surrounded = self._queen_neighbors_by_color[PlayerColor.BLACK].count == 6
       if black_queen_surrounded and white_queen_surrounded:
@@ -303,8 +359,8 @@ class Board:
           self.current_player_color = self.current_player_color.opposite
           self._draw_counter[self.hash()] -= 1
           self._update_hash()
-          if self.move_strings:
-            # Move string history might not be available when this method gets called from a "simulation" of an agent.
+          if len(self.move_strings) == len(self.moves):
+            # Move string history might not be available for the moves played by a "simulation" of an agent.
             self.move_strings.pop()
           self._undo(self.moves.pop())
         if self.turn == 0:
@@ -323,9 +379,15 @@ class Board:
     """
     if move:
       self._pos_to_bug[move.destination].pop()
+      if (destination_bugs := self._pos_to_bug[move.destination]):
+        self._pinned_pieces_by_color[destination_bugs[-1].color] -= 1
       self._bug_to_pos[move.bug] = move.origin
       if move.origin:
+        if (origin_bugs := self._pos_to_bug[move.origin]):
+          self._pinned_pieces_by_color[origin_bugs[-1].color] += 1
         self._pos_to_bug[move.origin].append(move.bug)
+      else:
+        self._pieces_in_play_by_color[move.bug.color] -= 1
       if move.bug.type is BugType.QUEEN_BEE:
         self._queen_neighbors_by_color[move.bug.color].neighbors = set()
         self._queen_neighbors_by_color[move.bug.color].count = 0
@@ -334,17 +396,52 @@ class Board:
             neighbor = self._get_neighbor(move.origin, direction)
             self._queen_neighbors_by_color[move.bug.color].neighbors.add(neighbor)
             self._queen_neighbors_by_color[move.bug.color].count += bool(self.bugs_from_pos(neighbor))
-      else:
-        if move.origin and len(self.bugs_from_pos(move.origin)) == 1:
-          if move.origin in self._queen_neighbors_by_color[PlayerColor.WHITE].neighbors:
-            self._queen_neighbors_by_color[PlayerColor.WHITE].count += 1
-          elif move.origin in self._queen_neighbors_by_color[PlayerColor.BLACK].neighbors:
-            self._queen_neighbors_by_color[PlayerColor.BLACK].count += 1
-        if not self.bugs_from_pos(move.destination):
-          if move.destination in self._queen_neighbors_by_color[PlayerColor.WHITE].neighbors:
-            self._queen_neighbors_by_color[PlayerColor.WHITE].count -= 1
-          elif move.destination in self._queen_neighbors_by_color[PlayerColor.BLACK].neighbors:
-            self._queen_neighbors_by_color[PlayerColor.BLACK].count -= 1
+      for color, queen_neighbors in self._queen_neighbors_by_color.items():
+        if color is not move.bug.color or move.bug.type is not BugType.QUEEN_BEE:
+          if move.origin in queen_neighbors.neighbors and len(self.bugs_from_pos(move.origin)) == 1:
+            queen_neighbors.count += 1
+          if move.destination in queen_neighbors.neighbors and not self.bugs_from_pos(move.destination):
+            queen_neighbors.count -= 1
+
+  def playout(self, max_turns: int, rng: Random) -> int:
+    """
+    | Plays random moves until the game ends or `max_turns` turns are played, for Monte Carlo simulations.
+    | Playouts are stripped down for speed: they skip MoveStrings, the valid moves cache, the draw counter and the Zobrist hash, which are left as they were before the playout.
+    | Until `undo_playout` is called, only the game state, the current player and the evaluation features are meaningful.
+
+    :param max_turns: Maximum amount of turns to play.
+    :type max_turns: int
+    :param rng: Random number generator picking the moves.
+    :type rng: Random
+    :return: Amount of turns played.
+    :rtype: int
+    """
+    turns = 0
+    while turns < max_turns and (self.state is GameState.IN_PROGRESS or self.state is GameState.NOT_STARTED):
+      moves = self._generate_valid_moves()
+      move = rng.choice(tuple(moves)) if moves else None
+      self.turn += 1
+      self.current_player_color = self.current_player_color.opposite
+      self.moves.append(move)
+      self._play(move)
+      turns += 1
+    return turns
+
+  def undo_playout(self, turns: int) -> None:
+    """
+    Takes back the given amount of turns played by `playout`.
+
+    :param turns: Amount of turns played by the playout.
+    :type turns: int
+    """
+    for _ in range(turns):
+      self.turn -= 1
+      self.current_player_color = self.current_player_color.opposite
+      self._undo(self.moves.pop())
+    if turns:
+      # Playouts only start from games that are not over.
+      self.state = GameState.IN_PROGRESS if self.turn else GameState.NOT_STARTED
+      self.gameover = False
 
   def stringify_move(self, move: Optional[Move]) -> str:
     """
@@ -392,6 +489,15 @@ class Board:
     """
     return self._pos_to_bug.get(position, [])
 
+  @property
+  def pieces(self) -> list[Bug]:
+    """
+    Every bug piece of the game, in an order fixed by the game type.
+
+    :rtype: list[Bug]
+    """
+    return self._bugs
+
   def pos_from_bug(self, bug: Optional[Bug]) -> Optional[Position]:
     """
     Retrieves the position of the given bug piece.
@@ -412,7 +518,87 @@ class Board:
     :return: Amount of pieces in play.
     :rtype: int
     """
-    return sum(1 for bug, pos in self._bug_to_pos.items() if bug.color == color and pos)
+    return self._pieces_in_play_by_color[color]
+
+  def _mobile_pieces(self, color: PlayerColor) -> int:
+    """
+    | Returns how many pieces of the specified player are free to move, that is in play and not pinned.
+    | Pieces can't move until their queen is in play, so in that case there are no mobile pieces.
+    | Whether moving a piece would break the hive is not accounted for, as it can't be kept up to date in constant time.
+
+    :param color: Player color.
+    :type color: PlayerColor
+    :return: Amount of mobile pieces.
+    :rtype: int
+    """
+    return self._pieces_in_play_by_color[color] - self._pinned_pieces_by_color[color] if self._queen_neighbors_by_color[color].neighbors else 0
+
+  def evaluation_features(self, color: PlayerColor) -> tuple[int, ...]:
+    """
+    | Returns the evaluation features from the point of view of the specified player, as named in `Board.EVALUATION_FEATURES`.
+    | Every feature is kept up to date while playing and undoing moves, so this runs in constant time.
+
+    :param color: Player color.
+    :type color: PlayerColor
+    :return: Evaluation features vector.
+    :rtype: tuple[int, ...]
+    """
+    opponent = color.opposite
+    return (
+      self._queen_neighbors_by_color[color].count,
+      self._queen_neighbors_by_color[opponent].count,
+      self._pieces_in_play_by_color[color],
+      self._pieces_in_play_by_color[opponent],
+      self._pinned_pieces_by_color[color],
+      self._pinned_pieces_by_color[opponent],
+      self._mobile_pieces(color),
+      self._mobile_pieces(opponent)
+    )
+
+  def evaluation_features_delta(self, move: Move) -> tuple[int, ...]:
+    """
+    | Returns how the given move would change the evaluation features of the current player, without playing it.
+    | Only the origin, the destination and, for queen moves, the cells around the destination are looked at, so this runs in constant time.
+
+    :param move: Move.
+    :type move: Move
+    :return: Evaluation features delta vector, ordered as in `Board.EVALUATION_FEATURES`.
+    :rtype: tuple[int, ...]
+    """
+    color = self.current_player_color
+    opponent = color.opposite
+    moves_queen = move.bug.type is BugType.QUEEN_BEE
+    origin_bugs = self.bugs_from_pos(move.origin) if move.origin else []
+    destination_bugs = self.bugs_from_pos(move.destination)
+    vacated = len(origin_bugs) == 1
+    queen_neighbors = {color: 0, opponent: 0}
+    pieces_in_play = {color: 0 if move.origin else 1, opponent: 0}
+    pinned_pieces = {color: 0, opponent: 0}
+    for queen_color, neighbors in self._queen_neighbors_by_color.items():
+      if moves_queen and queen_color is move.bug.color:
+        queen_neighbors[queen_color] = sum(bool(self.bugs_from_pos(neighbor)) and not (vacated and neighbor == move.origin) for neighbor in (self._get_neighbor(move.destination, direction) for direction in Direction)) - neighbors.count
+      else:
+        queen_neighbors[queen_color] = (move.destination in neighbors.neighbors and not destination_bugs) - (vacated and move.origin in neighbors.neighbors)
+    if destination_bugs:
+      pinned_pieces[destination_bugs[-1].color] += 1
+    if len(origin_bugs) > 1:
+      pinned_pieces[origin_bugs[-2].color] -= 1
+    mobile_pieces = {color: 0, opponent: 0}
+    for player in mobile_pieces:
+      # Pieces can't move until their queen is in play, see `_mobile_pieces`.
+      queen_in_play = bool(self._queen_neighbors_by_color[player].neighbors) or moves_queen and player is move.bug.color
+      unpinned = self._pieces_in_play_by_color[player] + pieces_in_play[player] - self._pinned_pieces_by_color[player] - pinned_pieces[player]
+      mobile_pieces[player] = (unpinned if queen_in_play else 0) - self._mobile_pieces(player)
+    return (
+      queen_neighbors[color],
+      queen_neighbors[opponent],
+      pieces_in_play[color],
+      pieces_in_play[opponent],
+      pinned_pieces[color],
+      pinned_pieces[opponent],
+      mobile_pieces[color],
+      mobile_pieces[opponent]
+    )
 
   def hash(self) -> int:
     """
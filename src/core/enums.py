@@ -51,6 +51,10 @@ class Command(StrEnum):
   | Undoes the specified amount of moves in the current game.
   | See https://github.com/jonthysell/Mzinga/wiki/UniversalHiveProtocol#undo.
   """
+  STOP = "stop"
+  """
+  Stops the running search, which answers with the best move found so far.
+  """
   EXIT = "exit"
   """
   Exits the engine.
@@ -76,6 +80,26 @@ class Option(StrEnum):
   """
   Available threads to parallelize AI thinking.
   """
+  HASH_SIZE = "HashSize"
+  """
+  Memory budget (in megabytes) for the caches of AI agents, shared by both players.
+  """
+  PONDER = "Ponder"
+  """
+  Whether AI agents should keep thinking on the opponent's time.
+  """
+  LATE_MOVE_REDUCTIONS = "LateMoveReductions"
+  """
+  Whether Negamax agents should search late quiet moves with a reduced depth first.
+  """
+  NULL_MOVE_PRUNING = "NullMovePruning"
+  """
+  Whether Negamax agents should prune nodes where passing already fails high.
+  """
+  TELEMETRY = "Telemetry"
+  """
+  Where AI agents should report the telemetry of their searches.
+  """
 
 class OptionType(StrEnum):
   """
@@ -110,6 +134,27 @@ class Strategy(StrEnum):
   """
   Negamax with alpha-beta pruning strategy.
   """
+  MCTS = "MCTS"
+  """
+  Monte Carlo tree search strategy.
+  """
+
+class Telemetry(StrEnum):
+  """
+  Possible destination of search telemetry.
+  """
+  OFF = "Off"
+  """
+  No telemetry.
+  """
+  STDERR = "Stderr"
+  """
+  A human readable line per iteration on standard error.
+  """
+  JSONL = "Jsonl"
+  """
+  A JSON object per iteration appended to a file.
+  """
 
 class PlayerColor(StrEnum):
   """
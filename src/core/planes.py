@@ -0,0 +1,104 @@
+from typing import Final, Optional, Sequence
+import numpy as np
+from numpy.typing import NDArray
+from core.enums import GameType, BugType
+from core.board import Board
+
+BASE_PIECES: Final[dict[BugType, int]] = {
+  BugType.QUEEN_BEE: 1,
+  BugType.SPIDER: 2,
+  BugType.BEETLE: 2,
+  BugType.GRASSHOPPER: 3,
+  BugType.SOLDIER_ANT: 3
+}
+"""
+| Amount of pieces of each bug type of the base game, for each player.
+| Each expansion adds a single piece of its bug type.
+"""
+
+def plane_types(game_type: GameType) -> tuple[BugType, ...]:
+  """
+  Returns the bug types of the given game type, in the order of their planes, see `to_planes`.
+
+  :param game_type: Game type.
+  :type game_type: GameType
+  :return: Bug types.
+  :rtype: tuple[BugType, ...]
+  """
+  return tuple(bug_type for bug_type in BugType if bug_type in BASE_PIECES or GameType[bug_type.value] in game_type)
+
+def plane_shape(game_type: GameType) -> tuple[int, int, int]:
+  """
+  | Returns the shape (channels, height, width) of the planes of the given game type, see `to_planes`.
+  | The side of the planes is the amount of pieces of the game, so that any hive fits.
+
+  :param game_type: Game type.
+  :type game_type: GameType
+  :return: Planes shape.
+  :rtype: tuple[int, int, int]
+  """
+  types = plane_types(game_type)
+  pieces = 2 * sum(BASE_PIECES.get(bug_type, 1) for bug_type in types)
+  return (2 * len(types) + 1, pieces, pieces)
+
+def to_planes(board: Board, out: Optional[NDArray[np.float32]] = None) -> NDArray[np.float32]:
+  """
+  | Encodes the given board as planes, from the point of view of the player to move, writing them into the given buffer.
+  | There's a plane for each bug type of the player to move, then one for each bug type of the opponent, in the order of `plane_types`, marking the cells where such a bug is on top, and a last plane with the height of each stack.
+  | Axial coordinates map to rows (r) and columns (q), and the hive is centered on the planes.
+
+  :param board: Playing board.
+  :type board: Board
+  :param out: Buffer shaped as `plane_shape(board.type)`, defaults to a new one.
+  :type out: Optional[NDArray[np.float32]], optional
+  :raises ValueError: If the buffer has the wrong shape.
+  :return: Planes.
+  :rtype: NDArray[np.float32]
+  """
+  shape = plane_shape(board.type)
+  if out is None:
+    out = np.empty(shape, dtype=np.float32)
+  elif out.shape != shape:
+    raise ValueError(f"Planes of {board.type} games are shaped as {shape}, but the buffer is shaped as {out.shape}")
+  out.fill(0)
+  positions = {position for bug in board.pieces if (position := board.pos_from_bug(bug))}
+  if (stacks := [(position, board.bugs_from_pos(position)) for position in positions]):
+    types = plane_types(board.type)
+    size = shape[1]
+    qs = [position.q for position, _ in stacks]
+    rs = [position.r for position, _ in stacks]
+    # Hives span at most one cell less than the amount of pieces in each direction.
+    q_offset = (size - 1 - max(qs) + min(qs)) // 2 - min(qs)
+    r_offset = (size - 1 - max(rs) + min(rs)) // 2 - min(rs)
+    rows = [r + r_offset for r in rs]
+    columns = [q + q_offset for q in qs]
+    # Cells are written all at once through fancy indexing.
+    out[[types.index(bugs[-1].type) + len(types) * (bugs[-1].color is not board.current_player_color) for _, bugs in stacks], rows, columns] = 1
+    out[-1, rows, columns] = [len(bugs) for _, bugs in stacks]
+  return out
+
+def batch_to_planes(boards: Sequence[Board], out: Optional[NDArray[np.float32]] = None) -> NDArray[np.float32]:
+  """
+  Encodes many boards of the same game type as planes, writing each into its slice of the given buffer, see `to_planes`.
+
+  :param boards: Playing boards.
+  :type boards: Sequence[Board]
+  :param out: Buffer shaped as (amount of boards, *`plane_shape`), defaults to a new one.
+  :type out: Optional[NDArray[np.float32]], optional
+  :raises ValueError: If the boards have different game types or the buffer has the wrong shape.
+  :return: Planes.
+  :rtype: NDArray[np.float32]
+  """
+  if not boards:
+    raise ValueError("No boards to encode")
+  game_type = boards[0].type
+  if any(board.type != game_type for board in boards):
+    raise ValueError("Boards of a batch must share the same game type")
+  shape = (len(boards), *plane_shape(game_type))
+  if out is None:
+    out = np.empty(shape, dtype=np.float32)
+  elif out.shape != shape:
+    raise ValueError(f"A batch of {len(boards)} {game_type} games is shaped as {shape}, but the buffer is shaped as {out.shape}")
+  for board, planes in zip(boards, out):
+    to_planes(board, planes)
+  return out
@@ -0,0 +1,205 @@
+import os
+from struct import Struct
+from contextlib import ExitStack
+from dataclasses import dataclass
+from typing import Final, Optional, Iterator, BinaryIO
+from core.enums import GameType, GameState
+from core.game import Position, Move
+from core.board import Board
+
+MAGIC: Final[bytes] = b"HGR\x01"
+"""
+Bytes opening every game record file, the last one being the format version.
+"""
+HEADER: Final[Struct] = Struct("<BBH")
+"""
+Layout of the header of each game record: game type flags, result and amount of moves.
+"""
+MOVE: Final[Struct] = Struct("<Bbb")
+"""
+Layout of each move: index of the bug piece in `Board.pieces` and axial coordinates of its destination, with the first piece played at the origin.
+"""
+PASS: Final[int] = 0xFF
+"""
+Bug piece index of pass moves.
+"""
+STATES: Final[list[GameState]] = list(GameState)
+
+@dataclass(frozen=True)
+class GameRecord:
+  """
+  | Compact binary record of a game, storing its game type, result and moves in a few bytes each.
+  | Destinations are stored as coordinates rather than relative to other pieces, so games can be replayed without parsing MoveStrings or computing valid moves.
+  """
+  game_type: GameType
+  result: GameState
+  """
+  Result of the game, which may differ from the state of the replayed board for adjudicated games.
+  """
+  moves: bytes
+  """
+  Moves packed as `MOVE`.
+  """
+
+  @classmethod
+  def from_board(cls, board: Board, result: Optional[GameState] = None) -> "GameRecord":
+    """
+    Records the moves played on the given board.
+
+    :param board: Playing board.
+    :type board: Board
+    :param result: Result of the game, defaults to the state of the board.
+    :type result: Optional[GameState], optional
+    :return: Game record.
+    :rtype: GameRecord
+    """
+    indices = {bug: index for index, bug in enumerate(board.pieces)}
+    return cls(board.type, result or board.state, b"".join(MOVE.pack(indices[move.bug], move.destination.q, move.destination.r) if move else MOVE.pack(PASS, 0, 0) for move in board.moves))
+
+  @classmethod
+  def parse(cls, gamestring: str) -> "GameRecord":
+    """
+    Records the game of the given GameString, validating every move.
+
+    :param gamestring: GameString.
+    :type gamestring: str
+    :return: Game record.
+    :rtype: GameRecord
+    """
+    return cls.from_board(Board(gamestring))
+
+  @property
+  def turns(self) -> int:
+    """
+    Amount of moves of the game.
+
+    :rtype: int
+    """
+    return len(self.moves) // MOVE.size
+
+  def replay(self, max_snapshots: int = Board.DEFAULT_MAX_SNAPSHOTS) -> Board:
+    """
+    | Replays the game on a new board, skipping legality checks, so records must come from valid games.
+    | MoveStrings are rebuilt along the way in the same form as the engine writes them, so the board is otherwise the same as the one parsed from the GameString of the game.
+
+    :param max_snapshots: Amount of positions whose valid moves are cached, defaults to `Board.DEFAULT_MAX_SNAPSHOTS`.
+    :type max_snapshots: int, optional
+    :return: Playing board.
+    :rtype: Board
+    """
+    board = Board(str(self.game_type), max_snapshots)
+    for _ in self.plies(board):
+      pass
+    return board
+
+  def plies(self, board: Board) -> Iterator[Optional[Move]]:
+    """
+    Replays the game move by move on the given new board, like `replay`, yielding each move right before playing it.
+
+    :param board: New playing board, of the same game type.
+    :type board: Board
+    :return: Each move, `None` for passing.
+    :rtype: Iterator[Optional[Move]]
+    """
+    pieces = board.pieces
+    for index, q, r in MOVE.iter_unpack(self.moves):
+      if index == PASS:
+        yield None
+        board.play_parsed(None, Move.PASS)
+      else:
+        move = Move(bug := pieces[index], board.pos_from_bug(bug), Position(q, r))
+        yield move
+        board.play_parsed(move, board.stringify_move(move))
+
+class RecordWriter:
+  """
+  Append-only writer of game record files.
+  """
+
+  def __init__(self, path: str) -> None:
+    """
+    | Record writer instantiation, appending to the file if it already exists.
+    | A last record cut short by an interrupted write is dropped, so that new records follow the last complete one.
+
+    :param path: Path of the file.
+    :type path: str
+    :raises ValueError: If the file isn't a game record file.
+    """
+    self._resources: Final[ExitStack] = ExitStack()
+    self._file: Final[BinaryIO] = self._resources.enter_context(open(path, "r+b" if os.path.exists(path) else "w+b"))
+    try:
+      end = _complete_length(self._file, path)
+    except ValueError:
+      self._resources.close()
+      raise
+    self._file.seek(end)
+    self._file.truncate()
+    if not end:
+      self._file.write(MAGIC)
+
+  def __enter__(self) -> "RecordWriter":
+    return self
+
+  def __exit__(self, *_) -> None:
+    self.close()
+
+  def write(self, record: GameRecord) -> None:
+    """
+    Appends a game record.
+
+    :param record: Game record.
+    :type record: GameRecord
+    """
+    self._file.write(HEADER.pack(record.game_type.value, STATES.index(record.result), record.turns) + record.moves)
+
+  def close(self) -> None:
+    """
+    Closes the file.
+    """
+    self._resources.close()
+
+def _complete_length(file: BinaryIO, path: str) -> int:
+  """
+  Measures the part of a game record file holding complete records, skipping over their moves.
+
+  :param file: Game record file, opened for reading.
+  :type file: BinaryIO
+  :param path: Path of the file.
+  :type path: str
+  :raises ValueError: If the file isn't a game record file.
+  :return: Length of the file up to the end of its last complete record, `0` if it doesn't even hold the magic bytes yet.
+  :rtype: int
+  """
+  size = os.fstat(file.fileno()).st_size
+  file.seek(0)
+  if (magic := file.read(len(MAGIC))) != MAGIC:
+    if MAGIC.startswith(magic):
+      return 0
+    raise ValueError(f"'{path}' is not a game record file")
+  end = len(MAGIC)
+  while len(header := file.read(HEADER.size)) == HEADER.size:
+    if (record_end := end + HEADER.size + HEADER.unpack(header)[2] * MOVE.size) > size:
+      break
+    end = file.seek(record_end)
+  return end
+
+def read_records(path: str) -> Iterator[GameRecord]:
+  """
+  Streams the game records of a file, one at a time.
+
+  :param path: Path of the file.
+  :type path: str
+  :raises ValueError: If the file isn't a game record file or its last record is truncated.
+  :return: Game records.
+  :rtype: Iterator[GameRecord]
+  """
+  with open(path, "rb", buffering=1 << 20) as file:
+    if file.read(len(MAGIC)) != MAGIC:
+      raise ValueError(f"'{path}' is not a game record file")
+    while (header := file.read(HEADER.size)):
+      if len(header) < HEADER.size:
+        raise ValueError(f"The last record of '{path}' is truncated")
+      game_type, result, turns = HEADER.unpack(header)
+      if len(moves := file.read(turns * MOVE.size)) < turns * MOVE.size:
+        raise ValueError(f"The last record of '{path}' is truncated")
+      yield GameRecord(GameType(game_type), STATES[result], moves)
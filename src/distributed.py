@@ -0,0 +1,615 @@
+import os
+import sys
+import json
+import socket
+import argparse
+from time import sleep, monotonic
+from hashlib import sha256
+from threading import Thread, Event, Lock
+from collections import deque
+from dataclasses import dataclass, asdict
+from multiprocessing import freeze_support, get_context
+from socketserver import ThreadingTCPServer, StreamRequestHandler
+from concurrent.futures import ProcessPoolExecutor, Future, wait, FIRST_COMPLETED
+from typing import Final, Optional, Callable, TextIO, Any
+from match import PlayerConfig, SideStats, SPRT, play_pair, add_match_arguments, setup_match, print_progress, print_summary
+from engine import Engine
+
+@dataclass(frozen=True)
+class MatchSettings:
+  """
+  Settings of a distributed match, shared by the coordinator with every worker.
+  """
+  first: PlayerConfig
+  second: PlayerConfig
+  max_depth: int
+  """
+  Maximum lookahead depth of each search, `0` for no limit.
+  """
+  time_limit: float
+  """
+  Maximum time (in seconds) of each search, `0` for no limit.
+  """
+  max_turns: int
+  """
+  Amount of turns after which games are adjudicated as draws.
+  """
+
+class Coordinator:
+  """
+  | Coordinator of a match distributed over TCP, handing out pairs of games to workers and collecting their results.
+  | The protocol is made of newline-delimited JSON messages, each answered by the coordinator:
+  | - `hello`, with the ids of the pairs the worker is still playing, is answered with `welcome` and the match settings.
+  | - `request`, with the amount of pairs wanted, is answered with `jobs` (ids and openings), `wait` if every pair left is leased, or `done`.
+  | - `result`, with the id, scores and search statistics of a pair, is answered with `ack`.
+  | - `failure`, with the id of a pair and the error that stopped it, is answered with `ack`. The pair goes back to the queue, unless it already failed `max_failures` times, in which case it's dropped from the match.
+  | Pairs are leased to a connection until their result comes back, and go back to the queue if the connection drops or the lease expires. Duplicate results are ignored, so pairs can safely be played twice.
+  | Accepted results are appended to a journal, so an interrupted match resumes where it stopped.
+  """
+
+  LEASE_TIMEOUT: Final[float] = 3600
+  """
+  Default time (in seconds) after which leased pairs are handed out again.
+  """
+  WAIT_DELAY: Final[float] = 1
+  """
+  Time (in seconds) after which workers told to wait ask again.
+  """
+  MAX_FAILURES: Final[int] = 3
+  """
+  Default amount of times a pair can fail before being dropped from the match.
+  """
+
+  def __init__(self, settings: MatchSettings, openings: list[str], sprt: SPRT, journal: Optional[str] = None, host: str = "127.0.0.1", port: int = 0, lease_timeout: float = LEASE_TIMEOUT, max_failures: int = MAX_FAILURES) -> None:
+    """
+    Coordinator instantiation, resuming the match from the journal if it already exists.
+
+    :param settings: Match settings.
+    :type settings: MatchSettings
+    :param openings: GameString of the opening of each pair, indexed by pair id.
+    :type openings: list[str]
+    :param sprt: SPRT stopping the match early.
+    :type sprt: SPRT
+    :param journal: Path of the journal of accepted results, defaults to none.
+    :type journal: Optional[str], optional
+    :param host: Address to listen on, defaults to the loopback interface.
+    :type host: str, optional
+    :param port: Port to listen on, defaults to a free one.
+    :type port: int, optional
+    :param lease_timeout: Time (in seconds) after which leased pairs are handed out again, defaults to `LEASE_TIMEOUT`.
+    :type lease_timeout: float, optional
+    :param max_failures: Amount of times a pair can fail before being dropped from the match, defaults to `MAX_FAILURES`.
+    :type max_failures: int, optional
+    :raises ValueError: If the journal belongs to a different match.
+    :raises OSError: If the journal can't be opened or the address can't be bound.
+    """
+    self.settings: Final[MatchSettings] = settings
+    self.openings: Final[list[str]] = openings
+    self.sprt: Final[SPRT] = sprt
+    self.first_stats: SideStats = SideStats()
+    """
+    Search statistics of the first engine over the accepted results.
+    """
+    self.second_stats: SideStats = SideStats()
+    """
+    Search statistics of the second engine over the accepted results.
+    """
+    self.dropped: Final[set[int]] = set()
+    """
+    Ids of the pairs dropped from the match after failing too many times.
+    """
+    self.on_result: Optional[Callable[[SPRT], None]] = None
+    """
+    Callback called, holding the coordinator lock, with the SPRT after each accepted result.
+    """
+    self._lease_timeout: Final[float] = lease_timeout
+    self._max_failures: Final[int] = max_failures
+    self._lock: Final[Lock] = Lock()
+    self._finished: Final[Event] = Event()
+    self._queue: Final[deque[int]] = deque(range(len(openings)))
+    self._leases: Final[dict[int, tuple[int, float]]] = {}
+    """
+    Connection and deadline of each leased pair.
+    """
+    self._done: Final[set[int]] = set()
+    self._failures: Final[dict[int, int]] = {}
+    """
+    Amount of times each pair failed.
+    """
+    self._connections: int = 0
+    self._journal: Optional[TextIO] = self._open_journal(journal) if journal else None
+    self._check_finished()
+    try:
+      self._server: Final[ThreadingTCPServer] = _Server((host, port), _CoordinatorHandler, self)
+    except OSError:
+      if self._journal:
+        self._journal.close()
+      raise
+    self._thread: Optional[Thread] = None
+
+  @property
+  def address(self) -> tuple[str, int]:
+    """
+    Address and port the coordinator listens on.
+
+    :rtype: tuple[str, int]
+    """
+    return self._server.server_address[:2]
+
+  @property
+  def finished(self) -> bool:
+    """
+    Whether every pair has been played or the SPRT has been decided.
+
+    :rtype: bool
+    """
+    return self._finished.is_set()
+
+  def start(self) -> None:
+    """
+    Starts serving workers in the background.
+    """
+    self._thread = Thread(target=self._server.serve_forever, daemon=True)
+    self._thread.start()
+
+  def wait(self, timeout: Optional[float] = None) -> bool:
+    """
+    Waits for the match to finish.
+
+    :param timeout: Maximum time (in seconds) to wait, defaults to no limit.
+    :type timeout: Optional[float], optional
+    :return: Whether the match finished.
+    :rtype: bool
+    """
+    return self._finished.wait(timeout)
+
+  def close(self) -> None:
+    """
+    Stops serving workers and closes the journal.
+    """
+    if self._thread:
+      self._server.shutdown()
+      self._thread.join()
+      self._thread = None
+    self._server.server_close()
+    if self._journal:
+      self._journal.close()
+      self._journal = None
+
+  def connect(self, running: list[int]) -> tuple[int, dict[str, Any]]:
+    """
+    Registers a new worker connection, leasing back to it the pairs it's still playing, if they're not done yet.
+
+    :param running: Ids of the pairs the worker is still playing.
+    :type running: list[int]
+    :return: Id of the connection and the welcome message.
+    :rtype: tuple[int, dict[str, Any]]
+    """
+    with self._lock:
+      self._connections += 1
+      connection = self._connections
+      for pair in running:
+        if pair in self._queue:
+          self._queue.remove(pair)
+          self._leases[pair] = (connection, monotonic() + self._lease_timeout)
+      return connection, {"type": "welcome", "settings": asdict(self.settings)}
+
+  def disconnect(self, connection: int) -> None:
+    """
+    Unregisters a worker connection, putting back in the queue the pairs leased to it.
+
+    :param connection: Id of the connection.
+    :type connection: int
+    """
+    with self._lock:
+      for pair in [pair for pair, (owner, _) in self._leases.items() if owner == connection]:
+        del self._leases[pair]
+        self._queue.appendleft(pair)
+
+  def handle(self, connection: int, message: dict[str, Any]) -> dict[str, Any]:
+    """
+    Answers a message of a worker.
+
+    :param connection: Id of the connection.
+    :type connection: int
+    :param message: Message of the worker.
+    :type message: dict[str, Any]
+    :return: Answer.
+    :rtype: dict[str, Any]
+    """
+    with self._lock:
+      if message["type"] == "request":
+        return self._assign(connection, message["count"])
+      if message["type"] == "result":
+        self._accept(message)
+        return {"type": "ack", "id": message["id"], "done": self.finished}
+      if message["type"] == "failure":
+        self._fail(message["id"])
+        return {"type": "ack", "id": message["id"], "done": self.finished}
+      return {"type": "error", "message": f"Unknown message type '{message['type']}'"}
+
+  def _assign(self, connection: int, count: int) -> dict[str, Any]:
+    """
+    Leases up to the given amount of pairs to a connection, handing out first the ones whose lease expired.
+
+    :param connection: Id of the connection.
+    :type connection: int
+    :param count: Amount of pairs wanted.
+    :type count: int
+    :return: Answer.
+    :rtype: dict[str, Any]
+    """
+    if self.finished:
+      return {"type": "done"}
+    now = monotonic()
+    for pair in [pair for pair, (_, deadline) in self._leases.items() if deadline < now]:
+      del self._leases[pair]
+      self._queue.appendleft(pair)
+    jobs = []
+    while self._queue and len(jobs) < count:
+      pair = self._queue.popleft()
+      self._leases[pair] = (connection, now + self._lease_timeout)
+      jobs.append({"id": pair, "opening": self.openings[pair]})
+    return {"type": "jobs", "jobs": jobs} if jobs else {"type": "wait", "delay": Coordinator.WAIT_DELAY}
+
+  def _accept(self, result: dict[str, Any]) -> None:
+    """
+    Accepts the result of a pair, unless it's a duplicate or the match is already finished.
+
+    :param result: Result message.
+    :type result: dict[str, Any]
+    """
+    pair = result["id"]
+    if self.finished or pair in self._done or not 0 <= pair < len(self.openings):
+      return
+    self._apply(result)
+    if self._journal:
+      self._journal.write(json.dumps(result) + "\n")
+      self._journal.flush()
+      os.fsync(self._journal.fileno())
+    if self.on_result:
+      self.on_result(self.sprt)
+    self._check_finished()
+
+  def _fail(self, pair: int) -> None:
+    """
+    Puts a failed pair back at the end of the queue, or drops it from the match if it failed too many times.
+
+    :param pair: Id of the pair.
+    :type pair: int
+    """
+    if self.finished or pair in self._done or not 0 <= pair < len(self.openings):
+      return
+    self._leases.pop(pair, None)
+    if pair in self._queue:
+      self._queue.remove(pair)
+    self._failures[pair] = self._failures.get(pair, 0) + 1
+    if self._failures[pair] < self._max_failures:
+      self._queue.append(pair)
+    else:
+      self._done.add(pair)
+      self.dropped.add(pair)
+      self._check_finished()
+
+  def _apply(self, result: dict[str, Any]) -> None:
+    """
+    Adds the result of a pair to the match.
+
+    :param result: Result message.
+    :type result: dict[str, Any]
+    """
+    pair = result["id"]
+    self._done.add(pair)
+    self._leases.pop(pair, None)
+    if pair in self._queue:
+      self._queue.remove(pair)
+    for score in result["scores"]:
+      self.sprt.add(score)
+    self.first_stats += _stats_from_json(result["first"])
+    self.second_stats += _stats_from_json(result["second"])
+
+  def _check_finished(self) -> None:
+    """
+    Marks the match as finished if every pair has been played or the SPRT has been decided.
+    """
+    if len(self._done) == len(self.openings) or self.sprt.decision() is not None:
+      self._finished.set()
+
+  def _open_journal(self, path: str) -> TextIO:
+    """
+    | Opens the journal for appending, replaying the results it already holds.
+    | The first line identifies the match, so that a journal is never resumed with different settings or openings.
+
+    :param path: Path of the journal.
+    :type path: str
+    :return: Journal.
+    :rtype: TextIO
+    :raises ValueError: If the journal belongs to a different match.
+    """
+    header = {"settings": asdict(self.settings), "openings": sha256("\n".join(self.openings).encode()).hexdigest()}
+    if not os.path.exists(path) or not os.path.getsize(path):
+      with open(path, "w", encoding="utf-8") as file:
+        file.write(json.dumps(header) + "\n")
+    else:
+      with open(path, encoding="utf-8") as file:
+        if json.loads(file.readline()) != json.loads(json.dumps(header)):
+          raise ValueError(f"The journal '{path}' belongs to a different match")
+        for line in file:
+          try:
+            result = json.loads(line)
+          except json.JSONDecodeError:
+            # The last line may have been cut short by a crash, and its pair is simply played again.
+            continue
+          if result["id"] not in self._done:
+            self._apply(result)
+    return open(path, "a", encoding="utf-8")
+
+class _Server(ThreadingTCPServer):
+  """
+  TCP server of a coordinator, serving each worker connection on its own thread.
+  """
+
+  allow_reuse_address = True
+  daemon_threads = True
+
+  def __init__(self, address: tuple[str, int], handler: type[StreamRequestHandler], coordinator: Coordinator) -> None:
+    self.coordinator: Final[Coordinator] = coordinator
+    super().__init__(address, handler)
+
+class _CoordinatorHandler(StreamRequestHandler):
+  """
+  Handler of a worker connection.
+  """
+
+  server: _Server
+
+  def handle(self) -> None:
+    coordinator = self.server.coordinator
+    try:
+      hello = json.loads(self.rfile.readline())
+      connection, welcome = coordinator.connect(hello.get("running", []))
+    except (OSError, ValueError, AttributeError):
+      return
+    try:
+      self._send(welcome)
+      while line := self.rfile.readline():
+        self._send(coordinator.handle(connection, json.loads(line)))
+    except (OSError, ValueError, KeyError, TypeError):
+      pass
+    finally:
+      coordinator.disconnect(connection)
+
+  def _send(self, message: dict[str, Any]) -> None:
+    self.wfile.write((json.dumps(message) + "\n").encode())
+
+class Worker:
+  """
+  | Worker of a distributed match, playing the pairs of games handed out by a coordinator on a pool of processes.
+  | Pairs are requested in batches to keep the pool busy, and results are kept until the coordinator acknowledges them. Pairs that fail are reported to the coordinator, which hands them out again.
+  | If the connection drops, the worker keeps playing and reconnects with exponential backoff, resending the unacknowledged results and reclaiming the pairs it's still playing.
+  | Workers run the engine commands of the match settings, so they should only connect to trusted coordinators.
+  """
+
+  RETRY_INTERVAL: Final[float] = 0.25
+  """
+  Initial time (in seconds) between connection attempts, doubled after each failure.
+  """
+  MAX_RETRY_INTERVAL: Final[float] = 8
+  """
+  Maximum time (in seconds) between connection attempts.
+  """
+  SOCKET_TIMEOUT: Final[float] = 30
+  """
+  Maximum time (in seconds) to wait for the coordinator to answer.
+  """
+
+  def __init__(self, host: str = "127.0.0.1", port: int = 0, processes: int = Engine.MAX_NUM_THREADS, reconnect_timeout: float = 60) -> None:
+    """
+    Worker instantiation.
+
+    :param host: Address of the coordinator, defaults to the loopback interface.
+    :type host: str, optional
+    :param port: Port of the coordinator.
+    :type port: int, optional
+    :param processes: Amount of concurrent pairs of games, defaults to `Engine.MAX_NUM_THREADS`.
+    :type processes: int, optional
+    :param reconnect_timeout: Time (in seconds) after which the worker gives up connecting to the coordinator, defaults to `60`.
+    :type reconnect_timeout: float, optional
+    """
+    self._address: Final[tuple[str, int]] = (host, port)
+    self._processes: Final[int] = processes
+    self._reconnect_timeout: Final[float] = reconnect_timeout
+    self.played: int = 0
+    """
+    Amount of pairs whose result has been acknowledged, not counting failed ones.
+    """
+
+  def run(self) -> None:
+    """
+    Plays pairs of games until the coordinator says the match is done.
+
+    :raises ConnectionError: If the coordinator can't be reached for longer than the reconnect timeout.
+    """
+    running: dict[Future[tuple[list[float], SideStats, SideStats]], int] = {}
+    unacked: dict[int, dict[str, Any]] = {}
+    interval = Worker.RETRY_INTERVAL
+    disconnected: Optional[float] = None
+    # Worker processes are spawned rather than forked, since forking a process with running threads can deadlock.
+    with ProcessPoolExecutor(self._processes, get_context("spawn")) as pool:
+      while True:
+        try:
+          with socket.create_connection(self._address, Worker.SOCKET_TIMEOUT) as connection, connection.makefile("rw", encoding="utf-8") as stream:
+            welcome = self._exchange(stream, {"type": "hello", "running": list(running.values())})
+            interval, disconnected = Worker.RETRY_INTERVAL, None
+            if self._play(stream, pool, _settings_from_json(welcome["settings"]), running, unacked):
+              pool.shutdown(cancel_futures=True)
+              return
+        except OSError as e:
+          if disconnected is None:
+            disconnected = monotonic()
+          elif monotonic() - disconnected > self._reconnect_timeout:
+            raise ConnectionError(f"Couldn't reach the coordinator at {self._address[0]}:{self._address[1]}") from e
+        # Results keep being collected while disconnected, so that they're ready to be resent.
+        if running:
+          self._collect(running, unacked, wait(running, interval, FIRST_COMPLETED)[0])
+        else:
+          sleep(interval)
+        interval = min(interval * 2, Worker.MAX_RETRY_INTERVAL)
+
+  def _play(self, stream: TextIO, pool: ProcessPoolExecutor, settings: MatchSettings, running: dict[Future[tuple[list[float], SideStats, SideStats]], int], unacked: dict[int, dict[str, Any]]) -> bool:
+    """
+    Plays pairs of games over a connection.
+
+    :param stream: Connection to the coordinator.
+    :type stream: TextIO
+    :param pool: Pool of worker processes.
+    :type pool: ProcessPoolExecutor
+    :param settings: Match settings.
+    :type settings: MatchSettings
+    :param running: Id of the pair of each running future.
+    :type running: dict[Future[tuple[list[float], SideStats, SideStats]], int]
+    :param unacked: Results not acknowledged yet, by pair id.
+    :type unacked: dict[int, dict[str, Any]]
+    :return: Whether the match is done.
+    :rtype: bool
+    """
+    while True:
+      for pair, message in list(unacked.items()):
+        ack = self._exchange(stream, message)
+        # Results are only forgotten once acknowledged, so a connection dropping mid-exchange resends them.
+        del unacked[pair]
+        if message["type"] == "result":
+          self.played += 1
+        if ack["done"]:
+          return True
+      delay = 0.0
+      if len(running) < self._processes:
+        answer = self._exchange(stream, {"type": "request", "count": self._processes - len(running)})
+        if answer["type"] == "done":
+          return True
+        for job in answer.get("jobs", []):
+          running[pool.submit(play_pair, settings.first, settings.second, job["opening"], settings.max_depth, settings.time_limit, settings.max_turns)] = job["id"]
+        delay = answer.get("delay", 0.0)
+      if running:
+        # Workers with idle processes and nothing to play ask again after the delay, or as soon as a pair ends.
+        self._collect(running, unacked, wait(running, delay or None, FIRST_COMPLETED)[0])
+      else:
+        sleep(delay)
+
+  def _collect(self, running: dict[Future[tuple[list[float], SideStats, SideStats]], int], unacked: dict[int, dict[str, Any]], completed: set[Future[tuple[list[float], SideStats, SideStats]]]) -> None:
+    """
+    Turns completed futures into result messages, or failure messages for pairs that raised an error.
+
+    :param running: Id of the pair of each running future.
+    :type running: dict[Future[tuple[list[float], SideStats, SideStats]], int]
+    :param unacked: Results not acknowledged yet, by pair id.
+    :type unacked: dict[int, dict[str, Any]]
+    :param completed: Completed futures.
+    :type completed: set[Future[tuple[list[float], SideStats, SideStats]]]
+    """
+    for future in completed:
+      pair = running.pop(future)
+      try:
+        scores, first, second = future.result()
+      except (RuntimeError, OSError, ValueError) as e:
+        print(f"Pair {pair} failed: {e}", file=sys.stderr)
+        unacked[pair] = {"type": "failure", "id": pair, "error": str(e)}
+      else:
+        unacked[pair] = {"type": "result", "id": pair, "scores": scores, "first": asdict(first), "second": asdict(second)}
+
+  def _exchange(self, stream: TextIO, message: dict[str, Any]) -> dict[str, Any]:
+    """
+    Sends a message to the coordinator and reads its answer.
+
+    :param stream: Connection to the coordinator.
+    :type stream: TextIO
+    :param message: Message.
+    :type message: dict[str, Any]
+    :raises ConnectionError: If the connection was closed.
+    :raises RuntimeError: If the coordinator answers with an error.
+    :return: Answer.
+    :rtype: dict[str, Any]
+    """
+    stream.write(json.dumps(message) + "\n")
+    stream.flush()
+    if not (line := stream.readline()):
+      raise ConnectionError("The coordinator closed the connection")
+    answer = json.loads(line)
+    if answer["type"] == "error":
+      raise RuntimeError(answer["message"])
+    return answer
+
+def _settings_from_json(settings: dict[str, Any]) -> MatchSettings:
+  """
+  Rebuilds match settings from their JSON form, where tuples became lists.
+
+  :param settings: Match settings, as a JSON object.
+  :type settings: dict[str, Any]
+  :return: Match settings.
+  :rtype: MatchSettings
+  """
+  first, second = (PlayerConfig(player["name"], tuple(tuple(option) for option in player["options"]), tuple(player["command"]), player["cwd"]) for player in (settings["first"], settings["second"]))
+  return MatchSettings(first, second, settings["max_depth"], settings["time_limit"], settings["max_turns"])
+
+def _stats_from_json(stats: dict[str, Any]) -> SideStats:
+  """
+  Rebuilds search statistics from their JSON form, where depths became strings.
+
+  :param stats: Search statistics, as a JSON object.
+  :type stats: dict[str, Any]
+  :return: Search statistics.
+  :rtype: SideStats
+  """
+  return SideStats(stats["moves"], stats["time"], stats["nodes"], {int(depth): time for depth, time in stats["depth_times"].items()}, {int(depth): count for depth, count in stats["depth_counts"].items()})
+
+def main(argv: Optional[list[str]] = None) -> None:
+  """
+  | Runs the distributed match command line interface.
+  | The `coordinator` command hands out the pairs of games of a match, the `worker` command plays them, and any amount of workers can join or leave at any time.
+
+  :param argv: Command line arguments, defaults to the ones of the process.
+  :type argv: Optional[list[str]], optional
+  """
+  parser = argparse.ArgumentParser(description="Plays a match distributed over TCP between a coordinator and any amount of workers.")
+  commands = parser.add_subparsers(dest="command", required=True)
+  coordinator_parser = commands.add_parser("coordinator", help="hand out the pairs of games of a match and collect their results")
+  add_match_arguments(coordinator_parser)
+  coordinator_parser.add_argument("--host", default="127.0.0.1", help="address to listen on (default: %(default)s)")
+  coordinator_parser.add_argument("--port", type=int, default=5555, help="port to listen on (default: %(default)s)")
+  coordinator_parser.add_argument("--journal", default="match.jsonl", help="file where results are appended, resuming the match if it exists (default: %(default)s)")
+  coordinator_parser.add_argument("--lease-timeout", type=float, default=Coordinator.LEASE_TIMEOUT, help="time (in seconds) after which unfinished pairs are handed out again (default: %(default)s)")
+  coordinator_parser.add_argument("--max-failures", type=int, default=Coordinator.MAX_FAILURES, help="times a pair can fail before being dropped from the match (default: %(default)s)")
+  worker_parser = commands.add_parser("worker", help="play the pairs of games handed out by a coordinator")
+  worker_parser.add_argument("--host", default="127.0.0.1", help="address of the coordinator (default: %(default)s)")
+  worker_parser.add_argument("--port", type=int, default=5555, help="port of the coordinator (default: %(default)s)")
+  worker_parser.add_argument("--processes", type=int, default=Engine.MAX_NUM_THREADS, help="amount of concurrent pairs of games (default: %(default)s)")
+  worker_parser.add_argument("--reconnect-timeout", type=float, default=60, help="time (in seconds) after which the worker gives up reaching the coordinator (default: %(default)s)")
+  args = parser.parse_args(argv)
+  if args.command == "worker":
+    worker = Worker(args.host, args.port, args.processes, args.reconnect_timeout)
+    try:
+      worker.run()
+    except ConnectionError as e:
+      sys.exit(str(e))
+    print(f"Pairs played: {worker.played}", file=sys.stderr)
+    return
+  first, second, openings, sprt = setup_match(coordinator_parser, args)
+  try:
+    coordinator = Coordinator(MatchSettings(first, second, args.depth, args.time, args.max_turns), openings, sprt, args.journal, args.host, args.port, args.lease_timeout, args.max_failures)
+  except (OSError, ValueError) as e:
+    coordinator_parser.error(str(e))
+  coordinator.on_result = print_progress
+  print(f"Listening on {coordinator.address[0]}:{coordinator.address[1]}", flush=True)
+  coordinator.start()
+  try:
+    coordinator.wait()
+  finally:
+    coordinator.close()
+  print_summary(sprt, first, coordinator.first_stats, second, coordinator.second_stats)
+  if coordinator.dropped:
+    print(f"Pairs dropped after failing {args.max_failures} times: {', '.join(map(str, sorted(coordinator.dropped)))}", file=sys.stderr)
+
+if __name__ == "__main__":
+  # Needed by frozen executables to run the worker processes.
+  freeze_support()
+  main()
@@ -1,11 +1,59 @@
 import os
 import re
-from typing import TypeGuard, Final, Optional, Callable, Any
+import sys
+from multiprocessing import freeze_support
+from threading import Thread, Lock, local
+from queue import Queue
+from typing import TypeGuard, Final, Optional, Callable, Any, TextIO
 from copy import deepcopy
-from core.enums import Command, Option, OptionType, Strategy, PlayerColor
+from core.enums import Command, Option, OptionType, Strategy, Telemetry, PlayerColor
 from core.board import Board
 from core.game import Move
 from ai.brain import Brain, Random, AlphaBetaPruner
+from ai.mcts import MonteCarloTreeSearch
+from ai.table import SearchTables
+from ai.telemetry import TelemetrySink, StreamSink, JsonlSink
+
+class ResponseWriter:
+  """
+  | Standard output replacement that buffers what each thread prints.
+  | Every response is written and flushed at once, closed by 'ok', so responses printed by different threads never interleave.
+  """
+
+  def __init__(self, stream: TextIO) -> None:
+    self._stream: Final[TextIO] = stream
+    self._lock: Final[Lock] = Lock()
+    self._local: Final[local] = local()
+
+  @property
+  def _buffer(self) -> list[str]:
+    """
+    Text printed by the current thread since its last response.
+
+    :rtype: list[str]
+    """
+    if not hasattr(self._local, "buffer"):
+      self._local.buffer = []
+    return self._local.buffer
+
+  def write(self, text: str) -> int:
+    self._buffer.append(text)
+    return len(text)
+
+  def flush(self) -> None:
+    # Buffered text is written only by `respond`.
+    pass
+
+  def respond(self) -> None:
+    """
+    Writes the text buffered by the current thread, closing the response with 'ok'.
+    """
+    buffer = self._buffer
+    buffer.append("ok\n")
+    with self._lock:
+      self._stream.write("".join(buffer))
+      self._stream.flush()
+    buffer.clear()
 
 class Engine:
   """
@@ -20,18 +68,24 @@ class Engine:
     Option.STRATEGY_WHITE: OptionType.ENUM,
     Option.STRATEGY_BLACK: OptionType.ENUM,
     Option.MAX_BRANCHING_FACTOR: OptionType.INT,
-    Option.NUM_THREADS: OptionType.INT
+    Option.NUM_THREADS: OptionType.INT,
+    Option.HASH_SIZE: OptionType.INT,
+    Option.PONDER: OptionType.BOOL,
+    Option.LATE_MOVE_REDUCTIONS: OptionType.BOOL,
+    Option.NULL_MOVE_PRUNING: OptionType.BOOL,
+    Option.TELEMETRY: OptionType.ENUM
   }
   """
   Map for options and their type.
   """
 
-  BRAINS: Final[dict[Strategy, Callable[[], Brain]]] = {
-    Strategy.RANDOM: Random,
-    Strategy.NEGAMAX: AlphaBetaPruner
+  BRAINS: Final[dict[Strategy, Callable[[SearchTables], Brain]]] = {
+    Strategy.RANDOM: lambda _: Random(),
+    Strategy.NEGAMAX: AlphaBetaPruner,
+    Strategy.MCTS: lambda _: MonteCarloTreeSearch()
   }
   """
-  Map for strategies and the respective brain.
+  Map for strategies and the respective brain, built from the tables shared by every brain.
   """
   DEFAULT_STRATEGY_WHITE: Final[Strategy] = Strategy.NEGAMAX
   """
@@ -59,7 +113,7 @@ class Engine:
   """
   Minimum value for option NumThreads.
   """
-  DEFAULT_NUM_THREADS: Final[int] = threads // 2 if (threads := os.cpu_count()) else MIN_NUM_THREADS
+  DEFAULT_NUM_THREADS: Final[int] = max(threads // 2, MIN_NUM_THREADS) if (threads := os.cpu_count()) else MIN_NUM_THREADS
   """
   Default value for option NumThreads.
   """
@@ -68,16 +122,73 @@ class Engine:
   Maximum value for option NumThreads.
   """
 
+  MIN_HASH_SIZE: Final[int] = 4
+  """
+  Minimum value for option HashSize.
+  """
+  DEFAULT_HASH_SIZE: Final[int] = SearchTables.DEFAULT_SIZE_MB
+  """
+  Default value for option HashSize.
+  """
+  MAX_HASH_SIZE: Final[int] = 4096
+  """
+  Maximum value for option HashSize.
+  """
+
+  DEFAULT_PONDER: Final[bool] = False
+  """
+  Default value for option Ponder.
+  """
+
+  DEFAULT_LATE_MOVE_REDUCTIONS: Final[bool] = True
+  """
+  Default value for option LateMoveReductions.
+  """
+
+  DEFAULT_NULL_MOVE_PRUNING: Final[bool] = True
+  """
+  Default value for option NullMovePruning.
+  """
+
+  DEFAULT_TELEMETRY: Final[Telemetry] = Telemetry.OFF
+  """
+  Default value for option Telemetry.
+  """
+  TELEMETRY_FILE: Final[str] = "telemetry.jsonl"
+  """
+  File, relative to the working directory, where telemetry is appended when option Telemetry is Jsonl.
+  """
+
+  WEIGHTS_FILE: Final[str] = "weights.json"
+  """
+  File, relative to the working directory, with the evaluation weights loaded at startup, if it exists, see `AlphaBetaPruner.load_weights`.
+  """
+
   def __init__(self) -> None:
     self.strategywhite: Strategy = Engine.DEFAULT_STRATEGY_WHITE
     self.strategyblack: Strategy = Engine.DEFAULT_STRATEGY_BLACK
     self.maxbranchingfactor: int = Engine.DEFAULT_MAX_BRANCHING_FACTOR
     self.numthreads: int = Engine.DEFAULT_NUM_THREADS
+    self.hashsize: int = Engine.DEFAULT_HASH_SIZE
+    self.ponder: bool = Engine.DEFAULT_PONDER
+    self.latemovereductions: bool = Engine.DEFAULT_LATE_MOVE_REDUCTIONS
+    self.nullmovepruning: bool = Engine.DEFAULT_NULL_MOVE_PRUNING
+    self.telemetry: Telemetry = Engine.DEFAULT_TELEMETRY
+    self._telemetry_sink: Optional[TelemetrySink] = None
+    self._tables: SearchTables = SearchTables(self.hashsize)
+    """
+    Caches shared by both brains.
+    """
     self.brains: dict[PlayerColor, Brain] = {
-      PlayerColor.WHITE: Engine.BRAINS[Engine.DEFAULT_STRATEGY_WHITE](),
-      PlayerColor.BLACK: Engine.BRAINS[Engine.DEFAULT_STRATEGY_BLACK]()
+      PlayerColor.WHITE: Engine.BRAINS[Engine.DEFAULT_STRATEGY_WHITE](self._tables),
+      PlayerColor.BLACK: Engine.BRAINS[Engine.DEFAULT_STRATEGY_BLACK](self._tables)
     }
     self.board: Optional[Board] = None
+    self._output: ResponseWriter = ResponseWriter(sys.stdout)
+    self._search: Optional[Thread] = None
+    """
+    Thread running the current `bestmove` search, until the main loop waits for it.
+    """
 
   def __getitem__(self, attr: str):
     return self.__dict__[attr] if attr in self.__dict__ else type(self).__dict__[attr]
@@ -87,37 +198,89 @@ class Engine:
 
   def start(self) -> None:
     """
-    Engine main loop to handle commands.
-    """
-    self.info()
-    while True:
-      print("ok")
-      match input().strip().split():
-        case [Command.INFO]:
-          self.info()
-        case [Command.HELP, *arguments]:
-          self.help(arguments)
-        case [Command.OPTIONS, *arguments]:
-          self.options(arguments)
-        case [Command.NEWGAME, *arguments]:
-          self.newgame(arguments)
-        case [Command.VALIDMOVES]:
-          self.validmoves()
-        case [Command.BESTMOVE, restriction, value]:
-          self.bestmove(restriction, value)
-        case [Command.PLAY, move]:
-          self.play(move)
-        case [Command.PLAY, partial_move_1, partial_move_2]:
-          self.play(f"{partial_move_1} {partial_move_2}")
-        case [Command.PASS]:
-          self.play(Move.PASS)
-        case [Command.UNDO, *arguments]:
-          self.undo(arguments)
-        case [Command.EXIT]:
-          print("ok")
-          break
-        case _:
-          self.error("Invalid command. Try 'help' to see a list of valid commands and how to use them")
+    | Engine main loop to handle commands.
+    | Commands are read on their own thread and searches run in background, so that the engine keeps answering while searching.
+    | Commands that depend on the current game wait for the running search to end, unless it's stopped with 'stop'.
+    """
+    stdout = sys.stdout
+    sys.stdout = self._output
+    commands: Queue[Optional[str]] = Queue()
+    Thread(target=self._read_commands, args=(commands,), daemon=True).start()
+    try:
+      self.info()
+      if os.path.isfile(Engine.WEIGHTS_FILE):
+        try:
+          AlphaBetaPruner.load_weights(Engine.WEIGHTS_FILE)
+        except ValueError as e:
+          self.error(e)
+      self._output.respond()
+      running = True
+      while running:
+        # Closing the standard input counts as exiting.
+        search = self._search
+        running = self._handle((commands.get() or Command.EXIT).strip().split())
+        if not self._search or self._search is search:
+          # Otherwise the command started a search, which answers on its own when done.
+          self._output.respond()
+    finally:
+      sys.stdout = stdout
+
+  def _read_commands(self, commands: Queue[Optional[str]]) -> None:
+    """
+    | Reads commands from the standard input until it's closed, then queues None.
+    | Runs on its own thread.
+
+    :param commands: Queue of commands read.
+    :type commands: Queue[Optional[str]]
+    """
+    for line in sys.stdin:
+      commands.put(line)
+    commands.put(None)
+
+  def _handle(self, command: list[str]) -> bool:
+    """
+    Handles the given command.
+
+    :param command: Command and its arguments.
+    :type command: list[str]
+    :return: Whether the engine should keep handling commands.
+    :rtype: bool
+    """
+    match command:
+      case [Command.INFO] | [Command.HELP, *_] | [Command.OPTIONS] | [Command.OPTIONS, "get", _] | [Command.STOP] | [Command.EXIT]:
+        pass
+      case _:
+        # Any other command might depend on or change the current game.
+        self._wait_search()
+    match command:
+      case [Command.INFO]:
+        self.info()
+      case [Command.HELP, *arguments]:
+        self.help(arguments)
+      case [Command.OPTIONS, *arguments]:
+        self.options(arguments)
+      case [Command.NEWGAME, *arguments]:
+        self.newgame(arguments)
+      case [Command.VALIDMOVES]:
+        self.validmoves()
+      case [Command.BESTMOVE, restriction, value]:
+        self.bestmove(restriction, value)
+      case [Command.PLAY, move]:
+        self.play(move)
+      case [Command.PLAY, partial_move_1, partial_move_2]:
+        self.play(f"{partial_move_1} {partial_move_2}")
+      case [Command.PASS]:
+        self.play(Move.PASS)
+      case [Command.UNDO, *arguments]:
+        self.undo(arguments)
+      case [Command.STOP]:
+        self.stop()
+      case [Command.EXIT]:
+        self.exit()
+        return False
+      case _:
+        self.error("Invalid command. Try 'help' to see a list of valid commands and how to use them")
+    return True
 
   def info(self) -> None:
     """
@@ -137,67 +300,80 @@ class Engine:
       if len(arguments) > 1:
         self.error(f"Too many arguments for command '{Command.HELP}'")
       else:
-        match arguments[0]:
-          case Command.INFO:
-            print(f"  {Command.INFO}")
-            print()
-            print("  Displays the identifier string of the engine and list of its capabilities.")
-            print("  See https://github.com/jonthysell/Mzinga/wiki/UniversalHiveProtocol#info.")
-          case Command.HELP:
-            print(f"  {Command.HELP}")
-            print(f"  {Command.HELP} [Command]")
-            print()
-            print("  Displays the list of available commands. If a command is specified, displays the help for that command.")
-          case Command.OPTIONS:
-            print(f"  {Command.OPTIONS}")
-            print(f"  {Command.OPTIONS} get OptionName")
-            print(f"  {Command.OPTIONS} set OptionName OptionValue")
-            print("")
-            print("  Displays the available options for the engine. Use 'get' to get the specified OptionName or 'set' to set the specified OptionName to OptionValue.")
-            print("  See https://github.com/jonthysell/Mzinga/wiki/UniversalHiveProtocol#options.")
-          case Command.NEWGAME:
-            print(f"  {Command.NEWGAME} [GameTypeString|GameString]")
-            print("")
-            print("  Starts a new Base game with no expansion pieces. If GameTypeString is specified, start a game of that type. If a GameString is specified, load it as the current game.")
-            print("  See https://github.com/jonthysell/Mzinga/wiki/UniversalHiveProtocol#newgame.")
-          case Command.VALIDMOVES:
-            print(f"  {Command.VALIDMOVES}")
-            print("")
-            print("  Displays a list of every valid move in the current game.")
-            print("  See https://github.com/jonthysell/Mzinga/wiki/UniversalHiveProtocol#validmoves.")
-          case Command.BESTMOVE:
-            print(f"  {Command.BESTMOVE} time MaxTime")
-            print(f"  {Command.BESTMOVE} depth MaxTime")
-            print("")
-            print("  Search for the best move for the current game. Use 'time' to limit the search by time in hh:mm:ss or use 'depth' to limit the number of turns to look into the future.")
-            print("  See https://github.com/jonthysell/Mzinga/wiki/UniversalHiveProtocol#bestmove.")
-          case Command.PLAY:
-            print(f"  {Command.PLAY} MoveString")
-            print("")
-            print("  Plays the specified MoveString in the current game.")
-            print("  See https://github.com/jonthysell/Mzinga/wiki/UniversalHiveProtocol#play.")
-          case Command.PASS:
-            print(f"  {Command.PASS}")
-            print("")
-            print("  Plays a passing move in the current game.")
-            print("  See https://github.com/jonthysell/Mzinga/wiki/UniversalHiveProtocol#pass.")
-          case Command.UNDO:
-            print(f"  {Command.UNDO} [MovesToUndo]")
-            print("")
-            print("  Undoes the last move in the current game. If MovesToUndo is specified, undo that many moves.")
-            print("  See https://github.com/jonthysell/Mzinga/wiki/UniversalHiveProtocol#undo.")
-          case Command.EXIT:
-            print(f"  {Command.EXIT}")
-            print("")
-            print("  Exits the engine.")
-          case _:
-            self.error(f"Unknown command '{arguments[0]}'")
+        self._command_help(arguments[0])
     else:
       print("Available commands:")
       for command in Command:
         print(f"  {command}")
       print(f"Try '{Command.HELP} <command>' to see help for a particular Command")
 
+  def _command_help(self, command: str) -> None:
+    """
+    Prints the help of the specified command.
+
+    :param command: Command.
+    :type command: str
+    """
+    match command:
+      case Command.INFO:
+        print(f"  {Command.INFO}")
+        print()
+        print("  Displays the identifier string of the engine and list of its capabilities.")
+        print("  See https://github.com/jonthysell/Mzinga/wiki/UniversalHiveProtocol#info.")
+      case Command.HELP:
+        print(f"  {Command.HELP}")
+        print(f"  {Command.HELP} [Command]")
+        print()
+        print("  Displays the list of available commands. If a command is specified, displays the help for that command.")
+      case Command.OPTIONS:
+        print(f"  {Command.OPTIONS}")
+        print(f"  {Command.OPTIONS} get OptionName")
+        print(f"  {Command.OPTIONS} set OptionName OptionValue")
+        print("")
+        print("  Displays the available options for the engine. Use 'get' to get the specified OptionName or 'set' to set the specified OptionName to OptionValue.")
+        print("  See https://github.com/jonthysell/Mzinga/wiki/UniversalHiveProtocol#options.")
+      case Command.NEWGAME:
+        print(f"  {Command.NEWGAME} [GameTypeString|GameString]")
+        print("")
+        print("  Starts a new Base game with no expansion pieces. If GameTypeString is specified, start a game of that type. If a GameString is specified, load it as the current game.")
+        print("  See https://github.com/jonthysell/Mzinga/wiki/UniversalHiveProtocol#newgame.")
+      case Command.VALIDMOVES:
+        print(f"  {Command.VALIDMOVES}")
+        print("")
+        print("  Displays a list of every valid move in the current game.")
+        print("  See https://github.com/jonthysell/Mzinga/wiki/UniversalHiveProtocol#validmoves.")
+      case Command.BESTMOVE:
+        print(f"  {Command.BESTMOVE} time MaxTime")
+        print(f"  {Command.BESTMOVE} depth MaxTime")
+        print("")
+        print("  Search for the best move for the current game. Use 'time' to limit the search by time in hh:mm:ss[.fff] or use 'depth' to limit the number of turns to look into the future.")
+        print("  See https://github.com/jonthysell/Mzinga/wiki/UniversalHiveProtocol#bestmove.")
+      case Command.PLAY:
+        print(f"  {Command.PLAY} MoveString")
+        print("")
+        print("  Plays the specified MoveString in the current game.")
+        print("  See https://github.com/jonthysell/Mzinga/wiki/UniversalHiveProtocol#play.")
+      case Command.PASS:
+        print(f"  {Command.PASS}")
+        print("")
+        print("  Plays a passing move in the current game.")
+        print("  See https://github.com/jonthysell/Mzinga/wiki/UniversalHiveProtocol#pass.")
+      case Command.UNDO:
+        print(f"  {Command.UNDO} [MovesToUndo]")
+        print("")
+        print("  Undoes the last move in the current game. If MovesToUndo is specified, undo that many moves.")
+        print("  See https://github.com/jonthysell/Mzinga/wiki/UniversalHiveProtocol#undo.")
+      case Command.STOP:
+        print(f"  {Command.STOP}")
+        print("")
+        print("  Stops the running search, which answers immediately with the best move found so far. Does nothing if the engine isn't searching.")
+      case Command.EXIT:
+        print(f"  {Command.EXIT}")
+        print("")
+        print("  Exits the engine.")
+      case _:
+        self.error(f"Unknown command '{command}'")
+
   def options(self, arguments: list[str]) -> None:
     """
     Handles 'options' command with arguments.
@@ -229,14 +405,19 @@ class Engine:
     :param option: Option to print.
     :type option: Option
     """
-    print(f"{option};{Engine.OPTION_TYPES[option]};{self[option.lower()]};{self[f"DEFAULT_{option.name}"]};", end="")
+    print(f"{option};{Engine.OPTION_TYPES[option]};{self[option.lower()]};{self[f"DEFAULT_{option.name}"]}", end="")
     match option:
       # Handle options with type Strategy
       case Option.STRATEGY_WHITE | Option.STRATEGY_BLACK:
-        print(";".join(Strategy))
+        print(f";{";".join(Strategy)}")
+      case Option.TELEMETRY:
+        print(f";{";".join(Telemetry)}")
       # Handle options with type Int or Float
-      case Option.MAX_BRANCHING_FACTOR | Option.NUM_THREADS:
-        print(f"{self[f"MIN_{option.name}"]};{self[f"MAX_{option.name}"]}")
+      case Option.MAX_BRANCHING_FACTOR | Option.NUM_THREADS | Option.HASH_SIZE:
+        print(f";{self[f"MIN_{option.name}"]};{self[f"MAX_{option.name}"]}")
+      # Handle options with type Bool
+      case Option.PONDER | Option.LATE_MOVE_REDUCTIONS | Option.NULL_MOVE_PRUNING:
+        print()
 
   def _set_option(self, option: Option, value: str) -> None:
     """
@@ -252,10 +433,38 @@ class Engine:
       # Handle options with type Strategy
       case Option.STRATEGY_WHITE | Option.STRATEGY_BLACK if value in Strategy:
         self[option.lower()] = Strategy(value)
-        self.brains[PlayerColor[option.name.split("_")[1]]] = Engine.BRAINS[Strategy(value)]()
+        color = PlayerColor[option.name.split("_")[1]]
+        self.brains[color].close()
+        self.brains[color] = Engine.BRAINS[Strategy(value)](self._tables)
+        self.brains[color].telemetry = self._telemetry_sink
+      case Option.TELEMETRY if value in Telemetry:
+        # Pondering searches report telemetry too.
+        for brain in self.brains.values():
+          brain.stop_pondering()
+        try:
+          sink = JsonlSink(Engine.TELEMETRY_FILE) if value == Telemetry.JSONL else StreamSink() if value == Telemetry.STDERR else None
+          if self._telemetry_sink:
+            self._telemetry_sink.close()
+          self.telemetry = Telemetry(value)
+          self._telemetry_sink = sink
+          for brain in self.brains.values():
+            brain.telemetry = sink
+        except OSError as e:
+          self.error(e)
+          valid = False
       # Handle options with type Int
       case Option.NUM_THREADS | Option.MAX_BRANCHING_FACTOR if value.isdigit() and self[f"MIN_{option.name}"] <= int(value) <= self[f"MAX_{option.name}"]:
         self[option.lower()] = int(value)
+      case Option.HASH_SIZE if value.isdigit() and Engine.MIN_HASH_SIZE <= int(value) <= Engine.MAX_HASH_SIZE:
+        self._resize_tables(int(value))
+      # Handle options with type Bool
+      case Option.PONDER if value in (str(True), str(False)):
+        self[option.lower()] = value == str(True)
+        if not self.ponder:
+          for brain in self.brains.values():
+            brain.stop_pondering()
+      case Option.LATE_MOVE_REDUCTIONS | Option.NULL_MOVE_PRUNING if value in (str(True), str(False)):
+        self[option.lower()] = value == str(True)
       # Handle erroneous use of command
       case _:
         self.error(f"Invalid value for option '{option}'")
@@ -263,6 +472,25 @@ class Engine:
     if valid:
       self._get_option(option)
 
+  def _resize_tables(self, size: int) -> None:
+    """
+    Replaces the search tables with ones of the given size.
+
+    :param size: Memory budget (in megabytes) of the search tables.
+    :type size: int
+    """
+    self.hashsize = size
+    # Brains are rebuilt around the new tables, which also drops whatever they remember of the current game.
+    for brain in self.brains.values():
+      brain.close()
+    self._tables.close()
+    self._tables = SearchTables(self.hashsize)
+    for color in self.brains:
+      self.brains[color] = Engine.BRAINS[self[f"strategy{color.name.lower()}"]](self._tables)
+      self.brains[color].telemetry = self._telemetry_sink
+    if self.board:
+      self.board.max_snapshots = self._tables.max_snapshots
+
   def newgame(self, arguments: list[str]) -> None:
     """
     | Handles 'newgame' command with arguments.
@@ -272,7 +500,9 @@ class Engine:
     :type arguments: list[str]
     """
     try:
-      self.board = Board(" ".join(arguments))
+      self.board = Board(" ".join(arguments), self._tables.max_snapshots)
+      for brain in self.brains.values():
+        brain.reset()
       print(self.board)
     except (ValueError, TypeError) as e:
       self.error(e)
@@ -294,15 +524,75 @@ class Engine:
     :type value: str
     """
     if self.is_active(self.board):
-      if restriction == "time" and re.fullmatch(r"[0-9]{2}:[0-5][0-9]:[0-5][0-9]", value):
-        print(self.brains[self.board.current_player_color].find_best_move(deepcopy(self.board), self.maxbranchingfactor, time_limit=sum(factor * int(time) for factor, time in zip([3600, 60, 1], value.split(':')))))
+      brain = self.brains[self.board.current_player_color]
+      if restriction == "time" and re.fullmatch(r"[0-9]{2}:[0-5][0-9]:[0-5][0-9](\.[0-9]{1,3})?", value):
+        limits = {"time_limit": sum(factor * float(time) for factor, time in zip([3600, 60, 1], value.split(':')))}
       elif restriction == "depth" and value.isdigit() and (max_depth := int(value)) > 0:
-        try:
-          print(self.brains[self.board.current_player_color].find_best_move(deepcopy(self.board), self.maxbranchingfactor, max_depth=max_depth))
-        except ValueError as e:
-          self.error(e)
+        limits = {"max_depth": max_depth}
       else:
         self.error(f"Invalid arguments for command '{Command.BESTMOVE}'")
+        return
+      # Stop pondering here, so that it can't swallow a stop request meant for the search.
+      # The other brain might be pondering too, and both search with the same tables, which aren't safe to use from two threads.
+      for pondering in self.brains.values():
+        pondering.stop_pondering()
+      self._search = Thread(target=self._bestmove, args=(brain, deepcopy(self.board), limits))
+      self._search.start()
+
+  def _bestmove(self, brain: Brain, board: Board, limits: dict[str, Any]) -> None:
+    """
+    | Searches for the best move and answers the 'bestmove' command, then starts pondering if enabled.
+    | Runs on the search thread.
+
+    :param brain: Agent playing the current turn.
+    :type brain: Brain
+    :param board: Copy of the current playing Board.
+    :type board: Board
+    :param limits: Depth or time limit of the search.
+    :type limits: dict[str, Any]
+    """
+    try:
+      print(brain.find_best_move(deepcopy(board), self.maxbranchingfactor, num_threads=self.numthreads, late_move_reductions=self.latemovereductions, null_move_pruning=self.nullmovepruning, **limits))
+    except ValueError as e:
+      self.error(e)
+      self._output.respond()
+      return
+    self._output.respond()
+    if self.ponder:
+      brain.ponder(board, self.maxbranchingfactor)
+
+  def stop(self) -> None:
+    """
+    | Handles 'stop' command.
+    | Stops the running search, if any, and waits for it to answer with the best move found so far.
+    """
+    if self._search:
+      while self._search.is_alive():
+        # Repeated, as the search might not have started yet when asked to stop.
+        for brain in self.brains.values():
+          brain.stop()
+        self._search.join(0.01)
+      self._search = None
+
+  def _wait_search(self) -> None:
+    """
+    Waits for the running search, if any, to end.
+    """
+    if self._search:
+      self._search.join()
+      self._search = None
+
+  def exit(self) -> None:
+    """
+    | Handles 'exit' command.
+    | Stops the running search, if any, and releases the brains, the search tables and the telemetry sink.
+    """
+    self.stop()
+    for brain in self.brains.values():
+      brain.close()
+    self._tables.close()
+    if self._telemetry_sink:
+      self._telemetry_sink.close()
 
   def play(self, move: str) -> None:
     """
@@ -314,6 +604,8 @@ class Engine:
     if self.is_active(self.board):
       try:
         self.board.play(move)
+        for brain in self.brains.values():
+          brain.notify_position(self.board)
         print(self.board)
       except ValueError as e:
         self.error(e)
@@ -326,6 +618,8 @@ class Engine:
     :type arguments: list[str]
     """
     if self.is_active(self.board):
+      for brain in self.brains.values():
+        brain.stop_pondering()
       if len(arguments) <= 1:
         try:
           if arguments:
@@ -365,4 +659,6 @@ class Engine:
     print(f"err {error}.")
 
 if __name__ == "__main__":
+  # Needed by frozen executables to run the worker processes of parallel searches.
+  freeze_support()
   Engine().start()
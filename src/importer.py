@@ -0,0 +1,297 @@
+import os
+import re
+import sys
+import zipfile
+import argparse
+from contextlib import ExitStack
+from multiprocessing import freeze_support
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Final, Optional, Iterator
+from core.enums import GameType, GameState, PlayerColor
+from core.game import Move
+from core.board import Board
+from core.record import GameRecord, RecordWriter
+from engine import Engine
+
+PROPERTY: Final[re.Pattern[str]] = re.compile(r"(SU|P0|P1)\[([^\]]*)\]")
+"""
+SGF properties read by the importer: the game variant and the actions of each player.
+"""
+PIECE: Final[re.Pattern[str]] = re.compile(r"([wb])([QSBGAMLP])(\d)?", re.IGNORECASE)
+"""
+Boardspace piece name, possibly with a redundant id for unique pieces.
+"""
+MOVE_ACTIONS: Final[frozenset[str]] = frozenset(("move", "pmove", "dropb", "pdropb"))
+"""
+Actions placing or moving a piece, followed by the piece, the column and row of its destination and its UHP-like relative position.
+"""
+
+Source = tuple[str, Optional[str]]
+"""
+SGF file, either a path or an archive path with the name of a member.
+"""
+
+def parse_sgf(sgf: str) -> tuple[Board, GameState]:
+  """
+  | Replays a Boardspace SGF game record, mapping each committed move onto `Board.play`, which validates it.
+  | Colors are swapped when the first player used the black pieces, since White always moves first in UHP.
+
+  :param sgf: Content of the SGF file.
+  :type sgf: str
+  :raises ValueError: If the game variant isn't supported or a move is malformed or invalid.
+  :return: Playing board and result of the game, which includes resignations and agreed draws.
+  :rtype: tuple[Board, GameState]
+  """
+  replay = _Replay()
+  for name, value in PROPERTY.findall(sgf):
+    if name == "SU":
+      replay.set_variant(value)
+      continue
+    index, _, action = value.partition(" ")
+    if not index.isdigit():
+      continue
+    tokens = action.split()
+    command = tokens[0].lower() if tokens else ""
+    if command in MOVE_ACTIONS or command == "pass":
+      replay.stage(name, tokens)
+    elif command == "done":
+      replay.commit()
+    elif command == "resign":
+      replay.resign(name)
+    elif command == "acceptdraw":
+      replay.commit()
+      replay.result = GameState.DRAW
+  replay.commit()
+  if not (board := replay.board) or not board.turn:
+    raise ValueError("The game has no moves")
+  return board, board.state if board.gameover else replay.result or board.state
+
+class _Replay:
+  """
+  | Game of an SGF file being replayed by `parse_sgf`.
+  | Boardspace records every action as it's made, so moves are only played once their player commits them, either explicitly or by letting the other player act.
+  """
+
+  def __init__(self) -> None:
+    self.board: Optional[Board] = None
+    self.players: list[str] = []
+    """
+    Names of the players, in turn order.
+    """
+    self.pending_player: str = ""
+    """
+    Name of the player whose move is waiting to be committed, empty if there's none.
+    """
+    self.pending_move: str = ""
+    """
+    MoveString waiting to be committed.
+    """
+    self.result: Optional[GameState] = None
+    """
+    Result of the game not told by the board, as for resignations and agreed draws.
+    """
+    self.swap: Optional[bool] = None
+    """
+    Whether the first player used the black pieces, unknown until a piece is named.
+    """
+
+  def set_variant(self, value: str) -> None:
+    """
+    Starts a new board for the given game variant.
+
+    :param value: Boardspace game variant.
+    :type value: str
+    :raises ValueError: If the game variant isn't supported.
+    """
+    variant, _, expansions = value.strip().lower().partition("-")
+    if variant != "hive":
+      raise ValueError(f"'{value}' is not a Hive variant")
+    self.board = Board(f"{GameType.BASE.tag}{'+' if expansions else ''}{expansions.upper()}")
+
+  def commit(self) -> None:
+    """
+    Plays the pending move, if any.
+
+    :raises ValueError: If the move is invalid or the game variant wasn't set.
+    """
+    if self.pending_player:
+      if not self.board:
+        raise ValueError("Moves were played before the game variant was set")
+      self.board.play(self.pending_move)
+      self.pending_player = ""
+
+  def stage(self, player: str, tokens: list[str]) -> None:
+    """
+    Makes the given action the pending move of a player, first committing the move of the other player.
+
+    :param player: Name of the player.
+    :type player: str
+    :param tokens: Action placing or moving a piece, or passing.
+    :type tokens: list[str]
+    :raises ValueError: If the action doesn't name a valid piece or the committed move is invalid.
+    """
+    if self.pending_player and self.pending_player != player:
+      self.commit()
+    if player not in self.players:
+      self.players.append(player)
+    self.pending_player = player
+    if tokens[0].lower() == "pass":
+      self.pending_move = Move.PASS
+      return
+    position = next((position for position, token in enumerate(tokens) if PIECE.fullmatch(token)), None)
+    if position is None:
+      raise ValueError(f"'{' '.join(tokens)}' doesn't name a piece")
+    if self.swap is None:
+      self.swap = tokens[position][0].lower() == PlayerColor.BLACK.code
+    swap = self.swap
+    piece = _normalize(tokens[position], swap)
+    # The piece is followed by the column and row of its destination, and then by its position relative to another piece.
+    relative = " ".join(tokens[position + 3:])
+    self.pending_move = piece if not self.board or not self.board.turn or relative in ("", ".") else f"{piece} {PIECE.sub(lambda match: _normalize(match.group(0), swap), relative)}"
+
+  def resign(self, player: str) -> None:
+    """
+    Ends the game with the resignation of a player.
+
+    :param player: Name of the player.
+    :type player: str
+    """
+    self.commit()
+    # A player resigning before moving takes the next turn, so resigning before any move means being the first player.
+    if player not in self.players:
+      self.players.append(player)
+    self.result = GameState.BLACK_WINS if self.players.index(player) == 0 else GameState.WHITE_WINS
+
+def _normalize(piece: str, swap: bool) -> str:
+  """
+  Turns a Boardspace piece name into a BugString.
+
+  :param piece: Boardspace piece name.
+  :type piece: str
+  :param swap: Whether to swap its color.
+  :type swap: bool
+  :return: BugString.
+  :rtype: str
+  """
+  if not (match := PIECE.fullmatch(piece)):
+    raise ValueError(f"'{piece}' is not a valid piece")
+  color, bug_type, bug_id = match.groups()
+  color = PlayerColor.BLACK.code if (color.lower() == PlayerColor.WHITE.code) == swap else PlayerColor.WHITE.code
+  return f"{color}{bug_type.upper()}{bug_id if bug_id and bug_type.upper() in 'SBGA' else ''}"
+
+def find_sources(paths: list[str]) -> Iterator[Source]:
+  """
+  Finds the SGF files of the given paths, looking into directories recursively and into `.zip` archives.
+
+  :param paths: Paths of SGF files, `.zip` archives or directories.
+  :type paths: list[str]
+  :return: SGF files.
+  :rtype: Iterator[Source]
+  """
+  for path in paths:
+    if os.path.isdir(path):
+      for directory, _, files in sorted(os.walk(path)):
+        yield from find_sources([os.path.join(directory, file) for file in sorted(files) if file.lower().endswith((".sgf", ".zip"))])
+    elif path.lower().endswith(".zip"):
+      with zipfile.ZipFile(path) as archive:
+        yield from ((path, member) for member in archive.namelist() if member.lower().endswith(".sgf"))
+    else:
+      yield path, None
+
+def read_games(sources: list[Source]) -> Iterator[tuple[Source, Optional[tuple[Board, GameState]]]]:
+  """
+  Streams the games of the given SGF files, one at a time, skipping the malformed ones.
+
+  :param sources: SGF files.
+  :type sources: list[Source]
+  :return: Each SGF file, along with its game and result, or `None` if it's malformed.
+  :rtype: Iterator[tuple[Source, Optional[tuple[Board, GameState]]]]
+  """
+  with ExitStack() as archives:
+    archive: Optional[zipfile.ZipFile] = None
+    for path, member in sources:
+      try:
+        if member is None:
+          with open(path, "rb") as file:
+            content = file.read()
+        else:
+          if not archive or archive.filename != path:
+            # Members of an archive come one after the other, so only the last archive is kept open.
+            archives.close()
+            archive = None
+            archive = archives.enter_context(zipfile.ZipFile(path))
+          content = archive.read(member)
+        yield (path, member), parse_sgf(content.decode("utf-8", "replace"))
+      except (OSError, ValueError, zipfile.BadZipFile):
+        yield (path, member), None
+
+def import_games(sources: list[Source], output: str, task: int, binary: bool) -> tuple[int, int]:
+  """
+  | Imports a batch of SGF files, streaming their games to the output file of the task.
+  | Runs on worker processes.
+
+  :param sources: SGF files.
+  :type sources: list[Source]
+  :param output: Directory where output files are written.
+  :type output: str
+  :param task: Index of the task, naming its output file.
+  :type task: int
+  :param binary: Whether to write game records (see `core.record`) rather than GameStrings.
+  :type binary: bool
+  :return: Amount of imported and skipped games.
+  :rtype: tuple[int, int]
+  """
+  imported = skipped = 0
+  path = os.path.join(output, f"import-{task:05}.{'hgr' if binary else 'txt'}")
+  # Output files are written under a temporary name and then renamed, so interrupted runs never leave truncated files.
+  with RecordWriter(f"{path}.tmp") if binary else open(f"{path}.tmp", "w", encoding="utf-8") as writer:
+    for _, game in read_games(sources):
+      if game:
+        board, result = game
+        if isinstance(writer, RecordWriter):
+          writer.write(GameRecord.from_board(board, result))
+        else:
+          writer.write(f"{board}\n")
+        imported += 1
+      else:
+        skipped += 1
+  os.replace(f"{path}.tmp", path)
+  return imported, skipped
+
+def main(argv: Optional[list[str]] = None) -> None:
+  """
+  | Runs the importer command line interface.
+  | SGF files are split into tasks, imported concurrently by a pool of worker processes, each writing its own output file.
+
+  :param argv: Command line arguments, defaults to the ones of the process.
+  :type argv: Optional[list[str]], optional
+  """
+  parser = argparse.ArgumentParser(description="Imports Boardspace SGF game archives, replaying and validating every game, as GameStrings or binary game records.")
+  parser.add_argument("inputs", nargs="+", help="SGF files, .zip archives of SGF files or directories containing them")
+  parser.add_argument("--output", default="games", help="directory where output files are written (default: %(default)s)")
+  parser.add_argument("--format", choices=["gamestring", "record"], default="record", help="output format, either a GameString per line or binary game records (default: %(default)s)")
+  parser.add_argument("--processes", type=int, default=Engine.MAX_NUM_THREADS, help="amount of concurrent tasks (default: %(default)s)")
+  parser.add_argument("--files-per-task", type=int, default=1000, help="amount of SGF files of each task (default: %(default)s)")
+  args = parser.parse_args(argv)
+  os.makedirs(args.output, exist_ok=True)
+  imported = skipped = 0
+  with ProcessPoolExecutor(args.processes) as pool:
+    futures = []
+    batch: list[Source] = []
+    for source in find_sources(args.inputs):
+      batch.append(source)
+      if len(batch) == args.files_per_task:
+        futures.append(pool.submit(import_games, batch, args.output, len(futures), args.format == "record"))
+        batch = []
+    if batch:
+      futures.append(pool.submit(import_games, batch, args.output, len(futures), args.format == "record"))
+    for future in as_completed(futures):
+      task_imported, task_skipped = future.result()
+      imported += task_imported
+      skipped += task_skipped
+      print(f"Imported: {imported}; Skipped: {skipped}", file=sys.stderr, flush=True)
+
+if __name__ == "__main__":
+  # Needed by frozen executables to run the worker processes.
+  freeze_support()
+  main()
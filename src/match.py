@@ -0,0 +1,700 @@
+import shlex
+import argparse
+import subprocess
+from math import log, log10, sqrt, isclose
+from time import perf_counter
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from contextlib import ExitStack
+from random import Random as RandomGenerator
+from multiprocessing import freeze_support
+from concurrent.futures import ProcessPoolExecutor, Future, wait, FIRST_COMPLETED
+from typing import Final, Optional
+from core.enums import Option, Strategy, GameState, PlayerColor
+from core.board import Board
+from ai.brain import Brain
+from ai.table import SearchTables
+from ai.telemetry import CallbackSink, IterationStats
+from engine import Engine
+
+@dataclass(frozen=True)
+class PlayerConfig:
+  """
+  Configuration of one of the engines of a match.
+  """
+  name: str
+  options: tuple[tuple[str, str], ...] = ()
+  """
+  Engine options and their values, as set with 'options set'.
+  """
+  command: tuple[str, ...] = ()
+  """
+  Command starting a UHP engine subprocess, empty to play in-process.
+  """
+  cwd: Optional[str] = None
+  """
+  Working directory of the UHP engine subprocess.
+  """
+
+@dataclass
+class SideStats:
+  """
+  Search statistics of one side of a match.
+  """
+  moves: int = 0
+  time: float = 0
+  """
+  Total search time (in seconds).
+  """
+  nodes: int = 0
+  """
+  Total nodes visited, only known for in-process negamax agents.
+  """
+  depth_times: dict[int, float] = field(default_factory=dict)
+  """
+  Sum, over the searches that reached each depth, of the time (in seconds) it took to reach it.
+  """
+  depth_counts: dict[int, int] = field(default_factory=dict)
+  """
+  Amount of searches that reached each depth.
+  """
+
+  def __add__(self, other: "SideStats") -> "SideStats":
+    return SideStats(
+      self.moves + other.moves,
+      self.time + other.time,
+      self.nodes + other.nodes,
+      {depth: self.depth_times.get(depth, 0) + other.depth_times.get(depth, 0) for depth in self.depth_times | other.depth_times},
+      {depth: self.depth_counts.get(depth, 0) + other.depth_counts.get(depth, 0) for depth in self.depth_counts | other.depth_counts}
+    )
+
+  @property
+  def nodes_per_second(self) -> float:
+    """
+    Nodes visited per second of search, `0` if unknown.
+
+    :rtype: float
+    """
+    return self.nodes / self.time if self.time else 0
+
+  def reach_depth(self, depth: int, elapsed: float) -> None:
+    """
+    Records the time a search took to reach the given depth.
+
+    :param depth: Depth reached.
+    :type depth: int
+    :param elapsed: Time (in seconds) since the search started.
+    :type elapsed: float
+    """
+    self.depth_times[depth] = self.depth_times.get(depth, 0) + elapsed
+    self.depth_counts[depth] = self.depth_counts.get(depth, 0) + 1
+
+  def time_to_depth(self) -> dict[int, float]:
+    """
+    Returns the average time (in seconds) searches took to reach each depth.
+
+    :return: Average time to depth.
+    :rtype: dict[int, float]
+    """
+    return {depth: self.depth_times[depth] / self.depth_counts[depth] for depth in sorted(self.depth_times)}
+
+class Player(ABC):
+  """
+  Base abstract class for the engines playing a match.
+  """
+
+  def __init__(self, config: PlayerConfig) -> None:
+    self.config: Final[PlayerConfig] = config
+    self.stats: SideStats = SideStats()
+
+  @abstractmethod
+  def new_game(self, gamestring: str) -> None:
+    """
+    Starts a new game from the given position.
+
+    :param gamestring: GameString of the opening.
+    :type gamestring: str
+    """
+
+  @abstractmethod
+  def play(self, move: str) -> None:
+    """
+    Notifies the player about a move played by either side.
+
+    :param move: MoveString.
+    :type move: str
+    """
+
+  @abstractmethod
+  def best_move(self, board: Board, max_depth: int, time_limit: float) -> str:
+    """
+    Searches the best move for the given board, updating the search statistics.
+
+    :param board: Current playing board.
+    :type board: Board
+    :param max_depth: Maximum lookahead depth, `0` for no limit.
+    :type max_depth: int
+    :param time_limit: Maximum time (in seconds) to calculate the best move, `0` for no limit.
+    :type time_limit: float
+    :return: MoveString.
+    :rtype: str
+    """
+
+  def close(self) -> None:
+    """
+    Releases the resources of the player.
+    """
+
+class InProcessPlayer(Player):
+  """
+  Engine configuration playing in the current process, with the same agents and options of `Engine`.
+  """
+
+  OPTIONS: Final[tuple[Option, ...]] = (Option.STRATEGY_WHITE, Option.STRATEGY_BLACK, Option.MAX_BRANCHING_FACTOR, Option.HASH_SIZE, Option.LATE_MOVE_REDUCTIONS, Option.NULL_MOVE_PRUNING)
+  """
+  Options supported in-process, other options are engine or UI concerns.
+  """
+
+  def __init__(self, config: PlayerConfig) -> None:
+    """
+    In-process player instantiation.
+
+    :param config: Player configuration.
+    :type config: PlayerConfig
+    :raises ValueError: If an option is not supported in-process or has an invalid value.
+    """
+    super().__init__(config)
+    settings = {option: str(Engine.__dict__[f"DEFAULT_{option.name}"]) for option in InProcessPlayer.OPTIONS}
+    for name, value in config.options:
+      if name not in InProcessPlayer.OPTIONS:
+        raise ValueError(f"Option '{name}' is not supported in-process")
+      settings[Option(name)] = value
+    try:
+      self._max_branching_factor: Final[int] = int(settings[Option.MAX_BRANCHING_FACTOR])
+      self._late_move_reductions: Final[bool] = _parse_bool(settings[Option.LATE_MOVE_REDUCTIONS])
+      self._null_move_pruning: Final[bool] = _parse_bool(settings[Option.NULL_MOVE_PRUNING])
+      self._tables: Final[SearchTables] = SearchTables(int(settings[Option.HASH_SIZE]))
+      self._brains: Final[dict[PlayerColor, Brain]] = {color: Engine.BRAINS[Strategy(settings[option])](self._tables) for color, option in ((PlayerColor.WHITE, Option.STRATEGY_WHITE), (PlayerColor.BLACK, Option.STRATEGY_BLACK))}
+    except (KeyError, ValueError) as e:
+      raise ValueError(f"Invalid options for '{config.name}': {e}") from e
+    for brain in self._brains.values():
+      brain.telemetry = CallbackSink(self._record)
+
+  def new_game(self, gamestring: str) -> None:
+    for brain in self._brains.values():
+      brain.reset()
+
+  def play(self, move: str) -> None:
+    # Shares the match board.
+    pass
+
+  def best_move(self, board: Board, max_depth: int, time_limit: float) -> str:
+    start = perf_counter()
+    move = self._brains[board.current_player_color].find_best_move(board, self._max_branching_factor, max_depth, time_limit, late_move_reductions=self._late_move_reductions, null_move_pruning=self._null_move_pruning)
+    self.stats.moves += 1
+    self.stats.time += perf_counter() - start
+    return move
+
+  def close(self) -> None:
+    for brain in self._brains.values():
+      brain.close()
+    self._tables.close()
+
+  def _record(self, stats: IterationStats) -> None:
+    """
+    Records the telemetry of a search iteration.
+
+    :param stats: Iteration stats.
+    :type stats: IterationStats
+    """
+    self.stats.nodes += stats.counters.nodes
+    self.stats.reach_depth(stats.depth, stats.elapsed)
+
+class UHPPlayer(Player):
+  """
+  | Engine configuration playing as a UHP engine subprocess.
+  | Only the search time is known, which is also the time to depth of searches limited by depth.
+  """
+
+  EXIT_TIMEOUT: Final[float] = 5
+  """
+  Time (in seconds) the engine is given to exit before being killed.
+  """
+
+  def __init__(self, config: PlayerConfig) -> None:
+    """
+    UHP player instantiation, starting the engine and setting its options.
+
+    :param config: Player configuration.
+    :type config: PlayerConfig
+    """
+    super().__init__(config)
+    self._resources: Final[ExitStack] = ExitStack()
+    """
+    Owner of the engine subprocess, closing its pipes and reaping it on `close`.
+    """
+    self._process: Final[subprocess.Popen[str]] = self._resources.enter_context(subprocess.Popen(config.command, cwd=config.cwd, stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True))
+    self._send(None)
+    for name, value in config.options:
+      self._send(f"options set {name} {value}")
+
+  def new_game(self, gamestring: str) -> None:
+    self._send(f"newgame {gamestring}")
+
+  def play(self, move: str) -> None:
+    self._send(f"play {move}")
+
+  def best_move(self, board: Board, max_depth: int, time_limit: float) -> str:
+    start = perf_counter()
+    if max_depth:
+      response = self._send(f"bestmove depth {max_depth}")
+    else:
+      minutes, seconds = divmod(time_limit, 60)
+      response = self._send(f"bestmove time {int(minutes // 60):02}:{int(minutes % 60):02}:{seconds:06.3f}")
+    elapsed = perf_counter() - start
+    self.stats.moves += 1
+    self.stats.time += elapsed
+    if max_depth:
+      self.stats.reach_depth(max_depth, elapsed)
+    return response[-1]
+
+  def close(self) -> None:
+    try:
+      self._send("exit")
+      self._process.wait(UHPPlayer.EXIT_TIMEOUT)
+    except (RuntimeError, OSError, subprocess.TimeoutExpired):
+      self._process.kill()
+    self._resources.close()
+
+  def _send(self, command: Optional[str]) -> list[str]:
+    """
+    Sends a command to the engine and reads its response, up to the closing 'ok'.
+
+    :param command: Command, None to only read a response.
+    :type command: Optional[str]
+    :raises RuntimeError: If the engine exits or answers with an error.
+    :return: Response lines.
+    :rtype: list[str]
+    """
+    assert self._process.stdin and self._process.stdout
+    if command:
+      self._process.stdin.write(f"{command}\n")
+      self._process.stdin.flush()
+    lines: list[str] = []
+    while (line := self._process.stdout.readline()):
+      if (line := line.rstrip("\n")) == "ok":
+        break
+      lines.append(line)
+    else:
+      raise RuntimeError(f"Engine '{self.config.name}' exited while answering '{command}'")
+    if any(line.startswith(("err", "invalidmove")) for line in lines):
+      raise RuntimeError(f"Engine '{self.config.name}' failed to answer '{command}': {' '.join(lines)}")
+    return lines
+
+class SPRT:
+  """
+  | Sequential probability ratio test between two Elo hypotheses, on the score of the first engine of a match.
+  | The log-likelihood ratio uses the normal approximation of the game score distribution, so draws are accounted for.
+  """
+
+  def __init__(self, elo0: float = 0, elo1: float = 5, alpha: float = 0.05, beta: float = 0.05) -> None:
+    """
+    SPRT instantiation.
+
+    :param elo0: Elo difference of the null hypothesis, defaults to `0`.
+    :type elo0: float, optional
+    :param elo1: Elo difference of the alternative hypothesis, defaults to `5`.
+    :type elo1: float, optional
+    :param alpha: False positive rate, defaults to `0.05`.
+    :type alpha: float, optional
+    :param beta: False negative rate, defaults to `0.05`.
+    :type beta: float, optional
+    """
+    self.elo0: Final[float] = elo0
+    self.elo1: Final[float] = elo1
+    self.lower_bound: Final[float] = log(beta / (1 - alpha))
+    """
+    Log-likelihood ratio below which the null hypothesis is accepted.
+    """
+    self.upper_bound: Final[float] = log((1 - beta) / alpha)
+    """
+    Log-likelihood ratio above which the alternative hypothesis is accepted.
+    """
+    self.wins: int = 0
+    self.draws: int = 0
+    self.losses: int = 0
+
+  @property
+  def games(self) -> int:
+    """
+    Amount of games played.
+
+    :rtype: int
+    """
+    return self.wins + self.draws + self.losses
+
+  @property
+  def score(self) -> float:
+    """
+    Average score of the first engine, `0.5` before any game.
+
+    :rtype: float
+    """
+    return (self.wins + self.draws / 2) / self.games if self.games else 0.5
+
+  @property
+  def variance(self) -> float:
+    """
+    Variance of the score of a single game.
+
+    :rtype: float
+    """
+    if not self.games:
+      return 0
+    score = self.score
+    return (self.wins * (1 - score) ** 2 + self.draws * (0.5 - score) ** 2 + self.losses * score ** 2) / self.games
+
+  @property
+  def elo(self) -> float:
+    """
+    Estimated Elo difference of the first engine.
+
+    :rtype: float
+    """
+    return _elo(self.score)
+
+  @property
+  def elo_error(self) -> float:
+    """
+    Half-width of the 95% confidence interval of the Elo difference.
+
+    :rtype: float
+    """
+    if not self.games:
+      return float('inf')
+    margin = 1.96 * sqrt(self.variance / self.games)
+    return (_elo(self.score + margin) - _elo(self.score - margin)) / 2
+
+  @property
+  def llr(self) -> float:
+    """
+    Log-likelihood ratio of the alternative hypothesis over the null one.
+
+    :rtype: float
+    """
+    if isclose(variance := self.variance, 0):
+      # Not enough information yet, such as when every game had the same result.
+      return 0
+    score0, score1 = _score(self.elo0), _score(self.elo1)
+    return self.games * (score1 - score0) * (2 * self.score - score0 - score1) / (2 * variance)
+
+  def add(self, score: float) -> None:
+    """
+    Adds the result of a game.
+
+    :param score: Score of the first engine: `1` for a win, `0.5` for a draw and `0` for a loss.
+    :type score: float
+    """
+    if score == 1:
+      self.wins += 1
+    elif score == 0:
+      self.losses += 1
+    else:
+      self.draws += 1
+
+  def decision(self) -> Optional[bool]:
+    """
+    Returns whether the test is decided.
+
+    :return: True if the alternative hypothesis is accepted, False if the null one is, None if more games are needed.
+    :rtype: Optional[bool]
+    """
+    if (llr := self.llr) >= self.upper_bound:
+      return True
+    if llr <= self.lower_bound:
+      return False
+    return None
+
+def make_openings(game_type: str, count: int, plies: int, seed: int) -> list[str]:
+  """
+  Generates random openings, each played twice with colors swapped, so that they're balanced even when they favor one side.
+
+  :param game_type: GameTypeString.
+  :type game_type: str
+  :param count: Amount of openings.
+  :type count: int
+  :param plies: Amount of random moves of each opening.
+  :type plies: int
+  :param seed: Seed of the random moves.
+  :type seed: int
+  :return: GameStrings of the openings.
+  :rtype: list[str]
+  """
+  rng = RandomGenerator(seed)
+  openings: list[str] = []
+  for _ in range(count):
+    board = Board(game_type)
+    while board.turn < plies and not board.gameover:
+      # Valid moves come in no particular order, so they're sorted to get the same openings in every process.
+      board.play(rng.choice(sorted(board.valid_moves.split(";"))))
+    openings.append(str(board))
+  return openings
+
+def play_game(white: Player, black: Player, opening: str, max_depth: int, time_limit: float, max_turns: int) -> GameState:
+  """
+  Plays a game between two players.
+
+  :param white: White player.
+  :type white: Player
+  :param black: Black player.
+  :type black: Player
+  :param opening: GameString of the opening.
+  :type opening: str
+  :param max_depth: Maximum lookahead depth of each search, `0` for no limit.
+  :type max_depth: int
+  :param time_limit: Maximum time (in seconds) of each search, `0` for no limit.
+  :type time_limit: float
+  :param max_turns: Amount of turns after which the game is adjudicated as a draw.
+  :type max_turns: int
+  :return: Final state of the game.
+  :rtype: GameState
+  """
+  board = Board(opening)
+  players = {PlayerColor.WHITE: white, PlayerColor.BLACK: black}
+  for player in players.values():
+    player.new_game(opening)
+  while not board.gameover and board.turn < max_turns:
+    move = players[board.current_player_color].best_move(board, max_depth, time_limit)
+    board.play(move)
+    for player in players.values():
+      player.play(move)
+  return board.state
+
+def play_pair(first: PlayerConfig, second: PlayerConfig, opening: str, max_depth: int, time_limit: float, max_turns: int) -> tuple[list[float], SideStats, SideStats]:
+  """
+  | Plays an opening twice, swapping colors, between two engine configurations.
+  | Runs on worker processes.
+
+  :param first: Configuration of the first engine.
+  :type first: PlayerConfig
+  :param second: Configuration of the second engine.
+  :type second: PlayerConfig
+  :param opening: GameString of the opening.
+  :type opening: str
+  :param max_depth: Maximum lookahead depth of each search, `0` for no limit.
+  :type max_depth: int
+  :param time_limit: Maximum time (in seconds) of each search, `0` for no limit.
+  :type time_limit: float
+  :param max_turns: Amount of turns after which games are adjudicated as draws.
+  :type max_turns: int
+  :return: Scores of the first engine in both games, and the search statistics of both engines.
+  :rtype: tuple[list[float], SideStats, SideStats]
+  """
+  players = [_create_player(first), _create_player(second)]
+  try:
+    scores: list[float] = []
+    for white, black in (players, players[::-1]):
+      state = play_game(white, black, opening, max_depth, time_limit, max_turns)
+      first_color = PlayerColor.WHITE if white is players[0] else PlayerColor.BLACK
+      scores.append(1 if state is GameState[f"{first_color.name}_WINS"] else 0 if state is GameState[f"{first_color.opposite.name}_WINS"] else 0.5)
+    return scores, players[0].stats, players[1].stats
+  finally:
+    for player in players:
+      player.close()
+
+def _create_player(config: PlayerConfig) -> Player:
+  """
+  Creates the player of the given configuration.
+
+  :param config: Player configuration.
+  :type config: PlayerConfig
+  :return: UHP player if the configuration has a command, in-process player otherwise.
+  :rtype: Player
+  """
+  return UHPPlayer(config) if config.command else InProcessPlayer(config)
+
+def _parse_bool(value: str) -> bool:
+  """
+  Parses a UHP boolean option value.
+
+  :param value: Value.
+  :type value: str
+  :raises ValueError: If the value is neither 'True' nor 'False'.
+  :return: Boolean.
+  :rtype: bool
+  """
+  if value not in ("True", "False"):
+    raise ValueError(f"'{value}' is not a boolean")
+  return value == "True"
+
+def _score(elo: float) -> float:
+  """
+  Converts an Elo difference into the expected score.
+
+  :param elo: Elo difference.
+  :type elo: float
+  :return: Expected score.
+  :rtype: float
+  """
+  return 1 / (1 + 10 ** (-elo / 400))
+
+def _elo(score: float) -> float:
+  """
+  Converts an expected score into an Elo difference, clamped for perfect scores.
+
+  :param score: Expected score.
+  :type score: float
+  :return: Elo difference.
+  :rtype: float
+  """
+  score = min(max(score, 1e-3), 1 - 1e-3)
+  return 400 * log10(score / (1 - score))
+
+def _parse_player(name: str, options: list[str], command: Optional[str], cwd: Optional[str]) -> PlayerConfig:
+  """
+  Builds a player configuration from command line arguments.
+
+  :param name: Name of the player.
+  :type name: str
+  :param options: Options, as 'Name=Value'.
+  :type options: list[str]
+  :param command: Command starting a UHP engine, if any.
+  :type command: Optional[str]
+  :param cwd: Working directory of the UHP engine, if any.
+  :type cwd: Optional[str]
+  :raises ValueError: If an option isn't formatted as 'Name=Value'.
+  :return: Player configuration.
+  :rtype: PlayerConfig
+  """
+  if any("=" not in option for option in options):
+    raise ValueError(f"Options of '{name}' must be formatted as Name=Value")
+  return PlayerConfig(name, tuple(tuple(option.split("=", 1)) for option in options), tuple(shlex.split(command)) if command else (), cwd)
+
+def _print_stats(config: PlayerConfig, stats: SideStats) -> None:
+  """
+  Prints the search statistics of a side.
+
+  :param config: Player configuration.
+  :type config: PlayerConfig
+  :param stats: Search statistics.
+  :type stats: SideStats
+  """
+  depths = "; ".join(f"depth {depth}: {time:.3f}s" for depth, time in stats.time_to_depth().items())
+  print(f"{config.name}: Moves: {stats.moves}; Time per move: {stats.time / stats.moves if stats.moves else 0:.3f}s; NPS: {stats.nodes_per_second:.0f}; Time to depth: {depths or 'n/a'}")
+
+def add_match_arguments(parser: argparse.ArgumentParser) -> None:
+  """
+  Adds the arguments describing a match to the given parser, see `setup_match`.
+
+  :param parser: Command line parser.
+  :type parser: argparse.ArgumentParser
+  """
+  for side in ("a", "b"):
+    parser.add_argument(f"--{side}-option", action="append", default=[], metavar="NAME=VALUE", help=f"option of engine {side.upper()}, repeatable")
+    parser.add_argument(f"--{side}-command", help=f"command starting engine {side.upper()} as a UHP subprocess (default: in-process)")
+    parser.add_argument(f"--{side}-cwd", help=f"working directory of engine {side.upper()} subprocess")
+  parser.add_argument("--games", type=int, default=1000, help="maximum amount of games, rounded up to pairs (default: %(default)s)")
+  parser.add_argument("--depth", type=int, default=0, help="maximum depth of each search, 0 for no limit (default: %(default)s)")
+  parser.add_argument("--time", type=float, default=0, help="maximum time (in seconds) of each search, 0 for no limit (default: %(default)s)")
+  parser.add_argument("--max-turns", type=int, default=200, help="turns after which games are adjudicated as draws (default: %(default)s)")
+  parser.add_argument("--game-type", default="Base+MLP", help="GameTypeString of the random openings (default: %(default)s)")
+  parser.add_argument("--openings", help="file with a GameString per line (default: random openings)")
+  parser.add_argument("--opening-plies", type=int, default=4, help="moves of each random opening (default: %(default)s)")
+  parser.add_argument("--seed", type=int, default=0, help="seed of the random openings (default: %(default)s)")
+  parser.add_argument("--elo0", type=float, default=0, help="Elo difference of the null hypothesis (default: %(default)s)")
+  parser.add_argument("--elo1", type=float, default=5, help="Elo difference of the alternative hypothesis (default: %(default)s)")
+  parser.add_argument("--alpha", type=float, default=0.05, help="false positive rate (default: %(default)s)")
+  parser.add_argument("--beta", type=float, default=0.05, help="false negative rate (default: %(default)s)")
+
+def setup_match(parser: argparse.ArgumentParser, args: argparse.Namespace) -> tuple[PlayerConfig, PlayerConfig, list[str], SPRT]:
+  """
+  Builds a match from the parsed arguments added by `add_match_arguments`, exiting with a usage error if they're invalid.
+
+  :param parser: Command line parser.
+  :type parser: argparse.ArgumentParser
+  :param args: Parsed arguments.
+  :type args: argparse.Namespace
+  :return: Configurations of both engines, the opening of each pair of games and the SPRT.
+  :rtype: tuple[PlayerConfig, PlayerConfig, list[str], SPRT]
+  """
+  if not args.depth and not args.time:
+    parser.error("at least one of --depth and --time is needed")
+  try:
+    first = _parse_player("A", args.a_option, args.a_command, args.a_cwd)
+    second = _parse_player("B", args.b_option, args.b_command, args.b_cwd)
+  except ValueError as e:
+    parser.error(str(e))
+  pairs = (args.games + 1) // 2
+  if args.openings:
+    with open(args.openings, encoding="utf-8") as file:
+      book = [line.strip() for line in file if line.strip()]
+    openings = [book[index % len(book)] for index in range(pairs)]
+  else:
+    openings = make_openings(args.game_type, pairs, args.opening_plies, args.seed)
+  return first, second, openings, SPRT(args.elo0, args.elo1, args.alpha, args.beta)
+
+def print_progress(sprt: SPRT) -> None:
+  """
+  Prints the current standing of a match.
+
+  :param sprt: SPRT of the match.
+  :type sprt: SPRT
+  """
+  print(f"Games: {sprt.games}; W/D/L: {sprt.wins}/{sprt.draws}/{sprt.losses}; Elo: {sprt.elo:.1f} ± {sprt.elo_error:.1f}; LLR: {sprt.llr:.2f} ({sprt.lower_bound:.2f}, {sprt.upper_bound:.2f})", flush=True)
+
+def print_summary(sprt: SPRT, first: PlayerConfig, first_stats: SideStats, second: PlayerConfig, second_stats: SideStats) -> None:
+  """
+  Prints the outcome of a match and the search statistics of both engines.
+
+  :param sprt: SPRT of the match.
+  :type sprt: SPRT
+  :param first: Configuration of the first engine.
+  :type first: PlayerConfig
+  :param first_stats: Search statistics of the first engine.
+  :type first_stats: SideStats
+  :param second: Configuration of the second engine.
+  :type second: PlayerConfig
+  :param second_stats: Search statistics of the second engine.
+  :type second_stats: SideStats
+  """
+  decision = sprt.decision()
+  print("H1 accepted: A is stronger" if decision else "H0 accepted: A is not stronger" if decision is False else "Inconclusive: maximum amount of games reached")
+  _print_stats(first, first_stats)
+  _print_stats(second, second_stats)
+
+def main(argv: Optional[list[str]] = None) -> None:
+  """
+  | Runs the match runner command line interface.
+  | Pairs of games are played concurrently by a pool of worker processes, and the match stops as soon as the SPRT is decided.
+
+  :param argv: Command line arguments, defaults to the ones of the process.
+  :type argv: Optional[list[str]], optional
+  """
+  parser = argparse.ArgumentParser(description="Plays two engine configurations against each other until an SPRT on their Elo difference is decided.")
+  add_match_arguments(parser)
+  parser.add_argument("--processes", type=int, default=Engine.MAX_NUM_THREADS, help="amount of concurrent pairs of games (default: %(default)s)")
+  args = parser.parse_args(argv)
+  first, second, openings, sprt = setup_match(parser, args)
+  first_stats, second_stats = SideStats(), SideStats()
+  with ProcessPoolExecutor(args.processes) as pool:
+    pending: set[Future[tuple[list[float], SideStats, SideStats]]] = set()
+    next_opening = 0
+    while sprt.decision() is None and (pending or next_opening < len(openings)):
+      while len(pending) < args.processes and next_opening < len(openings):
+        pending.add(pool.submit(play_pair, first, second, openings[next_opening], args.depth, args.time, args.max_turns))
+        next_opening += 1
+      done, pending = wait(pending, return_when=FIRST_COMPLETED)
+      for future in done:
+        scores, pair_first, pair_second = future.result()
+        for score in scores:
+          sprt.add(score)
+        first_stats += pair_first
+        second_stats += pair_second
+      print_progress(sprt)
+    pool.shutdown(cancel_futures=True)
+  print_summary(sprt, first, first_stats, second, second_stats)
+
+if __name__ == "__main__":
+  # Needed by frozen executables to run the worker processes.
+  freeze_support()
+  main()
@@ -0,0 +1,22 @@
+import sys
+import argparse
+from typing import Optional
+from ai.database import RUN_SIZE, PositionDatabase, build_database
+
+def main(argv: Optional[list[str]] = None) -> None:
+  """
+  Runs the position database builder command line interface.
+
+  :param argv: Command line arguments, defaults to the ones of the process.
+  :type argv: Optional[list[str]], optional
+  """
+  parser = argparse.ArgumentParser(description="Builds a memory-mapped database of the positions of a game collection, with the results of the games after each move played from them.")
+  parser.add_argument("records", nargs="+", help="game record files, such as the ones written by the importer")
+  parser.add_argument("--output", default="positions.db", help="file where the database is written (default: %(default)s)")
+  parser.add_argument("--run-size", type=int, default=RUN_SIZE, help="moves sorted in memory at once, bounding memory to about 40 bytes each (default: %(default)s)")
+  args = parser.parse_args(argv)
+  build_database(args.records, args.output, args.run_size)
+  print(f"Entries: {len(PositionDatabase(args.output))}", file=sys.stderr)
+
+if __name__ == "__main__":
+  main()
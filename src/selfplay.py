@@ -0,0 +1,261 @@
+import os
+import sys
+import argparse
+from multiprocessing import freeze_support
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from random import Random as RandomGenerator
+from dataclasses import dataclass
+from typing import Final, Optional
+import numpy as np
+from core.enums import GameType, GameState, PlayerColor, Strategy
+from core.board import Board
+from core.planes import plane_shape, to_planes
+from ai.table import SearchTables
+from ai.telemetry import CallbackSink, IterationStats
+from engine import Engine
+
+@dataclass(frozen=True)
+class SelfPlayConfig:
+  """
+  Settings shared by every self-play game.
+  """
+  output: str
+  """
+  Directory where shards are written.
+  """
+  game_type: str = "Base+MLP"
+  white: Strategy = Strategy.NEGAMAX
+  black: Strategy = Strategy.NEGAMAX
+  max_depth: int = 2
+  time_limit: float = 0
+  max_branching_factor: int = Engine.DEFAULT_MAX_BRANCHING_FACTOR
+  hash_size: int = 16
+  """
+  Memory budget (in megabytes) of the caches of each game, bounding the memory of each worker process.
+  """
+  random_plies: int = 2
+  """
+  Amount of random moves opening each game, so that searches don't replay the same game over and over.
+  """
+  max_turns: int = 200
+  """
+  Amount of turns after which unfinished games are adjudicated as draws.
+  """
+  shard_size: int = 1024
+  """
+  Amount of positions of each shard.
+  """
+  seed: int = 0
+
+class ShardWriter:
+  """
+  | Streams self-play positions into rotating compressed `.npz` shards.
+  | Positions are written into buffers preallocated for a whole shard, which is flushed to disk as soon as it's full, so memory doesn't grow with the amount of games.
+  | Each shard holds, for every position, its planes (see `core.planes.to_planes`), evaluation features, search score and chosen move from the point of view of the player to move, along with its game id, ply and color.
+  | Results are written to the shard open when each game ends, as `result_game_ids` and `results` (`1` if White won, `-1` if Black won, `0` otherwise), and are joined with positions by game id.
+  """
+
+  def __init__(self, directory: str, prefix: str, game_type: GameType, shard_size: int) -> None:
+    """
+    Shard writer instantiation.
+
+    :param directory: Directory where shards are written.
+    :type directory: str
+    :param prefix: Prefix of the shard file names, followed by the shard index.
+    :type prefix: str
+    :param game_type: Game type of every position.
+    :type game_type: GameType
+    :param shard_size: Amount of positions of each shard.
+    :type shard_size: int
+    """
+    self._directory: Final[str] = directory
+    self._prefix: Final[str] = prefix
+    self._shard_size: Final[int] = shard_size
+    # Planes only hold small integers, so they're kept as bytes, which also compress better.
+    self._planes: Final[np.ndarray] = np.zeros((shard_size, *plane_shape(game_type)), dtype=np.uint8)
+    self._features: Final[np.ndarray] = np.zeros((shard_size, len(Board.EVALUATION_FEATURES)), dtype=np.int16)
+    self._scores: Final[np.ndarray] = np.zeros(shard_size, dtype=np.float32)
+    self._game_ids: Final[np.ndarray] = np.zeros(shard_size, dtype=np.int64)
+    self._plies: Final[np.ndarray] = np.zeros(shard_size, dtype=np.int16)
+    self._colors: Final[np.ndarray] = np.zeros(shard_size, dtype=np.int8)
+    self._moves: list[str] = []
+    self._results: list[tuple[int, int]] = []
+    self._size: int = 0
+    self.shards: int = 0
+    """
+    Amount of shards written so far.
+    """
+    self.positions: int = 0
+    """
+    Amount of positions written so far, including the ones of the shard still open.
+    """
+
+  def add_position(self, game_id: int, board: Board, score: float, move: str) -> None:
+    """
+    Adds a position, before playing the move chosen for it.
+
+    :param game_id: Id of the game.
+    :type game_id: int
+    :param board: Playing board.
+    :type board: Board
+    :param score: Search score, from the point of view of the player to move, NaN if unknown.
+    :type score: float
+    :param move: MoveString of the chosen move.
+    :type move: str
+    """
+    index = self._size
+    to_planes(board, self._planes[index])
+    self._features[index] = board.evaluation_features(board.current_player_color)
+    self._scores[index] = score
+    self._game_ids[index] = game_id
+    self._plies[index] = board.turn
+    self._colors[index] = board.current_player_color is PlayerColor.BLACK
+    self._moves.append(move)
+    self._size += 1
+    self.positions += 1
+    if self._size == self._shard_size:
+      self.flush()
+
+  def add_result(self, game_id: int, state: GameState) -> None:
+    """
+    Adds the result of a game.
+
+    :param game_id: Id of the game.
+    :type game_id: int
+    :param state: Final state of the game.
+    :type state: GameState
+    """
+    self._results.append((game_id, 1 if state is GameState.WHITE_WINS else -1 if state is GameState.BLACK_WINS else 0))
+
+  def flush(self) -> None:
+    """
+    | Writes the open shard, if it's not empty, and starts a new one.
+    | Shards are first written to a temporary file and then renamed, so interrupted runs never leave truncated shards.
+    """
+    if self._size or self._results:
+      path = os.path.join(self._directory, f"{self._prefix}-{self.shards:03}.npz")
+      size = self._size
+      with open(f"{path}.tmp", "wb") as file:
+        np.savez_compressed(
+          file,
+          planes=self._planes[:size],
+          features=self._features[:size],
+          scores=self._scores[:size],
+          moves=np.array(self._moves, dtype=np.str_),
+          game_ids=self._game_ids[:size],
+          plies=self._plies[:size],
+          colors=self._colors[:size],
+          result_game_ids=np.array([game_id for game_id, _ in self._results], dtype=np.int64),
+          results=np.array([result for _, result in self._results], dtype=np.int8)
+        )
+      os.replace(f"{path}.tmp", path)
+      self.shards += 1
+      self._size = 0
+      self._moves = []
+      self._results = []
+
+  def close(self) -> None:
+    """
+    Writes the last shard.
+    """
+    self.flush()
+
+def play_games(config: SelfPlayConfig, task: int, first_game: int, games: int) -> tuple[int, int]:
+  """
+  | Plays a batch of self-play games, streaming them to the shards of the task.
+  | Runs on worker processes.
+
+  :param config: Self-play settings.
+  :type config: SelfPlayConfig
+  :param task: Index of the task, naming its shards.
+  :type task: int
+  :param first_game: Id of the first game.
+  :type first_game: int
+  :param games: Amount of games.
+  :type games: int
+  :return: Amount of positions and shards written.
+  :rtype: tuple[int, int]
+  """
+  writer = ShardWriter(config.output, f"selfplay-{task:05}", GameType.parse(config.game_type), config.shard_size)
+  for game_id in range(first_game, first_game + games):
+    _play_game(config, game_id, writer)
+  writer.close()
+  return writer.positions, writer.shards
+
+def _play_game(config: SelfPlayConfig, game_id: int, writer: ShardWriter) -> None:
+  """
+  Plays a single self-play game.
+
+  :param config: Self-play settings.
+  :type config: SelfPlayConfig
+  :param game_id: Id of the game, also seeding its random opening.
+  :type game_id: int
+  :param writer: Writer of the positions.
+  :type writer: ShardWriter
+  """
+  tables = SearchTables(config.hash_size)
+  board = Board(config.game_type, tables.max_snapshots)
+  brains = {PlayerColor.WHITE: Engine.BRAINS[config.white](tables), PlayerColor.BLACK: Engine.BRAINS[config.black](tables)}
+  score: list[float] = [float('nan')]
+  def record(stats: IterationStats) -> None:
+    score[0] = stats.score
+  for brain in brains.values():
+    brain.telemetry = CallbackSink(record)
+  rng = RandomGenerator(config.seed * 1_000_003 + game_id)
+  while not board.gameover and board.turn < config.max_turns:
+    if board.turn < config.random_plies:
+      # Valid moves come in no particular order, so they're sorted to get the same openings in every process.
+      board.play(rng.choice(sorted(board.valid_moves.split(";"))))
+    else:
+      score[0] = float('nan')
+      move = brains[board.current_player_color].find_best_move(board, config.max_branching_factor, config.max_depth, config.time_limit)
+      writer.add_position(game_id, board, score[0], move)
+      board.play(move)
+  writer.add_result(game_id, board.state)
+  for brain in brains.values():
+    brain.close()
+  tables.close()
+
+def main(argv: Optional[list[str]] = None) -> None:
+  """
+  | Runs the self-play command line interface.
+  | Games are split into tasks of a few games each, played concurrently by a pool of worker processes, each recycled after its task to keep memory bounded.
+
+  :param argv: Command line arguments, defaults to the ones of the process.
+  :type argv: Optional[list[str]], optional
+  """
+  parser = argparse.ArgumentParser(description="Plays engine games against each other, streaming positions, search scores, chosen moves and results into compressed .npz shards.")
+  parser.add_argument("output", help="directory where shards are written")
+  parser.add_argument("--games", type=int, default=100, help="amount of games (default: %(default)s)")
+  parser.add_argument("--processes", type=int, default=Engine.MAX_NUM_THREADS, help="amount of concurrent games (default: %(default)s)")
+  parser.add_argument("--games-per-task", type=int, default=8, help="amount of games played by a worker process before being recycled (default: %(default)s)")
+  parser.add_argument("--game-type", default=SelfPlayConfig.game_type, help="GameTypeString (default: %(default)s)")
+  parser.add_argument("--white", type=Strategy, choices=list(Strategy), default=SelfPlayConfig.white, help="White strategy (default: %(default)s)")
+  parser.add_argument("--black", type=Strategy, choices=list(Strategy), default=SelfPlayConfig.black, help="Black strategy (default: %(default)s)")
+  parser.add_argument("--depth", type=int, default=SelfPlayConfig.max_depth, help="maximum depth of each search, 0 for no limit (default: %(default)s)")
+  parser.add_argument("--time", type=float, default=SelfPlayConfig.time_limit, help="maximum time (in seconds) of each search, 0 for no limit (default: %(default)s)")
+  parser.add_argument("--max-branching-factor", type=int, default=SelfPlayConfig.max_branching_factor, help="maximum branching factor (default: %(default)s)")
+  parser.add_argument("--hash-size", type=int, default=SelfPlayConfig.hash_size, help="memory budget (in megabytes) of the caches of each game (default: %(default)s)")
+  parser.add_argument("--random-plies", type=int, default=SelfPlayConfig.random_plies, help="amount of random opening moves (default: %(default)s)")
+  parser.add_argument("--max-turns", type=int, default=SelfPlayConfig.max_turns, help="turns after which games are adjudicated as draws (default: %(default)s)")
+  parser.add_argument("--shard-size", type=int, default=SelfPlayConfig.shard_size, help="positions of each shard (default: %(default)s)")
+  parser.add_argument("--seed", type=int, default=SelfPlayConfig.seed, help="seed of the random openings (default: %(default)s)")
+  args = parser.parse_args(argv)
+  if not args.depth and not args.time:
+    parser.error("at least one of --depth and --time is needed")
+  GameType.parse(args.game_type)
+  os.makedirs(args.output, exist_ok=True)
+  config = SelfPlayConfig(args.output, args.game_type, args.white, args.black, args.depth, args.time, args.max_branching_factor, args.hash_size, args.random_plies, args.max_turns, args.shard_size, args.seed)
+  positions = games = 0
+  with ProcessPoolExecutor(args.processes, max_tasks_per_child=1) as pool:
+    futures = {pool.submit(play_games, config, task, first_game, min(args.games_per_task, args.games - first_game)): min(args.games_per_task, args.games - first_game) for task, first_game in enumerate(range(0, args.games, args.games_per_task))}
+    for future in as_completed(futures):
+      task_positions, _ = future.result()
+      positions += task_positions
+      games += futures[future]
+      print(f"Games: {games}/{args.games}; Positions: {positions}", file=sys.stderr, flush=True)
+
+if __name__ == "__main__":
+  # Needed by frozen executables to run the worker processes.
+  freeze_support()
+  main()
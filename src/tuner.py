@@ -0,0 +1,149 @@
+import sys
+import argparse
+from typing import Final, Optional
+import numpy as np
+from numpy.typing import NDArray
+from core.board import Board
+from ai.brain import AlphaBetaPruner
+
+SCALES: Final[NDArray[np.float64]] = np.geomspace(1e-3, 1, 61)
+"""
+Candidate scales turning evaluations into win probabilities, see `fit_scale`.
+"""
+
+def load_corpus(paths: list[str]) -> tuple[NDArray[np.float64], NDArray[np.float64]]:
+  """
+  | Loads the evaluation features of the positions of the given self-play shards, along with the outcome of their game, in bulk.
+  | Results are joined with positions by game id, so the shards should come from the same self-play run. Positions of games without a result are dropped.
+
+  :param paths: Paths of the shards.
+  :type paths: list[str]
+  :return: Features of each position, from the point of view of the player to move, and the outcome of its game for that player (`1` for a win, `0.5` for a draw, `0` for a loss).
+  :rtype: tuple[NDArray[np.float64], NDArray[np.float64]]
+  """
+  features: list[NDArray[np.int16]] = []
+  game_ids: list[NDArray[np.int64]] = []
+  colors: list[NDArray[np.int8]] = []
+  result_game_ids: list[NDArray[np.int64]] = []
+  results: list[NDArray[np.int8]] = []
+  for path in paths:
+    with np.load(path) as shard:
+      features.append(shard["features"])
+      game_ids.append(shard["game_ids"])
+      colors.append(shard["colors"])
+      result_game_ids.append(shard["result_game_ids"])
+      results.append(shard["results"])
+  all_game_ids = np.concatenate(game_ids)
+  order = np.argsort(ids := np.concatenate(result_game_ids))
+  sorted_ids = ids[order]
+  indices = np.minimum(np.searchsorted(sorted_ids, all_game_ids), len(sorted_ids) - 1)
+  known = sorted_ids[indices] == all_game_ids if len(sorted_ids) else np.zeros(len(all_game_ids), dtype=bool)
+  # Results are from White's point of view, so they're flipped for positions with Black to move.
+  outcomes = np.concatenate(results)[order][indices[known]] * np.where(np.concatenate(colors)[known] == 1, -1, 1)
+  return np.concatenate(features)[known].astype(np.float64), (outcomes + 1) / 2
+
+def texel_loss(weights: NDArray[np.float64], features: NDArray[np.float64], targets: NDArray[np.float64], scale: float) -> float:
+  """
+  Computes the mean squared error between the outcomes and the win probabilities predicted by the weighted evaluation.
+
+  :param weights: Evaluation weights.
+  :type weights: NDArray[np.float64]
+  :param features: Features of each position.
+  :type features: NDArray[np.float64]
+  :param targets: Outcome of each position.
+  :type targets: NDArray[np.float64]
+  :param scale: Scale turning evaluations into win probabilities.
+  :type scale: float
+  :return: Loss.
+  :rtype: float
+  """
+  return float(np.mean((targets - _sigmoid(scale * features @ weights)) ** 2))
+
+def fit_scale(features: NDArray[np.float64], targets: NDArray[np.float64], weights: NDArray[np.float64]) -> float:
+  """
+  | Finds the scale that best turns the evaluations of the given weights into win probabilities.
+  | Fitting it once, before tuning, keeps the tuned weights in the same units as the current ones.
+
+  :param features: Features of each position.
+  :type features: NDArray[np.float64]
+  :param targets: Outcome of each position.
+  :type targets: NDArray[np.float64]
+  :param weights: Evaluation weights.
+  :type weights: NDArray[np.float64]
+  :return: Scale.
+  :rtype: float
+  """
+  return float(min(SCALES, key=lambda scale: texel_loss(weights, features, targets, scale)))
+
+def tune(features: NDArray[np.float64], targets: NDArray[np.float64], weights: NDArray[np.float64], scale: float, iterations: int = 1000, learning_rate: float = 0.05) -> NDArray[np.float64]:
+  """
+  | Tunes the evaluation weights by minimizing `texel_loss` with Adam, computing the loss gradient over the whole corpus at once.
+  | Weights are optimized in units of the scaled evaluation, which makes the learning rate independent from the scale.
+
+  :param features: Features of each position.
+  :type features: NDArray[np.float64]
+  :param targets: Outcome of each position.
+  :type targets: NDArray[np.float64]
+  :param weights: Initial evaluation weights.
+  :type weights: NDArray[np.float64]
+  :param scale: Scale turning evaluations into win probabilities.
+  :type scale: float
+  :param iterations: Amount of optimization steps, defaults to `1000`.
+  :type iterations: int, optional
+  :param learning_rate: Adam learning rate, defaults to `0.05`.
+  :type learning_rate: float, optional
+  :return: Tuned weights.
+  :rtype: NDArray[np.float64]
+  """
+  scaled = weights * scale
+  first_moment = np.zeros_like(scaled)
+  second_moment = np.zeros_like(scaled)
+  for step in range(1, iterations + 1):
+    predictions = _sigmoid(features @ scaled)
+    gradient = features.T @ (-2 * (targets - predictions) * predictions * (1 - predictions)) / len(targets)
+    first_moment = 0.9 * first_moment + 0.1 * gradient
+    second_moment = 0.999 * second_moment + 0.001 * gradient ** 2
+    scaled -= learning_rate * (first_moment / (1 - 0.9 ** step)) / (np.sqrt(second_moment / (1 - 0.999 ** step)) + 1e-8)
+  return scaled / scale
+
+def _sigmoid(values: NDArray[np.float64]) -> NDArray[np.float64]:
+  """
+  Logistic function.
+
+  :param values: Values.
+  :type values: NDArray[np.float64]
+  :return: Logistic of each value.
+  :rtype: NDArray[np.float64]
+  """
+  return 1 / (1 + np.exp(-values))
+
+def main(argv: Optional[list[str]] = None) -> None:
+  """
+  Runs the tuner command line interface.
+
+  :param argv: Command line arguments, defaults to the ones of the process.
+  :type argv: Optional[list[str]], optional
+  """
+  parser = argparse.ArgumentParser(description="Tunes the evaluation weights of negamax agents against the outcomes of self-play games (Texel's tuning method).")
+  parser.add_argument("shards", nargs="+", help="self-play shards, from the same run")
+  parser.add_argument("--output", default="weights.json", help="file where the tuned weights are written, loaded by the engine at startup when in its working directory (default: %(default)s)")
+  parser.add_argument("--weights", help="file with the initial weights (default: the built-in ones)")
+  parser.add_argument("--iterations", type=int, default=1000, help="amount of optimization steps (default: %(default)s)")
+  parser.add_argument("--learning-rate", type=float, default=0.05, help="Adam learning rate (default: %(default)s)")
+  args = parser.parse_args(argv)
+  if args.weights:
+    AlphaBetaPruner.load_weights(args.weights)
+  features, targets = load_corpus(args.shards)
+  if not targets.size:
+    parser.error("no positions with a known result")
+  weights = np.array(AlphaBetaPruner.EVALUATION_WEIGHTS, dtype=np.float64)
+  scale = fit_scale(features, targets, weights)
+  print(f"Positions: {len(targets)}; Scale: {scale:.4f}; Loss: {texel_loss(weights, features, targets, scale):.6f}", file=sys.stderr)
+  weights = tune(features, targets, weights, scale, args.iterations, args.learning_rate)
+  print(f"Tuned loss: {texel_loss(weights, features, targets, scale):.6f}", file=sys.stderr)
+  for name, weight in zip(Board.EVALUATION_FEATURES, weights):
+    print(f"{name}: {weight:.3f}", file=sys.stderr)
+  AlphaBetaPruner.save_weights(args.output, tuple(weights.tolist()))
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,14 @@
+import random
+from typing import Callable
+import pytest
+from core.board import Board
+
+@pytest.fixture
+def random_game() -> Callable[..., Board]:
+  def play(seed: int, max_turns: int = 60) -> Board:
+    rng = random.Random(seed)
+    board = Board("Base+MLP")
+    while not board.gameover and board.turn < max_turns:
+      board.play(rng.choice(sorted(board.valid_moves.split(";"))))
+    return board
+  return play
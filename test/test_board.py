@@ -1,5 +1,8 @@
+import random
 import pytest
 from core.board import Board
+from core.enums import GameState, PlayerColor, BugType, Direction
+from core.game import Bug
 
 class TestBoard:
   def test_hash(self):
@@ -42,5 +45,95 @@ class TestBoard:
     hash12 = board.hash()
     assert hash12 == 0
 
+  def test_undo_simulated_move(self):
+    gamestring = "Base;InProgress;White[3];wS1;bS1 wS1-;wQ -wS1;bQ bS1-"
+    board = Board(gamestring)
+    board.play_parsed(next(iter(board.calculate_valid_moves())))
+    board.undo()
+    assert str(board) == gamestring
+
+  def test_repetition_draw(self):
+    board = Board("Base;InProgress;White[3];wS1;bS1 wS1-;wQ -wS1;bQ bS1-")
+    for _ in range(2):
+      for move in ("wQ \\wS1", "bQ bS1\\", "wQ -wS1", "bQ bS1-"):
+        board.play(move)
+    # The starting position came up a third time.
+    assert board.state is GameState.DRAW and board.gameover
+    with pytest.raises(ValueError):
+      board.play("wQ \\wS1")
+    board.undo()
+    assert board.state is GameState.IN_PROGRESS and not board.gameover
+
+  def test_evaluation_features(self):
+    random.seed(0)
+    board = Board("Base+MLP")
+    for _ in range(60):
+      if board.gameover:
+        break
+      board.play_parsed(random.choice(list(board.calculate_valid_moves())) if board.calculate_valid_moves() else None)
+      for color in PlayerColor:
+        in_play = [bug for bug in board._bug_to_pos if bug.color is color and board.pos_from_bug(bug)]
+        pinned = [bug for bug in in_play if board.bugs_from_pos(board.pos_from_bug(bug))[-1] != bug]
+        assert board.pieces_in_play(color) == len(in_play)
+        features = board.evaluation_features(color)
+        assert len(features) == len(Board.EVALUATION_FEATURES)
+        assert features[2:5] == (len(in_play), board.pieces_in_play(color.opposite), len(pinned))
+        assert features[5] == board.evaluation_features(color.opposite)[4]
+    board.undo(len(board.moves))
+    for color in PlayerColor:
+      assert board.evaluation_features(color) == (0,) * len(Board.EVALUATION_FEATURES)
+
+  def test_queen_neighbors(self):
+    # Moves are sorted to keep the game the same regardless of hash randomization.
+    random.seed(253)
+    board = Board("Base+MLP")
+    for _ in range(60):
+      if board.gameover:
+        break
+      board.play(random.choice(sorted(board.valid_moves.split(";"))))
+      for color in PlayerColor:
+        queen = board.pos_from_bug(Bug(color, BugType.QUEEN_BEE))
+        assert board.queen_neighbors_by_color(color) == (sum(bool(board.bugs_from_pos(board._get_neighbor(queen, direction))) for direction in Direction) if queen else 0)
+
+  def test_snapshots(self):
+    board = Board("Base+MLP;InProgress;White[3];wG1;bG1 wG1-;wQ -wG1;bQ bG1-", 2)
+    for move in sorted(board.calculate_valid_moves(), key=str)[:3]:
+      board.play_parsed(move)
+      board.calculate_valid_moves()
+      board.undo()
+    assert len(board._snapshots) == 2
+    board.calculate_valid_moves()
+    assert board.move_cache_hits == 0
+    board.play_parsed(move)
+    board.calculate_valid_moves()
+    assert board.move_cache_hits == 1
+
+  def test_playout(self):
+    board = Board("Base+MLP;InProgress;White[3];wG1;bG1 wG1-;wQ -wG1;bQ bG1-")
+    gamestring, node_hash, features = str(board), board.hash(), board.evaluation_features(PlayerColor.WHITE)
+    rng = random.Random(1)
+    for _ in range(10):
+      turns = board.playout(20, rng)
+      assert 0 < turns <= 20
+      board.undo_playout(turns)
+      assert str(board) == gamestring
+      assert board.hash() == node_hash
+      assert board.evaluation_features(PlayerColor.WHITE) == features
+
+  def test_evaluation_features_delta(self):
+    random.seed(1)
+    board = Board("Base+MLP")
+    for _ in range(40):
+      if board.gameover:
+        break
+      color = board.current_player_color
+      features = board.evaluation_features(color)
+      for move in board.calculate_valid_moves():
+        delta = board.evaluation_features_delta(move)
+        board.play_parsed(move)
+        assert tuple(after - before for after, before in zip(board.evaluation_features(color), features)) == delta
+        board.undo()
+      board.play(random.choice(board.valid_moves.split(";")))
+
 if __name__ == "__main__":
   pytest.main()
@@ -0,0 +1,85 @@
+import pytest
+from core.board import Board
+from ai.brain import AlphaBetaPruner
+from ai.table import SearchTables
+
+def _negamax(brain: AlphaBetaPruner, board: Board, depth: int) -> float:
+  if depth == 0 or board.gameover:
+    return brain._evaluate(board)
+  best_value = float('-inf')
+  for move in list(board.calculate_valid_moves()):
+    board.play_parsed(move)
+    best_value = max(best_value, -_negamax(brain, board, depth - 1))
+    board.undo()
+  return best_value
+
+class TestAlphaBetaPruner:
+  @pytest.mark.parametrize("gamestring", [
+    "Base+MLP;InProgress;White[3];wG1;bG1 wG1-;wQ -wG1;bQ bG1-",
+    "Base;InProgress;Black[4];wS1;bS1 wS1-;wQ -wS1;bQ bS1-;wG1 /wQ;bG1 bQ\\;wA1 \\wS1",
+  ])
+  def test_search_matches_negamax(self, gamestring: str):
+    reference = AlphaBetaPruner()
+    expected = _negamax(reference, Board(gamestring), 2)
+    brain = AlphaBetaPruner()
+    for guess in (None, expected, expected - 50, expected + 50):
+      brain.reset()
+      _, value = brain._aspiration_search(Board(gamestring), 256, 2, guess)
+      assert value == expected
+
+  def test_search_root_moves(self):
+    board = Board("Base+MLP;InProgress;White[3];wG1;bG1 wG1-;wQ -wG1;bQ bG1-")
+    brain = AlphaBetaPruner()
+    move, value, completed, _ = brain._search_root_moves(board, list(board.calculate_valid_moves()), 256, 2, 0)
+    # The root loop must keep the move that's best for the player to move, not the one best for the opponent.
+    assert completed and value == _negamax(brain, board, 2)
+    board.play_parsed(move)
+    assert -_negamax(brain, board, 1) == value
+
+  def test_parallel_search(self):
+    gamestring = "Base+MLP;InProgress;White[3];wG1;bG1 wG1-;wQ -wG1;bQ bG1-"
+    serial = AlphaBetaPruner()
+    brain = AlphaBetaPruner()
+    try:
+      assert brain.find_best_move(Board(gamestring), 256, 2, num_threads=2) == serial.find_best_move(Board(gamestring), 256, 2)
+      # Deeper, several root moves tie, so any of them is as good as the serial choice.
+      moves = [brain.find_best_move(Board(gamestring), 256, 3, num_threads=2), serial.find_best_move(Board(gamestring), 256, 3)]
+    finally:
+      brain.close()
+    values = []
+    for move in moves:
+      board = Board(gamestring)
+      board.play(move)
+      values.append(-_negamax(serial, board, 2))
+    assert values[0] == values[1]
+
+  def test_reductions_and_pruning(self):
+    board = Board("Base;InProgress;White[3];wS1;bS1 wS1-;wQ -wS1;bQ bS1-")
+    gamestring = str(board)
+    brain = AlphaBetaPruner()
+    move = brain.find_best_move(board, 256, 4, late_move_reductions=True, null_move_pruning=True)
+    assert str(board) == gamestring
+    assert move in board.valid_moves.split(";")
+    plain = AlphaBetaPruner()
+    plain.find_best_move(board, 256, 4)
+    assert brain._visited_nodes < plain._visited_nodes
+
+  def test_time_limit(self):
+    board = Board("Base+MLP;InProgress;White[3];wG1;bG1 wG1-;wQ -wG1;bQ bG1-")
+    brain = AlphaBetaPruner()
+    move = brain.find_best_move(board, 256, time_limit=0.2)
+    assert move in board.valid_moves.split(";")
+    assert brain._clock.elapsed < 0.5
+
+  def test_shared_tables(self):
+    board = Board("Base+MLP;InProgress;White[3];wG1;bG1 wG1-;wQ -wG1;bQ bG1-")
+    tables = SearchTables(4)
+    white, black = AlphaBetaPruner(tables), AlphaBetaPruner(tables)
+    move = white.find_best_move(board, 256, 3)
+    # The other brain finds the whole search in the shared transposition table.
+    assert black.find_best_move(board, 256, 3) == move
+    assert black._visited_nodes < white._visited_nodes
+    white.close()
+    black.close()
+    assert tables.transpos_table[board.hash()] is not None
+    tables.close()
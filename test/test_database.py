@@ -0,0 +1,28 @@
+import pytest
+from core.board import Board
+from core.enums import GameState
+from core.record import GameRecord, RecordWriter
+from ai.database import PositionDatabase, build_database
+
+class TestDatabase:
+  @pytest.mark.parametrize("run_size", [7, 1 << 10])
+  def test_build(self, tmp_path, run_size, random_game):
+    games = [random_game(seed % 5, 12) for seed in range(10)]
+    results = [GameState.WHITE_WINS, GameState.DRAW, GameState.BLACK_WINS, GameState.IN_PROGRESS, GameState.WHITE_WINS]
+    with RecordWriter(str(tmp_path / "games.hgr")) as writer:
+      for index, board in enumerate(games):
+        writer.write(GameRecord.from_board(board, results[index % 5]))
+    build_database([str(tmp_path / "games.hgr")], str(tmp_path / "positions.db"), run_size)
+    database = PositionDatabase(str(tmp_path / "positions.db"))
+    start = Board("Base+MLP")
+    assert database.counts(start.hash()) == (4, 2, 2)
+    moves = database.moves(start)
+    assert sum(sum(stats[1:]) for stats in moves) == 8
+    assert {stats[0] for stats in moves} == {board.move_strings[0] for board in games}
+    board = Board("Base+MLP")
+    for move in games[0].move_strings[:5]:
+      board.play(move)
+    assert database.moves(board)[0][0] == games[0].move_strings[5]
+    assert database.counts(0xDEADBEEF) == (0, 0, 0)
+    with pytest.raises(ValueError):
+      PositionDatabase(str(tmp_path / "games.hgr"))
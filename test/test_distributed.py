@@ -0,0 +1,87 @@
+import json
+import gc
+import socket
+import warnings
+import pytest
+from threading import Thread
+from match import SPRT, PlayerConfig, make_openings
+from distributed import MatchSettings, Coordinator, Worker
+
+SETTINGS = MatchSettings(PlayerConfig("A"), PlayerConfig("B", (("LateMoveReductions", "False"),)), 1, 0, 6)
+OPENINGS = make_openings("Base+MLP", 4, 2, 1)
+
+def start_workers(port: int, count: int) -> tuple[list[Worker], list[Thread]]:
+  workers = [Worker(port=port, processes=1, reconnect_timeout=30) for _ in range(count)]
+  threads = [Thread(target=worker.run) for worker in workers]
+  for thread in threads:
+    thread.start()
+  return workers, threads
+
+class TestDistributed:
+  def test_workers(self, tmp_path):
+    journal = str(tmp_path / "match.jsonl")
+    coordinator = Coordinator(SETTINGS, OPENINGS, SPRT(), journal)
+    coordinator.start()
+    workers, threads = start_workers(coordinator.address[1], 2)
+    assert coordinator.wait(120)
+    for thread in threads:
+      thread.join(30)
+    coordinator.close()
+    assert coordinator.sprt.games == 2 * len(OPENINGS)
+    assert sum(worker.played for worker in workers) == len(OPENINGS)
+    assert coordinator.first_stats.moves == coordinator.second_stats.moves == 4 * len(OPENINGS)
+    assert list(coordinator.first_stats.time_to_depth()) == [1]
+    with open(journal, encoding="utf-8") as file:
+      assert len(file.readlines()) == len(OPENINGS) + 1
+    resumed = Coordinator(SETTINGS, OPENINGS, SPRT(), journal)
+    assert resumed.finished
+    assert (resumed.sprt.wins, resumed.sprt.draws, resumed.sprt.losses) == (coordinator.sprt.wins, coordinator.sprt.draws, coordinator.sprt.losses)
+    assert resumed.first_stats == coordinator.first_stats
+    resumed.close()
+    with pytest.raises(ValueError):
+      Coordinator(SETTINGS, OPENINGS[:2], SPRT(), journal)
+
+  def test_reconnect(self):
+    with socket.socket() as probe:
+      probe.bind(("127.0.0.1", 0))
+      port = probe.getsockname()[1]
+    # The worker starts first, and keeps trying until the coordinator is up.
+    workers, threads = start_workers(port, 1)
+    coordinator = Coordinator(SETTINGS, OPENINGS, SPRT(), port=port)
+    coordinator.start()
+    # Pairs leased to a dropped connection are handed out again.
+    with socket.create_connection(coordinator.address) as connection, connection.makefile("rw", encoding="utf-8") as stream:
+      for message in ({"type": "hello"}, {"type": "request", "count": len(OPENINGS)}):
+        stream.write(json.dumps(message) + "\n")
+        stream.flush()
+        answer = json.loads(stream.readline())
+    assert answer["type"] in ("jobs", "wait")
+    assert coordinator.wait(120)
+    threads[0].join(30)
+    coordinator.close()
+    assert coordinator.sprt.games == 2 * len(OPENINGS)
+    assert workers[0].played == len(OPENINGS)
+
+  def test_failures(self):
+    # Pondering isn't supported in-process, so every pair fails.
+    settings = MatchSettings(PlayerConfig("A", (("Ponder", "True"),)), PlayerConfig("B"), 1, 0, 6)
+    coordinator = Coordinator(settings, OPENINGS[:2], SPRT(), max_failures=2)
+    coordinator.start()
+    workers, threads = start_workers(coordinator.address[1], 1)
+    assert coordinator.wait(120)
+    threads[0].join(30)
+    coordinator.close()
+    assert coordinator.dropped == {0, 1}
+    assert coordinator.sprt.games == 0 and workers[0].played == 0
+
+  def test_busy_port(self, tmp_path):
+    journal = str(tmp_path / "match.jsonl")
+    coordinator = Coordinator(SETTINGS, OPENINGS, SPRT())
+    with warnings.catch_warnings(record=True) as caught:
+      warnings.simplefilter("always", ResourceWarning)
+      with pytest.raises(OSError):
+        Coordinator(SETTINGS, OPENINGS, SPRT(), journal, port=coordinator.address[1])
+      gc.collect()
+    coordinator.close()
+    # The journal is closed when the address can't be bound, instead of being left to the garbage collector.
+    assert not [warning for warning in caught if issubclass(warning.category, ResourceWarning)]
@@ -0,0 +1,49 @@
+import io
+import pytest
+from time import time
+from core.board import Board
+from core.enums import PlayerColor
+from engine import Engine
+
+GAMESTRING = "Base+MLP;InProgress;White[3];wG1;bG1 wG1-;wQ -wG1;bQ bG1-"
+
+def _run(monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str], commands: list[str]) -> list[str]:
+  monkeypatch.setattr("sys.stdin", io.StringIO("".join(f"{command}\n" for command in commands)))
+  Engine().start()
+  return capsys.readouterr().out.split("ok\n")
+
+class TestEngine:
+  def test_responses(self, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]):
+    responses = _run(monkeypatch, capsys, [f"newgame {GAMESTRING}", "bestmove depth 1", "bestmove nodes 1", "stop", "exit"])
+    # One response for the greeting and each command, every one closed by 'ok'.
+    assert len(responses) == 7 and not responses[-1]
+    assert responses[1] == f"{GAMESTRING}\n"
+    assert responses[2].splitlines()[-1] in Board(GAMESTRING).valid_moves.split(";")
+    assert responses[3].startswith("err ")
+    assert responses[4] == ""
+
+  def test_stop(self, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]):
+    start = time()
+    responses = _run(monkeypatch, capsys, [f"newgame {GAMESTRING}", "bestmove time 00:01:00", "info", "stop", "exit"])
+    assert time() - start < 30
+    # 'info' is answered while searching, before the search is stopped.
+    assert responses[2].startswith("id HivemindEngine")
+    assert responses[3].splitlines()[-1] in Board(GAMESTRING).valid_moves.split(";")
+    assert responses[4] == "" and responses[5] == ""
+
+  def test_bestmove_stops_pondering(self, capsys: pytest.CaptureFixture[str]):
+    engine = Engine()
+    engine.newgame([GAMESTRING])
+    board = Board(GAMESTRING)
+    board.play(board.valid_moves.split(";")[0])
+    black = engine.brains[PlayerColor.BLACK]
+    black.find_best_move(board, engine.maxbranchingfactor, 2)
+    black.ponder(board, engine.maxbranchingfactor)
+    assert black._ponder_thread
+    # Both brains search with the same tables, so the other brain stops pondering too.
+    engine.bestmove("depth", "1")
+    assert not black._ponder_thread
+    engine.stop()
+    for brain in engine.brains.values():
+      brain.close()
+    capsys.readouterr()
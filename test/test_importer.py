@@ -0,0 +1,59 @@
+import zipfile
+import pytest
+from core.board import Board
+from core.enums import GameState
+from core.record import read_records
+from importer import parse_sgf, find_sources, read_games, main, _Replay
+
+MOVES = ["wS1", "bS1 wS1-", "wQ -wS1", "bQ bS1-", "wG1 -wQ", "bG1 bQ-"]
+
+def to_sgf(moves: list[str], swap: bool = False, ending: str = "") -> str:
+  lines = ["(;", "GM[27]VV[1]", "SU[hive-plm]", 'P0[id "first"]', 'P1[id "second"]', "; P0[0 Start P0]"]
+  for index, move in enumerate(moves):
+    if swap:
+      move = move.replace("w", "x").replace("b", "w").replace("x", "b")
+    piece, _, relative = move.partition(" ")
+    player = f"P{index % 2}"
+    action = f"dropb {piece} N {13 + index} {relative or '.'}" if index < 2 else f"move {'B' if swap == (index % 2 == 0) else 'W'} {piece} N {13 + index} {relative}"
+    lines.append(f"; {player}[{2 * index + 1} {action}]")
+    lines.append(f"; {player}[{2 * index + 2} done]")
+  lines.append(ending)
+  lines.append(")")
+  return "\n".join(lines)
+
+class TestImporter:
+  def test_parse(self):
+    gamestring = f"Base+MLP;InProgress;White[4];{';'.join(MOVES)}"
+    board, result = parse_sgf(to_sgf(MOVES))
+    assert str(board) == gamestring and result is GameState.IN_PROGRESS
+    board, result = parse_sgf(to_sgf(MOVES, True, "; P0[13 Resign P0]"))
+    assert str(board) == gamestring and result is GameState.BLACK_WINS
+    # The second player resigns before ever moving.
+    _, result = parse_sgf(to_sgf(MOVES[:1], ending="; P1[3 Resign P1]"))
+    assert result is GameState.WHITE_WINS
+    _, result = parse_sgf(to_sgf(MOVES[:1], ending="; P0[3 Resign P0]"))
+    assert result is GameState.BLACK_WINS
+    # Resigning before any move means being the first player.
+    replay = _Replay()
+    replay.resign("P1")
+    assert replay.result is GameState.BLACK_WINS
+    with pytest.raises(ValueError):
+      parse_sgf(to_sgf(MOVES[:2] + ["wQ bS1-"]))
+    with pytest.raises(ValueError):
+      parse_sgf(to_sgf(MOVES).replace("hive-plm", "chess"))
+
+  def test_import(self, tmp_path):
+    (tmp_path / "archive").mkdir()
+    (tmp_path / "archive" / "good.sgf").write_text(to_sgf(MOVES))
+    (tmp_path / "archive" / "bad.sgf").write_text(to_sgf(["wQ", "wQ"]))
+    with zipfile.ZipFile(tmp_path / "archive" / "more.zip", "w") as archive:
+      archive.writestr("games/swapped.sgf", to_sgf(MOVES, True, "; P1[13 AcceptDraw]"))
+    sources = list(find_sources([str(tmp_path / "archive")]))
+    assert len(sources) == 3
+    assert sum(game is None for _, game in read_games(sources)) == 1
+    main([str(tmp_path / "archive"), "--output", str(tmp_path / "records"), "--processes", "1", "--files-per-task", "2"])
+    records = [record for path in sorted((tmp_path / "records").iterdir()) for record in read_records(str(path))]
+    assert sorted(record.result for record in records) == sorted([GameState.IN_PROGRESS, GameState.DRAW])
+    assert all(str(record.replay()) == str(Board(f"Base+MLP;InProgress;White[4];{';'.join(MOVES)}")) for record in records)
+    main([str(tmp_path / "archive"), "--output", str(tmp_path / "text"), "--format", "gamestring", "--processes", "1"])
+    assert len((tmp_path / "text" / "import-00000.txt").read_text().splitlines()) == 2
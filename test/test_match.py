@@ -0,0 +1,70 @@
+import sys
+import pytest
+from pathlib import Path
+from core.board import Board
+from core.enums import GameState
+from match import SPRT, Player, PlayerConfig, InProcessPlayer, make_openings, play_game, play_pair
+
+ENGINE = str(Path(__file__).parents[1] / "src" / "engine.py")
+
+class ShufflingPlayer(Player):
+  """
+  Moves its queen back and forth, so that games between two of them end in a draw by repetition.
+  """
+
+  def __init__(self, moves: tuple[str, str]) -> None:
+    super().__init__(PlayerConfig("Shuffle"))
+    self.moves = moves
+
+  def new_game(self, gamestring: str) -> None:
+    pass
+
+  def play(self, move: str) -> None:
+    pass
+
+  def best_move(self, board: Board, max_depth: int, time_limit: float) -> str:
+    return self.moves[board.turn // 2 % 2]
+
+class TestSPRT:
+  def test_decision(self):
+    sprt = SPRT()
+    assert sprt.llr == 0 and sprt.decision() is None
+    for _ in range(200):
+      sprt.add(1)
+      sprt.add(0.5)
+    assert sprt.elo > 0 and sprt.decision() is True
+    sprt = SPRT()
+    for _ in range(200):
+      sprt.add(0)
+      sprt.add(1)
+      sprt.add(0.5)
+    assert abs(sprt.elo) < 1e-9
+    assert sprt.llr < 0
+
+class TestMatch:
+  def test_openings(self):
+    openings = make_openings("Base+MLP", 3, 4, 1)
+    assert openings == make_openings("Base+MLP", 3, 4, 1)
+    assert all(Board(opening).turn == 4 for opening in openings)
+
+  def test_repetition_draw(self):
+    white, black = ShufflingPlayer(("wQ \\wS1", "wQ -wS1")), ShufflingPlayer(("bQ bS1\\", "bQ bS1-"))
+    assert play_game(white, black, "Base;InProgress;White[3];wS1;bS1 wS1-;wQ -wS1;bQ bS1-", 1, 0, 100) is GameState.DRAW
+
+  def test_in_process(self):
+    first = PlayerConfig("A", (("LateMoveReductions", "False"),))
+    second = PlayerConfig("B", (("StrategyWhite", "MCTS"), ("StrategyBlack", "MCTS")))
+    scores, first_stats, second_stats = play_pair(first, second, make_openings("Base+MLP", 1, 2, 1)[0], 1, 0, 8)
+    assert len(scores) == 2
+    assert first_stats.moves == second_stats.moves == 6
+    assert first_stats.nodes and list(first_stats.time_to_depth()) == [1]
+    assert not second_stats.nodes
+    with pytest.raises(ValueError):
+      InProcessPlayer(PlayerConfig("C", (("Ponder", "True"),)))
+
+  def test_uhp(self):
+    first = PlayerConfig("A", (("MaxBranchingFactor", "16"),), (sys.executable, ENGINE))
+    second = PlayerConfig("B")
+    scores, first_stats, _ = play_pair(first, second, "Base+MLP", 1, 0, 4)
+    assert scores == [0.5, 0.5]
+    assert first_stats.moves == 4 and list(first_stats.time_to_depth()) == [1]
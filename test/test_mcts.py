@@ -0,0 +1,39 @@
+import pytest
+from core.board import Board
+from ai.mcts import MonteCarloTreeSearch
+
+class TestMonteCarloTreeSearch:
+  @pytest.mark.parametrize("puct", [True, False])
+  def test_search(self, puct: bool):
+    board = Board("Base+MLP;InProgress;White[3];wG1;bG1 wG1-;wQ -wG1;bQ bG1-")
+    gamestring = str(board)
+    brain = MonteCarloTreeSearch(puct, 1)
+    move = brain.find_best_move(board, 256, 1)
+    assert str(board) == gamestring
+    assert move in board.valid_moves.split(";")
+    assert brain._root and brain._root.visits == MonteCarloTreeSearch.PLAYOUTS_PER_DEPTH
+
+  def test_tree_reuse(self):
+    board = Board("Base+MLP;InProgress;White[3];wG1;bG1 wG1-;wQ -wG1;bQ bG1-")
+    brain = MonteCarloTreeSearch(seed=1)
+    board.play(brain.find_best_move(board, 256, 4))
+    reply = brain._predict_reply(board)
+    assert reply
+    board.play_parsed(reply)
+    node = brain._find_node(board)
+    assert node and node.visits
+    brain.find_best_move(board, 256, 1)
+    assert brain._root is node
+    assert node.visits > MonteCarloTreeSearch.PLAYOUTS_PER_DEPTH
+
+  def test_parallel_search(self):
+    board = Board("Base+MLP;InProgress;White[3];wG1;bG1 wG1-;wQ -wG1;bQ bG1-")
+    brain = MonteCarloTreeSearch(seed=1)
+    try:
+      move = brain.find_best_move(board, 256, 2, num_threads=2)
+    finally:
+      brain.close()
+    assert move in board.valid_moves.split(";")
+    # Each worker runs its share of the playouts, merged into the root moves.
+    assert brain._root and brain._root.children and brain._root.visits == 2 * MonteCarloTreeSearch.PLAYOUTS_PER_DEPTH
+    assert len({child.move for child in brain._root.children}) == len(brain._root.children)
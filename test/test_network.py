@@ -0,0 +1,45 @@
+import pytest
+import numpy as np
+from pathlib import Path
+from core.board import Board
+from ai.brain import AlphaBetaPruner
+from ai.mcts import MonteCarloTreeSearch
+from ai.network import NeuralEvaluator
+
+GAMESTRING = "Base+MLP;InProgress;White[3];wG1;bG1 wG1-;wQ -wG1;bQ bG1-"
+
+# Network computing the same evaluation as AlphaBetaPruner.
+def _linear() -> NeuralEvaluator:
+  return NeuralEvaluator([(np.array(AlphaBetaPruner.EVALUATION_WEIGHTS, dtype=np.float32)[:, np.newaxis], np.zeros(1))])
+
+class TestNeuralEvaluator:
+  def test_shapes(self):
+    with pytest.raises(ValueError):
+      NeuralEvaluator([])
+    with pytest.raises(ValueError):
+      NeuralEvaluator([(np.zeros((NeuralEvaluator.INPUT_SIZE + 1, 1)), np.zeros(1))])
+    with pytest.raises(ValueError):
+      NeuralEvaluator([(np.zeros((NeuralEvaluator.INPUT_SIZE, 2)), np.zeros(2))])
+
+  def test_batch(self, tmp_path: Path):
+    board = Board(GAMESTRING)
+    boards: list[Board] = []
+    for move in board.calculate_valid_moves():
+      child = Board(GAMESTRING)
+      child.play_parsed(move)
+      boards.append(child)
+    evaluator = NeuralEvaluator.random((16, 8), 1)
+    path = str(tmp_path / "network.npz")
+    evaluator.save(path)
+    loaded = NeuralEvaluator.load(path)
+    assert np.allclose(loaded.evaluate_batch(boards), [evaluator.evaluate(child) for child in boards], atol=1e-5)
+
+  def test_search(self):
+    board = Board(GAMESTRING)
+    evaluator = _linear()
+    assert evaluator.evaluate(board) == AlphaBetaPruner()._evaluate(board)
+    plain, neural = AlphaBetaPruner(), AlphaBetaPruner(evaluator=evaluator)
+    assert neural._aspiration_search(Board(GAMESTRING), 256, 3, None) == plain._aspiration_search(Board(GAMESTRING), 256, 3, None)
+    brain = MonteCarloTreeSearch(seed=1, evaluator=evaluator)
+    assert brain.find_best_move(board, 256, 1) in board.valid_moves.split(";")
+    assert brain._root and brain._root.visits == MonteCarloTreeSearch.PLAYOUTS_PER_DEPTH
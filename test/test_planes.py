@@ -0,0 +1,27 @@
+import pytest
+import numpy as np
+from core.board import Board
+from core.enums import BugType
+from core.planes import plane_types, plane_shape, to_planes, batch_to_planes
+
+class TestPlanes:
+  def test_planes(self):
+    board = Board("Base+MLP;InProgress;Black[4];wG1;bG1 wG1-;wQ -wG1;bQ bG1-;wB1 /wQ;bB1 bQ-;wB1 wQ")
+    channels, height, width = plane_shape(board.type)
+    assert (channels, height, width) == (17, 28, 28)
+    planes = to_planes(board)
+    types = plane_types(board.type)
+    # Black to move, so white pieces land on the opponent planes, where the beetle on top of the white queen hides it.
+    assert planes[:len(types)].sum() == 3
+    assert planes[len(types) + types.index(BugType.BEETLE)].sum() == 1 and planes[len(types) + types.index(BugType.QUEEN_BEE)].sum() == 0
+    assert planes[-1].sum() == 6 and planes[-1].max() == 2
+    assert np.array_equal(planes, to_planes(board, np.ones_like(planes)))
+    batch = batch_to_planes([board, Board("Base+MLP")])
+    assert np.array_equal(batch[0], planes) and not batch[1].any()
+    with pytest.raises(ValueError):
+      to_planes(board, np.empty((channels, height - 1, width), dtype=np.float32))
+    with pytest.raises(ValueError):
+      batch_to_planes([board, Board("Base")])
+
+if __name__ == "__main__":
+  pytest.main()
@@ -0,0 +1,43 @@
+import pytest
+from core.enums import GameState, PlayerColor
+from core.record import GameRecord, RecordWriter, read_records
+
+class TestRecord:
+  def test_replay(self, random_game):
+    board = random_game(1)
+    record = GameRecord.from_board(board)
+    assert record.turns == board.turn and record.result is board.state
+    replayed = record.replay()
+    assert str(replayed) == str(board)
+    assert replayed.hash() == board.hash()
+    assert replayed.evaluation_features(PlayerColor.WHITE) == board.evaluation_features(PlayerColor.WHITE)
+    assert replayed.valid_moves == board.valid_moves
+
+  def test_files(self, tmp_path, random_game):
+    path = str(tmp_path / "games.hgr")
+    boards = [random_game(seed) for seed in range(3)]
+    with RecordWriter(path) as writer:
+      writer.write(GameRecord.from_board(boards[0]))
+      writer.write(GameRecord.from_board(boards[1], GameState.DRAW))
+    # Writers append to existing files.
+    with RecordWriter(path) as writer:
+      writer.write(GameRecord.parse(str(boards[2])))
+    records = list(read_records(path))
+    assert [str(record.replay()) for record in records] == [str(board) for board in boards]
+    assert records[1].result is GameState.DRAW
+    with open(path, "r+b") as file:
+      file.truncate(file.seek(0, 2) - 1)
+    with pytest.raises(ValueError):
+      list(read_records(path))
+    # Writers drop the truncated record before appending.
+    with RecordWriter(path) as writer:
+      writer.write(GameRecord.from_board(boards[2]))
+    assert [str(record.replay()) for record in read_records(path)] == [str(board) for board in boards]
+    with open(path, "wb") as file:
+      file.write(b"Base")
+    with pytest.raises(ValueError):
+      list(read_records(path))
+    with pytest.raises(ValueError):
+      RecordWriter(path)
+    with open(path, "rb") as file:
+      assert file.read() == b"Base"
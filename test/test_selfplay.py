@@ -0,0 +1,19 @@
+import numpy as np
+from pathlib import Path
+from selfplay import SelfPlayConfig, play_games
+
+class TestSelfPlay:
+  def test_shards(self, tmp_path: Path):
+    config = SelfPlayConfig(str(tmp_path), max_depth=1, random_plies=1, max_turns=6, shard_size=4)
+    positions, shards = play_games(config, 0, 10, 2)
+    # 5 searched positions per game, so the last shard only holds 2 of them.
+    assert (positions, shards) == (10, 3)
+    loaded = [np.load(tmp_path / f"selfplay-00000-{index:03}.npz") for index in range(shards)]
+    assert [len(shard["scores"]) for shard in loaded] == [4, 4, 2]
+    game_ids = np.concatenate([shard["game_ids"] for shard in loaded])
+    assert list(game_ids) == [10] * 5 + [11] * 5
+    assert list(np.concatenate([shard["result_game_ids"] for shard in loaded])) == [10, 11]
+    assert loaded[0]["planes"].shape[1:] == (17, 28, 28)
+    assert loaded[0]["plies"][0] == 1 and loaded[0]["colors"][0] == 1
+    assert np.isfinite(loaded[0]["scores"]).all()
+    assert not list(tmp_path.glob("*.tmp"))
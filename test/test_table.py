@@ -0,0 +1,205 @@
+import pickle
+import pytest
+from concurrent.futures import ProcessPoolExecutor
+from core.board import Board
+from ai.table import TranspositionTable, SharedTranspositionTable, TranspositionTableEntry, TranspositionTableEntryType, ScoreTable, SearchTables, HistoryTable, KillerTable, CounterMoveTable, PVTable, move_index, MOVE_INDICES
+
+def _store_in_child(table: SharedTranspositionTable, key: int) -> None:
+  table[key] = TranspositionTableEntry(TranspositionTableEntryType.LOWER_BOUND, 1.5, 3, None)
+
+class TestTranspositionTable:
+  def test_capacity(self):
+    assert TranspositionTable(1).capacity == 2 ** 15
+    assert TranspositionTable(32).capacity == 2 ** 20
+
+  def test_store_and_probe(self):
+    table = TranspositionTable(1)
+    board = Board("Base+MLP;InProgress;White[4];wG1;bG1 wG1-;wQ -wG1;bQ bG1-;wA1 \\wQ;bA1 bQ/")
+    for key, move in enumerate(board.calculate_valid_moves()):
+      table[key] = TranspositionTableEntry(TranspositionTableEntryType.EXACT, key / 2, key % 8, move)
+    for key, move in enumerate(board.calculate_valid_moves()):
+      entry = table[key]
+      assert entry is not None
+      assert entry.type is TranspositionTableEntryType.EXACT
+      assert entry.value == key / 2
+      assert entry.depth == key % 8
+      assert entry.move == move
+    assert table[2 ** 40] is None
+
+  def test_empty_key(self):
+    table = TranspositionTable(1)
+    assert table[0] is None
+    table[0] = TranspositionTableEntry(TranspositionTableEntryType.UPPER_BOUND, float("-inf"), 1, None)
+    entry = table[0]
+    assert entry is not None and entry.value == float("-inf") and entry.move is None
+
+  def test_replacement(self):
+    table = TranspositionTable(1)
+    stride = table.capacity // TranspositionTable.BUCKET_SIZE
+    table[1] = TranspositionTableEntry(TranspositionTableEntryType.EXACT, 1, 5, None)
+    # Shallower entry for the same key is discarded.
+    table[1] = TranspositionTableEntry(TranspositionTableEntryType.EXACT, 2, 4, None)
+    assert table[1].value == 1
+    # Shallower entry for a colliding key goes into the always-replace slot.
+    table[1 + stride] = TranspositionTableEntry(TranspositionTableEntryType.EXACT, 3, 2, None)
+    table[1 + 2 * stride] = TranspositionTableEntry(TranspositionTableEntryType.EXACT, 4, 3, None)
+    assert table[1].value == 1
+    assert table[1 + stride] is None
+    assert table[1 + 2 * stride].value == 4
+    # Deeper entry takes over the depth-preferred slot.
+    table[1 + stride] = TranspositionTableEntry(TranspositionTableEntryType.EXACT, 5, 6, None)
+    assert table[1] is None
+    assert table[1 + stride].value == 5
+    # Discarded entries aren't stored, overwritten entries for other keys are collisions.
+    assert table.stores == 4 and table.collisions == 2
+    table.clear()
+    assert table[1 + stride] is None
+
+  def test_aging(self):
+    table = TranspositionTable(1, max_age=2)
+    stride = table.capacity // TranspositionTable.BUCKET_SIZE
+    table[1] = TranspositionTableEntry(TranspositionTableEntryType.EXACT, 1, 5, None)
+    table.flush()
+    assert table[1] is not None
+    table.flush()
+    assert table[1] is None
+    # Aged entries are replaced regardless of their depth.
+    table[1 + stride] = TranspositionTableEntry(TranspositionTableEntryType.EXACT, 2, 1, None)
+    table[1 + 2 * stride] = TranspositionTableEntry(TranspositionTableEntryType.EXACT, 3, 0, None)
+    assert table[1 + stride].value == 2
+    assert table[1 + 2 * stride].value == 3
+    # Aged entries don't come back to life after many generations.
+    table[2] = TranspositionTableEntry(TranspositionTableEntryType.EXACT, 4, 1, None)
+    for _ in range(256):
+      table.flush()
+    assert table[2] is None
+
+class TestSharedTranspositionTable:
+  def test_attach(self):
+    table = SharedTranspositionTable(1)
+    attached = pickle.loads(pickle.dumps(table))
+    try:
+      assert attached.name == table.name and attached.capacity == table.capacity
+      table[42] = TranspositionTableEntry(TranspositionTableEntryType.EXACT, -2.5, 4, None)
+      entry = attached[42]
+      assert entry is not None and entry.value == -2.5 and entry.depth == 4
+      table.flush()
+      attached[43] = TranspositionTableEntry(TranspositionTableEntryType.EXACT, 0, 1, None)
+      table.clear()
+      assert attached[42] is None and attached[43] is None
+    finally:
+      attached.close()
+      table.close()
+
+  def test_torn_slot(self):
+    table = SharedTranspositionTable(1)
+    try:
+      table[7] = TranspositionTableEntry(TranspositionTableEntryType.EXACT, 1.0, 2, None)
+      # Simulate a concurrent write that only updated the value.
+      table._words[1 + 7 * TranspositionTable.BUCKET_SIZE * 3 + 2] ^= 1
+      assert table[7] is None
+    finally:
+      table.close()
+
+  def test_other_process(self):
+    table = SharedTranspositionTable(1)
+    try:
+      with ProcessPoolExecutor(1) as pool:
+        pool.submit(_store_in_child, table, 2 ** 30 + 5).result()
+      entry = table[2 ** 30 + 5]
+      assert entry is not None and entry.type is TranspositionTableEntryType.LOWER_BOUND and entry.value == 1.5 and entry.depth == 3
+    finally:
+      table.close()
+
+class TestMoveTables:
+  def test_move_index(self):
+    board = Board("Base+MLP;InProgress;White[4];wG1;bG1 wG1-;wQ -wG1;bQ bG1-;wA1 \\wQ;bA1 bQ/")
+    moves = board.calculate_valid_moves()
+    indices = {move_index(move) for move in moves}
+    assert len(indices) == len(moves)
+    assert all(0 <= index < MOVE_INDICES for index in indices)
+
+  def test_history(self):
+    table = HistoryTable()
+    table.update(5, 3)
+    table.update(5, 2)
+    assert table[5] == 13 and table[6] == 0
+    table.decay()
+    assert table[5] == 6
+    table.clear()
+    assert table[5] == 0
+
+  def test_killers(self):
+    table = KillerTable()
+    table.store(2, 10)
+    table.store(2, 11)
+    table.store(2, 11)
+    assert table.is_killer(2, 10) and table.is_killer(2, 11) and not table.is_killer(1, 10)
+    table.store(2, 12)
+    assert not table.is_killer(2, 10) and table.is_killer(2, 11) and table.is_killer(2, 12)
+    table.shift(2)
+    assert table.is_killer(0, 12) and not table.is_killer(2, 12)
+    assert not table.is_killer(KillerTable.MAX_PLY, 12)
+    table.shift(-1)
+    assert not table.is_killer(0, 12)
+
+  def test_counter_moves(self):
+    table = CounterMoveTable()
+    assert table[7] == -1
+    table[7] = 42
+    assert table[7] == 42
+    table.clear()
+    assert table[7] == -1
+
+  def test_pv(self):
+    table = PVTable(4)
+    board = Board("Base+MLP;InProgress;White[4];wG1;bG1 wG1-;wQ -wG1;bQ bG1-;wA1 \\wQ;bA1 bQ/")
+    move, other = list(board.calculate_valid_moves())[:2]
+    table[1] = move
+    assert table[1] == move and table[5] is None
+    table[5] = other
+    assert table[5] == other and table[1] is None
+
+class TestScoreTable:
+  def test_aging(self):
+    table = ScoreTable(max_age=2)
+    table[1] = 10
+    table.flush()
+    table[2] = 20
+    assert table[1] == 10
+    table.flush()
+    assert 1 not in table
+    assert table[2] == 20
+    table[1] = 30
+    assert table[1] == 30
+    table.flush()
+    table.flush()
+    assert table[1] is None and table[2] is None
+
+class TestSearchTables:
+  def test_budget(self):
+    tables = SearchTables(64)
+    assert tables.transpos_table.size_mb == 32
+    assert tables.max_snapshots == 16 * 2 ** 20 // SearchTables.SNAPSHOT_SIZE
+    tables.close()
+
+  def test_age(self):
+    tables = SearchTables(4)
+    generation = tables.cached_scores._generation
+    # Agents of both colors search once per full move.
+    for turn in range(6):
+      tables.age(turn)
+      tables.age(turn)
+    assert tables.cached_scores._generation == generation + 2
+    tables.close()
+
+  def test_share(self):
+    tables = SearchTables(4)
+    tables.transpos_table[1] = TranspositionTableEntry(TranspositionTableEntryType.EXACT, 1, 1, None)
+    shared = tables.share()
+    assert tables.transpos_table is shared and shared.size_mb == 2
+    assert tables.share() is shared
+    tables.close()
+
+if __name__ == "__main__":
+  pytest.main()
@@ -0,0 +1,50 @@
+import json
+from pathlib import Path
+from core.board import Board
+from ai.brain import AlphaBetaPruner
+from ai.telemetry import SearchCounters, IterationStats, JsonlSink, CallbackSink
+
+def _stats(**counters: int) -> IterationStats:
+  return IterationStats(3, "wQ", 1.5, 2, 0.5, 4, SearchCounters(**counters))
+
+class TestSearchCounters:
+  def test_arithmetic(self):
+    a = SearchCounters(10, 2, 1, 1, 10, 3, 5, 1, 4, 2)
+    b = SearchCounters(1, 1, 1, 1, 1, 1, 1, 1, 1, 1)
+    assert a - b == SearchCounters(9, 1, 0, 0, 9, 2, 4, 0, 3, 1)
+    assert a - b + b == a
+
+class TestIterationStats:
+  def test_rates(self):
+    stats = _stats(nodes=100, move_cutoffs=10, first_move_cutoffs=9, tt_probes=100, tt_hits=25, tt_stores=50, tt_collisions=5)
+    assert stats.nodes_per_second == 200
+    assert stats.tt_hit_rate == 0.25
+    assert stats.tt_collision_rate == 0.1
+    assert stats.first_move_cutoff_rate == 0.9
+    assert stats.move_cache_hit_rate == 0
+    assert stats.to_dict()["tt_hits"] == 25
+
+class TestSinks:
+  def test_jsonl(self, tmp_path: Path):
+    path = tmp_path / "telemetry.jsonl"
+    sink = JsonlSink(str(path))
+    sink.emit(_stats(nodes=10))
+    sink.emit(_stats(nodes=20))
+    sink.close()
+    lines = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [line["nodes"] for line in lines] == [10, 20]
+    assert lines[0]["best_move"] == "wQ"
+    # Won positions score infinity, which isn't valid JSON.
+    sink.emit(IterationStats(1, "wQ", float("inf"), 2, 0.5, 4, SearchCounters()))
+    assert "Infinity" not in path.read_text() and json.loads(path.read_text().splitlines()[-1])["score"] is None
+
+  def test_search(self):
+    board = Board("Base+MLP;InProgress;White[3];wG1;bG1 wG1-;wQ -wG1;bQ bG1-")
+    emitted: list[IterationStats] = []
+    brain = AlphaBetaPruner()
+    brain.telemetry = CallbackSink(emitted.append)
+    move = brain.find_best_move(board, 256, 3)
+    assert [stats.depth for stats in emitted] == [1, 2, 3]
+    assert emitted[-1].best_move == move
+    assert sum(stats.counters.nodes for stats in emitted) == brain._visited_nodes
+    assert all(stats.counters.tt_probes >= stats.counters.nodes for stats in emitted)
@@ -0,0 +1,41 @@
+from time import sleep
+from ai.time_manager import TimeManager
+
+class TestTimeManager:
+  def test_unlimited(self):
+    clock = TimeManager()
+    assert not clock.limited
+    assert not clock.expired()
+    assert clock.can_start_iteration()
+    assert clock.remaining == 0 and clock.worker_budget == 0
+
+  def test_limits(self):
+    clock = TimeManager(0.1)
+    assert clock.limited
+    assert 0 < clock.remaining <= 0.1
+    assert clock.can_start_iteration()
+    sleep(0.1)
+    assert clock.expired()
+    assert not clock.can_start_iteration()
+    assert clock.remaining == 0
+    # Workers read a time limit of 0 as no limit.
+    assert clock.worker_budget == TimeManager.MIN_WORKER_BUDGET
+
+  def test_branching_factor(self):
+    clock = TimeManager(10)
+    assert clock.branching_factor == TimeManager.DEFAULT_BRANCHING_FACTOR
+    clock.start_iteration(0)
+    clock.end_iteration(10)
+    clock.start_iteration(10)
+    clock.end_iteration(60)
+    assert clock.branching_factor == 5
+    assert clock.can_start_iteration()
+
+  def test_predicted_iteration(self):
+    clock = TimeManager(1)
+    clock.start_iteration(0)
+    sleep(0.2)
+    clock.end_iteration(100)
+    # The soft limit isn't reached yet, but the next iteration is expected to take 0.8 seconds.
+    assert not clock.expired()
+    assert not clock.can_start_iteration()
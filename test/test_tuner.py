@@ -0,0 +1,44 @@
+import json
+import pytest
+import numpy as np
+from pathlib import Path
+from core.board import Board
+from ai.brain import AlphaBetaPruner
+from tuner import load_corpus, texel_loss, fit_scale, tune
+
+def _shard(path: Path, game_ids: list[int], colors: list[int], result_game_ids: list[int], results: list[int]) -> str:
+  features = np.arange(len(game_ids) * len(Board.EVALUATION_FEATURES), dtype=np.int16).reshape(len(game_ids), -1)
+  np.savez(path, features=features, game_ids=np.array(game_ids, dtype=np.int64), colors=np.array(colors, dtype=np.int8), result_game_ids=np.array(result_game_ids, dtype=np.int64), results=np.array(results, dtype=np.int8))
+  return str(path)
+
+class TestTuner:
+  def test_load_corpus(self, tmp_path: Path):
+    # Game 1 spans both shards and ends in the second one, game 3 has no result.
+    first = _shard(tmp_path / "first.npz", [0, 1, 1], [0, 0, 1], [0], [1])
+    second = _shard(tmp_path / "second.npz", [1, 3], [0, 1], [1], [-1])
+    features, targets = load_corpus([first, second])
+    assert len(features) == 4
+    assert list(targets) == [1, 0, 1, 0]
+    assert features[3, 0] == 0
+
+  def test_tune(self):
+    rng = np.random.default_rng(1)
+    features = rng.integers(0, 7, (4096, len(Board.EVALUATION_FEATURES))).astype(np.float64)
+    expected = np.array([-8, 12, 3, -1, 1, -1, 0.5, -0.5])
+    targets = 1 / (1 + np.exp(-features @ expected / 20))
+    weights = np.array(AlphaBetaPruner.EVALUATION_WEIGHTS, dtype=np.float64)
+    scale = fit_scale(features, targets, weights)
+    tuned = tune(features, targets, weights, scale, 2000)
+    assert texel_loss(tuned, features, targets, scale) < texel_loss(weights, features, targets, scale) / 10
+    assert np.allclose(tuned * scale, expected / 20, atol=0.05)
+
+  def test_weights_file(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(AlphaBetaPruner, "EVALUATION_WEIGHTS", AlphaBetaPruner.EVALUATION_WEIGHTS)
+    path = str(tmp_path / "weights.json")
+    AlphaBetaPruner.save_weights(path, (1, 2, 3, 4, 5, 6, 7, 8))
+    AlphaBetaPruner.load_weights(path)
+    assert AlphaBetaPruner.EVALUATION_WEIGHTS == (1, 2, 3, 4, 5, 6, 7, 8)
+    with open(path, "w", encoding="utf-8") as file:
+      json.dump({"queen_neighbors": 1}, file)
+    with pytest.raises(ValueError):
+      AlphaBetaPruner.load_weights(path)